@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Adapter benchmark: count the IntfPort/IntfSignal objects created and the time spent
+building and rendering a SoC where every slave needs an adapter path.
+
+Usage: python benchmarks/bench_adapters.py [--slaves N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from systemrdl import RDLCompiler
+
+from peakrdl_socgen import SocExporter, Subsystem
+from peakrdl_socgen.intf import IntfPort
+from peakrdl_socgen.signal import IntfSignal
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMON_RDL = os.path.join(BENCH_DIR, "..", "src", "peakrdl_socgen", "rdl", "common.rdl")
+BASE_RDL = os.path.join(BENCH_DIR, "rdl", "bench_base.rdl")
+INTFS_RDL = os.path.join(BENCH_DIR, "rdl", "bench_intfs.rdl")
+
+def gen_soc_rdl(n_slaves: int) -> str:
+    """Returns an obi SoC with n_slaves apb slaves, each one connected through an obi2apb adapter."""
+    rdl = """
+addrmap obi_core #(obi_intf INTF = obi_intf'{ADDR_WIDTH:32, DATA_WIDTH:32, prefix:"data_", modport:Modport::master, cap:false, regex:""}) {
+    ifports = '{INTF};
+    bclk clk; brstn rstn;
+    mem {mementries = 1; memwidth = 32;} external memory;
+};
+
+addrmap apb_periph #(apb_intf INTF = apb_intf'{ADDR_WIDTH:32, DATA_WIDTH:32, prefix:"s_", modport:Modport::slave, cap:false, regex:""}) {
+    ifports = '{INTF};
+    bclk clk; brstn rstn;
+    mem {mementries = 1024; memwidth = 32;} external memory;
+};
+
+addrmap bench_soc {
+    subsystem;
+    obi_core core @ 0xf0000000;
+"""
+    for i in range(n_slaves):
+        rdl += f"    apb_periph periph{i} @ 0x{i * 0x1000:x};\n"
+    rdl += "    bclk clk; brstn rstn;\n};\n"
+    return rdl
+
+class Counter:
+    """Counts the instances created for a class by wrapping its __init__ method."""
+    def __init__(self, cls):
+        self.count = 0
+        orig_init = cls.__init__
+        def counting_init(obj, *args, **kwargs):
+            self.count += 1
+            orig_init(obj, *args, **kwargs)
+        cls.__init__ = counting_init
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slaves", type=int, default=200, help="Number of apb slaves (i.e., adapter paths)")
+    args = parser.parse_args()
+
+    ports = Counter(IntfPort)
+    signals = Counter(IntfSignal)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        soc_rdl = os.path.join(tmpdir, "bench_soc.rdl")
+        with open(soc_rdl, "w") as f:
+            f.write(gen_soc_rdl(args.slaves))
+
+        rdlc = RDLCompiler()
+        for rdl_file in [COMMON_RDL, BASE_RDL, soc_rdl]:
+            rdlc.compile_file(rdl_file)
+        top_node = rdlc.elaborate("bench_soc").top
+
+        exporter = SocExporter()
+        glue = exporter.compile_glue([COMMON_RDL, BASE_RDL, INTFS_RDL])
+
+        start = time.perf_counter()
+        subsys = Subsystem(top_node, glue)
+        build_time = time.perf_counter() - start
+        build_ports, build_signals = ports.count, signals.count
+
+        # Render plan (connection queries) and template, as in an export
+        start = time.perf_counter()
+        exporter.render_subsystem(subsys, os.path.join(tmpdir, "bench_soc.sv"), vinject=[], use_include=False,
+                                  date_time_now=None)
+        render_time = time.perf_counter() - start
+
+    print(f"adapter paths         : {len(subsys.adapter_paths)}")
+    print(f"build  time           : {build_time:.3f} s")
+    print(f"build  IntfPort/Signal: {build_ports} / {build_signals}")
+    print(f"render time           : {render_time:.3f} s")
+    print(f"render IntfPort/Signal: {ports.count - build_ports} / {signals.count - build_signals}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Batch benchmark: exporting many SoC variants from the same interface library.
+
+Synthetic SoC variants (see bench_scaling.py) with a different number of peripherals each are
+exported:
+- separate: one `peakrdl socgen` process per variant,
+- batch: one `python -m peakrdl_socgen --batch` process, serially and with --jobs workers.
+
+Usage: python benchmarks/bench_batch.py [--variants N] [--peripherals N] [--jobs N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_scaling import COMMON_RDL, BASE_RDL, INTFS_RDL, DEFAULT_PARAMS, gen_soc_rdl
+
+def timed_run(cmd) -> float:
+    """Runs a command and returns its wall time in seconds."""
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", type=int, default=20, help="Number of SoC variants")
+    parser.add_argument("--peripherals", type=int, default=32, help="Peripherals in each subsystem of the first variant")
+    parser.add_argument("--jobs", type=int, default=4, help="Worker processes of the parallel batch export")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        variants = []
+        for idx in range(args.variants):
+            soc_rdl = os.path.join(tmpdir, f"soc_{idx}.rdl")
+            with open(soc_rdl, "w") as f:
+                f.write(gen_soc_rdl(dict(DEFAULT_PARAMS, peripherals=args.peripherals + idx)))
+            variants.append({'name': f"soc_{idx}", 'rdl_files': [COMMON_RDL, BASE_RDL, soc_rdl],
+                             'outdir': os.path.join(tmpdir, "out", f"soc_{idx}")})
+        batch_file = os.path.join(tmpdir, "batch.json")
+        with open(batch_file, "w") as f:
+            defaults = {'top': "bench_soc", 'intfs': [COMMON_RDL, BASE_RDL, INTFS_RDL], 'gen_dot': True}
+            json.dump({'defaults': defaults, 'variants': variants}, f)
+
+        runs = {}
+        runs['separate'] = sum(timed_run(["peakrdl", "socgen", *v['rdl_files'], "-t", "bench_soc",
+                                          "--intfs", COMMON_RDL, BASE_RDL, INTFS_RDL, "--gen-dot",
+                                          "-o", v['outdir'], "--log-level", "error"]) for v in variants)
+        for jobs in sorted({1, args.jobs}):
+            runs[f"batch -j {jobs}"] = timed_run([sys.executable, "-m", "peakrdl_socgen", "--batch", batch_file,
+                                                   "-j", str(jobs), "--log-level", "error"])
+
+    print(f"{'mode':<12} {'total (s)':>10} {'per variant (ms)':>17}")
+    for mode, total in runs.items():
+        print(f"{mode:<12} {total:>10.2f} {total / args.variants * 1e3:>17.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Dot benchmark: time spent generating the dot diagrams, and size of the diagrams to lay out.
+
+The models of synthetic SoCs (see bench_scaling.py) are built once per size, then the diagrams
+are rendered in each dot mode (full, top and split, see the --dot-mode option) from the subsystem
+summaries. For each mode, the render time, the number of diagrams and the nodes and edges of the
+largest one are reported. Graphviz lays out each diagram as a whole, so the largest diagram
+bounds the layout time. With --layout, the largest diagram is also laid out with `dot` (if
+installed).
+
+Usage: python benchmarks/bench_dot.py [--peripherals N,N,...] [--depth N] [--fanout N] [--repeat N] [--layout]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from systemrdl import RDLCompiler, RDLWalker
+
+from peakrdl_socgen import SocExporter, Subsystem, SubsystemListener
+from peakrdl_socgen.render_plan import DOT_MODES, SubsystemSummary
+
+from bench_scaling import COMMON_RDL, BASE_RDL, INTFS_RDL, DEFAULT_PARAMS, gen_soc_rdl
+
+def build_subsystems(exporter: SocExporter, params: dict) -> list:
+    """Returns the Subsystem models of a synthetic SoC."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        soc_rdl = os.path.join(tmpdir, "bench_soc.rdl")
+        with open(soc_rdl, "w") as f:
+            f.write(gen_soc_rdl(params))
+        rdlc = RDLCompiler()
+        for rdl_file in [COMMON_RDL, BASE_RDL, soc_rdl]:
+            rdlc.compile_file(rdl_file)
+        top_node = rdlc.elaborate("bench_soc").top
+
+    glue = exporter.compile_glue([COMMON_RDL, BASE_RDL, INTFS_RDL])
+    listener = SubsystemListener()
+    RDLWalker(unroll=True).walk(top_node, listener)
+    registry = {}
+    return [Subsystem.get_or_create(x, glue, registry) for x in listener.subsystem_nodes]
+
+def graph_size(dot_file: str):
+    """Returns the number of nodes and edges of a generated diagram."""
+    nodes = edges = 0
+    with open(dot_file, "r") as f:
+        for line in f:
+            nodes += "[height=" in line
+            edges += " -> " in line
+    return nodes, edges
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peripherals", default="50,100,200", help="Comma separated peripherals in each subsystem")
+    parser.add_argument("--depth", type=int, default=2, help="Levels of nested subsystems below the top one")
+    parser.add_argument("--fanout", type=int, default=2, help="Nested subsystems in each subsystem")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each render, the fastest is kept")
+    parser.add_argument("--layout", default=False, action="store_true", help="Lay out the largest diagram with dot")
+    args = parser.parse_args()
+    dot_exe = shutil.which("dot") if args.layout else None
+    if args.layout and dot_exe is None:
+        print("dot (graphviz) not found, the layout is not timed")
+
+    exporter = SocExporter()
+    print(f"{'periph':>6} {'modules':>8} {'mode':<6} {'render (ms)':>12} {'files':>6} {'largest nodes':>14} {'edges':>6}"
+          + (f" {'layout (s)':>11}" if dot_exe else ""))
+    for peripherals in [int(x) for x in args.peripherals.split(",")]:
+        params = dict(DEFAULT_PARAMS, peripherals=peripherals, depth=args.depth, fanout=args.fanout)
+        subsystems = build_subsystems(exporter, params)
+        summaries = [SubsystemSummary(subsys) for subsys in subsystems]
+        type_paths = [(subsys.getOrigTypeName(), subsys.node.get_path()) for subsys in subsystems]
+        n_modules = sum(len(s.modules) for s in summaries)
+
+        for mode in DOT_MODES:
+            with tempfile.TemporaryDirectory() as outdir:
+                summary_files = exporter.get_summary_files(outdir, type_paths, True, mode)
+                del summary_files[os.path.join(outdir, exporter.addrmap_pkg_template.replace(".j2", ""))]
+                times = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    exporter.render_summary_files(summaries, summary_files, None, mode)
+                    times.append(time.perf_counter() - start)
+
+                sizes = {f: graph_size(f) for f in summary_files}
+                largest = max(sizes, key=lambda f: sizes[f][0])
+                line = (f"{peripherals:>6} {n_modules:>8} {mode:<6} {min(times) * 1e3:>12.2f} {len(summary_files):>6}"
+                        f" {sizes[largest][0]:>14} {sizes[largest][1]:>6}")
+                if dot_exe:
+                    start = time.perf_counter()
+                    subprocess.run([dot_exe, "-Tsvg", "-o", os.devnull, largest], check=True)
+                    line += f" {time.perf_counter() - start:>11.2f}"
+                print(line)
+
+if __name__ == "__main__":
+    main()
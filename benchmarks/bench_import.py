@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Import benchmark: time added to every peakrdl invocation by loading the socgen plugin.
+
+PeakRDL imports all the registered plugin modules, whatever the command. The plugin module
+(peakrdl_socgen.__peakrdl__) is imported with `python -X importtime` in a fresh interpreter
+which already imported what peakrdl itself needs (peakrdl and systemrdl), so only the modules
+the plugin adds are measured.
+
+The script fails if the total is above --max-ms, or if a module which should only be imported
+by an export (jinja2, the exporter, the model classes) is imported.
+
+Usage: python benchmarks/bench_import.py [--repeat N] [--max-ms MS] [--top N]
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Imported by peakrdl before loading the plugins
+PRELOADED = ["peakrdl.plugins.exporter", "peakrdl.config", "systemrdl"]
+PLUGIN = "peakrdl_socgen.__peakrdl__"
+# Modules only needed by an export
+FORBIDDEN = ["jinja2", "peakrdl_socgen.exporter", "peakrdl_socgen.subsystem", "peakrdl_socgen.module"]
+MARKER = "socgen-bench-import"
+
+def import_times() -> List[Tuple[str, int, int]]:
+    """Returns the (module, self us, cumulative us) of each module the plugin imports."""
+    code = f"import {', '.join(PRELOADED)}; import sys; sys.stderr.write('{MARKER}\\n'); import {PLUGIN}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    lines = proc.stderr.splitlines()
+    times = []
+    for line in lines[lines.index(MARKER) + 1:]:
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs, the fastest total is kept")
+    parser.add_argument("--max-ms", dest="max_ms", type=float, default=30.0, help="Maximum plugin import time in ms")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules printed")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: sum(t[1] for t in times))
+    total_us = sum(t[1] for t in best)
+
+    print(f"{'module':<40} {'self (ms)':>10} {'cumulative (ms)':>16}")
+    for name, self_us, cumulative_us in sorted(best, key=lambda t: -t[1])[:args.top]:
+        print(f"{name:<40} {self_us / 1e3:>10.2f} {cumulative_us / 1e3:>16.2f}")
+    print(f"{'total (' + str(len(best)) + ' modules)':<40} {total_us / 1e3:>10.2f}")
+
+    imported: Dict[str, int] = {t[0]: t[1] for t in best}
+    errors = [f"{name} is imported by the plugin" for name in FORBIDDEN if name in imported]
+    if total_us / 1e3 > args.max_ms:
+        errors.append(f"the plugin import takes {total_us / 1e3:.2f} ms, more than {args.max_ms} ms")
+    for error in errors:
+        print(f"error: {error}", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
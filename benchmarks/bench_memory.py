@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Memory benchmark: bytes used by the model objects (signals, interface ports and modules).
+
+Three measures are reported, all with tracemalloc:
+- the size of the Signal, IntfSignal and IntfPort objects alone, created in bulk from
+  already elaborated nodes,
+- the memory allocated while building the Subsystem models of a synthetic SoC (see
+  bench_scaling.py), divided by the number of signals created,
+- the peak memory allocated by an export of this SoC, with and without low_memory.
+
+Usage: python benchmarks/bench_memory.py [--peripherals N] [--depth N] [--fanout N] [--objects N]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from systemrdl import RDLCompiler, RDLWalker
+
+from peakrdl_socgen import SocExporter, Subsystem, SubsystemListener
+from peakrdl_socgen.signal import Signal, IntfSignal
+from peakrdl_socgen.intf import IntfPort
+from peakrdl_socgen.profiling import Profiler, set_profiler
+
+from bench_scaling import COMMON_RDL, BASE_RDL, INTFS_RDL, DEFAULT_PARAMS, gen_soc_rdl
+
+def traced(func):
+    """Returns the result of func and the memory it allocated (and kept) in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = func()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return result, size
+
+def traced_peak(func) -> int:
+    """Returns the peak memory allocated while running func in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peripherals", type=int, default=200, help="Peripherals in each subsystem")
+    parser.add_argument("--depth", type=int, default=DEFAULT_PARAMS['depth'], help="Levels of nested subsystems")
+    parser.add_argument("--fanout", type=int, default=DEFAULT_PARAMS['fanout'], help="Nested subsystems in each subsystem")
+    parser.add_argument("--objects", type=int, default=100000, help="Objects created for the per object sizes")
+    args = parser.parse_args()
+
+    params = dict(DEFAULT_PARAMS, peripherals=args.peripherals, depth=args.depth, fanout=args.fanout)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        soc_rdl = os.path.join(tmpdir, "bench_soc.rdl")
+        with open(soc_rdl, "w") as f:
+            f.write(gen_soc_rdl(params))
+
+        rdlc = RDLCompiler()
+        for rdl_file in [COMMON_RDL, BASE_RDL, soc_rdl]:
+            rdlc.compile_file(rdl_file)
+        top_node = rdlc.elaborate("bench_soc").top
+
+    glue = SocExporter().compile_glue([COMMON_RDL, BASE_RDL, INTFS_RDL])
+    listener = SubsystemListener()
+    RDLWalker(unroll=True).walk(top_node, listener)
+
+    # Whole model
+    profiler = Profiler()
+    set_profiler(profiler)
+    registry = {}
+    subsystems, model_size = traced(lambda: [Subsystem.get_or_create(x, glue, registry) for x in listener.subsystem_nodes])
+    set_profiler(None)
+    n_signals = profiler.counters['Signal']
+
+    # Single objects, the nodes are elaborated beforehand so only the objects are measured
+    port = next(p for s in subsystems for m in s.modules for p in m.ports)
+    intf_nodes = list(port.node.signals())
+    sig_nodes = [s for s in top_node.signals()]
+    n = args.objects
+
+    intf_signals, intf_signal_size = traced(lambda: [IntfSignal(intf_nodes[i % len(intf_nodes)], port) for i in range(n)])
+    signals, signal_size = traced(lambda: [Signal(sig_nodes[i % len(sig_nodes)]) for i in range(n)])
+    ports, port_size = traced(lambda: [IntfPort(port.node, port.module) for _ in range(n // 10)])
+
+    # The list holding the objects is not part of the object size
+    list_size = 8 * n
+    print(f"Signal              : {(signal_size - list_size) / n:8.1f} bytes/object")
+    print(f"IntfSignal          : {(intf_signal_size - list_size) / n:8.1f} bytes/object")
+    print(f"IntfPort (+signals) : {(port_size - list_size / 10) / (n // 10):8.1f} bytes/object ({len(port.signals)} signals)")
+    print(f"Model               : {model_size / n_signals:8.1f} bytes/signal ({n_signals} signals, {model_size / 2**20:.1f} MiB)")
+    del intf_signals, signals, ports, subsystems, registry, port
+
+    # Export peak, each with a new exporter whose glue is compiled beforehand
+    for low_memory in (False, True):
+        exporter = SocExporter()
+        exporter.compile_glue([COMMON_RDL, BASE_RDL, INTFS_RDL])
+        with tempfile.TemporaryDirectory() as outdir:
+            peak = traced_peak(lambda: exporter.export(top_node, outdir, intfs=[COMMON_RDL, BASE_RDL, INTFS_RDL],
+                                                       vinject=[], gen_dot=True, low_memory=low_memory))
+        print(f"Export peak{' (low_memory)' if low_memory else '':14}: {peak / 2**20:8.1f} MiB ({len(listener.subsystem_nodes)} subsystems)")
+
+if __name__ == "__main__":
+    main()
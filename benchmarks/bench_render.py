@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Render benchmark: time spent generating the subsystem files from an already built model.
+
+The models of a synthetic SoC (see bench_scaling.py) are built once, then for each subsystem:
+- plan: building the render plan (all the connection queries),
+- template: rendering the template from the plan (string emission only),
+- stream: rendering and streaming the output as the exporter does (without writing it),
+- join: joining the output lines, the lower bound of any string emission.
+
+Usage: python benchmarks/bench_render.py [--peripherals N] [--repeat N] [--ir]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from systemrdl import RDLCompiler, RDLWalker
+
+from peakrdl_socgen import SocExporter, Subsystem, SubsystemListener
+from peakrdl_socgen.ir import build_ir, load_ir
+from peakrdl_socgen.render_plan import RenderPlan
+
+from bench_scaling import COMMON_RDL, BASE_RDL, INTFS_RDL, DEFAULT_PARAMS, gen_soc_rdl
+
+def best_time(func, repeat: int) -> float:
+    """Returns the fastest of several runs of func, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peripherals", type=int, default=200, help="Peripherals in each subsystem")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each measure, the fastest is kept")
+    parser.add_argument("--ir", default=False, action="store_true", help="Render from the IR model (see --emit-ir)")
+    args = parser.parse_args()
+
+    params = dict(DEFAULT_PARAMS, peripherals=args.peripherals)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        soc_rdl = os.path.join(tmpdir, "bench_soc.rdl")
+        with open(soc_rdl, "w") as f:
+            f.write(gen_soc_rdl(params))
+
+        rdlc = RDLCompiler()
+        for rdl_file in [COMMON_RDL, BASE_RDL, soc_rdl]:
+            rdlc.compile_file(rdl_file)
+        top_node = rdlc.elaborate("bench_soc").top
+
+    exporter = SocExporter()
+    glue = exporter.compile_glue([COMMON_RDL, BASE_RDL, INTFS_RDL])
+    listener = SubsystemListener()
+    RDLWalker(unroll=True).walk(top_node, listener)
+    registry = {}
+    subsystems = [Subsystem.get_or_create(x, glue, registry) for x in listener.subsystem_nodes]
+    if args.ir:
+        subsystems = load_ir(build_ir(subsystems))
+
+    template = exporter.jinja_env.get_template(exporter.subsystem_template)
+    def context(plan):
+        return {'plan': plan, 'inj_f': [], 'use_include': False, 'socgen_version': "bench", 'date_time': None}
+
+    print(f"{'subsystem':<12} {'bytes':>10} {'plan (ms)':>10} {'template (ms)':>14} {'stream (ms)':>12} {'join (ms)':>10}")
+    totals = [0.0] * 4
+    for subsys in subsystems:
+        plan = RenderPlan(subsys)
+        output = template.render(context(plan))
+        lines = output.splitlines(keepends=True)
+        times = [
+            best_time(lambda: RenderPlan(subsys), args.repeat),
+            best_time(lambda: template.render(context(plan)), args.repeat),
+            best_time(lambda: sum(len(c) for c in exporter.stream_template(exporter.subsystem_template, context(plan))), args.repeat),
+            best_time(lambda: "".join(lines), args.repeat),
+        ]
+        totals = [t + x for t, x in zip(totals, times)]
+        print(f"{subsys.node.inst_name:<12} {len(output):>10} {times[0] * 1e3:>10.2f} {times[1] * 1e3:>14.2f} {times[2] * 1e3:>12.2f} {times[3] * 1e3:>10.2f}")
+    print(f"{'total':<12} {'':>10} {totals[0] * 1e3:>10.2f} {totals[1] * 1e3:>14.2f} {totals[2] * 1e3:>12.2f} {totals[3] * 1e3:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Scaling benchmark: generate synthetic SoCs and record the time and memory of each export phase.
+
+Each configuration is exported in a fresh python process, so the peak RSS values of different
+configurations are independent. Results are written as JSON and can be compared with the ones
+of another commit to catch regressions.
+
+Usage:
+    python benchmarks/bench_scaling.py [--peripherals N] [--masters N] [--depth N] [--fanout N]
+                                       [--mix apb,obi,axi] [--nports N] [--user-intcs N]
+                                       [--sweep PARAM=V1,V2,...] [--repeat N]
+                                       [-o results.json] [--compare baseline.json] [--threshold R]
+
+Examples:
+    # Check how the export scales with the number of peripherals
+    python benchmarks/bench_scaling.py --sweep peripherals=50,100,200,400 -o new.json
+
+    # Compare with the results of another commit
+    python benchmarks/bench_scaling.py --sweep peripherals=50,100,200,400 --compare old.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMON_RDL = os.path.join(BENCH_DIR, "..", "src", "peakrdl_socgen", "rdl", "common.rdl")
+BASE_RDL = os.path.join(BENCH_DIR, "rdl", "bench_base.rdl")
+INTFS_RDL = os.path.join(BENCH_DIR, "rdl", "bench_intfs.rdl")
+
+# Default SoC generation parameters
+DEFAULT_PARAMS: Dict[str, Any] = {
+    'peripherals': 64,  # Peripherals in each subsystem
+    'masters': 2,       # Masters in the top subsystem
+    'depth': 2,         # Levels of nested subsystems below the top one
+    'fanout': 1,        # Nested subsystems in each subsystem
+    'mix': "apb,obi,axi", # Peripheral protocols, assigned round-robin
+    'nports': 4,        # N_PORTS of the multi-port peripheral of each subsystem (0 for none)
+    'user_intcs': 1,    # User defined interconnects (intc_l) in the top subsystem
+}
+
+# Protocols the peripherals of a subsystem can use, i.e., with an adapter (path) from the subsystem one
+# obi subsystems use obi2apb and obi2axi, axi subsystems use the axi2axil + axil2apb chain for apb
+ALLOWED_PROTOCOLS = {
+    'obi': ("obi", "apb", "axi"),
+    'axi': ("axi", "apb"),
+}
+
+# Phases shown in the summary table
+SUMMARY_PHASES = ("glue", "subsystems", "intcs", "adapters", "output_subsystems", "output_pkg", "output_dot")
+
+def intf_value(proto: str, prefix: str, modport: str, n_ports: int = 0) -> str:
+    """Returns an interface struct value of a given protocol."""
+    struct = f"{proto}_intc" if n_ports else f"{proto}_intf"
+    fields = "ADDR_WIDTH:32, DATA_WIDTH:32, "
+    if proto == "axi":
+        fields += "ID_WIDTH:4, "
+    if n_ports:
+        fields += f"N_PORTS:{n_ports}, "
+    return f"{struct}'{{{fields}prefix:\"{prefix}\", modport:Modport::{modport}, cap:false, regex:\"\"}}"
+
+def subsystem_protocol(level: int) -> str:
+    """Returns the protocol of the subsystems of a nesting level.
+
+    The top subsystem is obi and the nested ones are axi (reached through an obi2axi adapter),
+    as there is no adapter from axi to obi.
+    """
+    return "obi" if level == 0 else "axi"
+
+def gen_soc_rdl(params: Dict[str, Any]) -> str:
+    """Returns the RDL of a synthetic SoC, the top addrmap is named bench_soc."""
+    mix = params['mix'].split(",")
+    rdl = ""
+
+    # Leaf components
+    for proto in ("obi", "apb", "axi"):
+        rdl += f"""
+addrmap {proto}_periph #({proto}_intf INTF = {intf_value(proto, "s_", "slave")}) {{
+    ifports = '{{INTF}};
+    bclk clk; brstn rstn;
+    mem {{mementries = 1024; memwidth = 32;}} external memory;
+}};
+"""
+    rdl += f"""
+addrmap obi_core #(obi_intf INTF = {intf_value("obi", "data_", "master")}) {{
+    ifports = '{{INTF}};
+    bclk clk; brstn rstn;
+    mem {{mementries = 1; memwidth = 32;}} external memory;
+}};
+
+addrmap apb_multi_periph {{
+    apb_intc_ports = '{{{intf_value("apb", "mp_", "slave", n_ports=max(params['nports'], 1))}}};
+    bclk clk; brstn rstn;
+    mem {{mementries = 64; memwidth = 32;}} external memory;
+}};
+"""
+
+    # Subsystems, from the deepest level to the top one
+    for level in range(params['depth'], -1, -1):
+        proto = subsystem_protocol(level)
+        if level == 0:
+            rdl += "\naddrmap bench_soc {\n    subsystem;\n"
+            for i in range(params['masters']):
+                rdl += f"    obi_core m{i};\n"
+            if params['user_intcs']:
+                intcs = [f"intc'{{name:\"user{u}\", slv_ports:'{{\"um{u}.data_\"}}, mst_ports:'{{\"us{u}.s_\"}}}}"
+                         for u in range(params['user_intcs'])]
+                rdl += f"    intc_l = '{{{', '.join(intcs)}}};\n"
+                for u in range(params['user_intcs']):
+                    rdl += f"    obi_core um{u};\n    obi_periph us{u};\n"
+        else:
+            rdl += f"\naddrmap sub_l{level} #({proto}_intf INTF = {intf_value(proto, 's_', 'slave')}) {{\n"
+            rdl += "    subsystem;\n    ifports = '{INTF};\n"
+
+        for i in range(params['peripherals']):
+            periph_proto = mix[i % len(mix)]
+            if periph_proto not in ALLOWED_PROTOCOLS[proto]:
+                periph_proto = "apb"
+            rdl += f"    {periph_proto}_periph p{i};\n"
+        if params['nports']:
+            rdl += "    apb_multi_periph mp;\n"
+        if level < params['depth']:
+            for j in range(params['fanout']):
+                rdl += f"    sub_l{level + 1} s{j};\n"
+        rdl += "    bclk clk; brstn rstn;\n};\n"
+
+    return rdl
+
+def run_one(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Generates a SoC and exports it, returns the export profile."""
+    # Imported here so the parent process does not load the package
+    from systemrdl import RDLCompiler # pylint: disable=import-outside-toplevel
+    from peakrdl_socgen import SocExporter # pylint: disable=import-outside-toplevel
+    from peakrdl_socgen.profiling import Profiler, set_profiler # pylint: disable=import-outside-toplevel
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        soc_rdl = os.path.join(tmpdir, "bench_soc.rdl")
+        with open(soc_rdl, "w") as f:
+            f.write(gen_soc_rdl(params))
+
+        profiler = Profiler(track_memory=True)
+        set_profiler(profiler)
+        with profiler.phase("compile_design"):
+            rdlc = RDLCompiler()
+            for rdl_file in [COMMON_RDL, BASE_RDL, soc_rdl]:
+                rdlc.compile_file(rdl_file)
+            top_node = rdlc.elaborate("bench_soc").top
+
+        outdir = os.path.join(tmpdir, "out")
+        SocExporter().export(top_node, outdir, intfs=[COMMON_RDL, BASE_RDL, INTFS_RDL], vinject=[], gen_dot=True)
+        set_profiler(None)
+
+        profile = profiler.to_dict()
+        profile['output_bytes'] = sum(os.path.getsize(os.path.join(outdir, f)) for f in os.listdir(outdir))
+    return profile
+
+def run_config(params: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Runs a configuration in fresh processes and returns the profile of the fastest run."""
+    best = None
+    for _ in range(repeat):
+        res = subprocess.run([sys.executable, __file__, "--single", json.dumps(params)],
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, text=True)
+        profile = json.loads(res.stdout.splitlines()[-1])
+        if best is None or profile['total_time'] < best['total_time']:
+            best = profile
+    assert best is not None
+    return {'params': params, 'profile': best}
+
+def config_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+def get_environment() -> Dict[str, Any]:
+    """Returns the commit and versions the results were obtained with."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, check=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'machine': platform.machine()}
+
+def print_results(results: List[Dict[str, Any]], varying: List[str]):
+    """Prints a table with the time of the main phases and the peak RSS of each configuration."""
+    header = [p for p in varying] + ["total"] + list(SUMMARY_PHASES) + ["rss MB"]
+    print(" ".join(f"{h:>12}" for h in header))
+    for r in results:
+        phases = r['profile']['phases']
+        row = [str(r['params'][p]) for p in varying]
+        row += [f"{r['profile']['total_time']:.3f}"]
+        row += [f"{phases[p]['time']:.3f}" if p in phases else "-" for p in SUMMARY_PHASES]
+        rss = r['profile']['peak_rss_bytes']
+        row += [f"{rss / 2**20:.1f}" if rss is not None else "-"]
+        print(" ".join(f"{c:>12}" for c in row))
+
+def print_scaling(results: List[Dict[str, Any]], param: str):
+    """Prints the growth exponent of the total time between successive values of a swept parameter.
+
+    An exponent close to 1 means linear scaling, close to 2 quadratic.
+    """
+    print(f"\nScaling with {param} (time ~ {param}^k):")
+    for prev, cur in zip(results, results[1:]):
+        x0, x1 = prev['params'][param], cur['params'][param]
+        t0, t1 = prev['profile']['total_time'], cur['profile']['total_time']
+        if x0 > 0 and x1 > x0 and t0 > 0:
+            k = math.log(t1 / t0) / math.log(x1 / x0)
+            print(f"    {x0:>6} -> {x1:<6} k = {k:.2f}")
+
+def compare(results: List[Dict[str, Any]], baseline_file: str, threshold: float) -> bool:
+    """Compares the total and phase times with a baseline results file, returns False on regressions."""
+    with open(baseline_file, "r") as f:
+        baseline = json.load(f)
+    base_by_key = {config_key(r['params']): r['profile'] for r in baseline['results']}
+
+    print(f"\nComparison with {baseline_file} (commit {baseline['environment'].get('commit')}), new/old time ratio:")
+    ok = True
+    for r in results:
+        base = base_by_key.get(config_key(r['params']))
+        if base is None:
+            continue
+        ratios = {'total': r['profile']['total_time'] / base['total_time']}
+        for p in SUMMARY_PHASES:
+            if p in r['profile']['phases'] and p in base['phases'] and base['phases'][p]['time'] > 0:
+                ratios[p] = r['profile']['phases'][p]['time'] / base['phases'][p]['time']
+        regression = ratios['total'] > threshold
+        ok = ok and not regression
+        ratios_str = " ".join(f"{p}:{v:.2f}" for p, v in ratios.items())
+        print(f"    {'REGRESSION ' if regression else ''}{config_key(r['params'])}\n        {ratios_str}")
+    return ok
+
+def parse_sweep(sweep: str):
+    """Parses a PARAM=V1,V2,... sweep argument."""
+    param, _, values = sweep.partition("=")
+    param = param.replace("-", "_")
+    assert param in DEFAULT_PARAMS and param != "mix", f"Cannot sweep parameter: {param}"
+    return param, [int(v) for v in values.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for param, default in DEFAULT_PARAMS.items():
+        parser.add_argument("--" + param.replace("_", "-"), dest=param, type=type(default), default=default)
+    parser.add_argument("--sweep", default=None, help="Parameter to sweep, e.g., peripherals=50,100,200")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per configuration, the fastest one is kept")
+    parser.add_argument("-o", "--output", default=None, help="JSON file where the results are written")
+    parser.add_argument("--compare", default=None, help="JSON results file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Total time ratio above which a configuration is reported as a regression")
+    parser.add_argument("--single", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Worker mode, export a single configuration and print its profile
+    if args.single is not None:
+        print(json.dumps(run_one(json.loads(args.single))))
+        return
+
+    params = {p: getattr(args, p) for p in DEFAULT_PARAMS}
+    configs = [params]
+    varying: List[str] = []
+    if args.sweep is not None:
+        param, values = parse_sweep(args.sweep)
+        configs = [dict(params, **{param: v}) for v in values]
+        varying = [param]
+
+    results = [run_config(c, args.repeat) for c in configs]
+    print_results(results, varying)
+    if varying:
+        print_scaling(results, varying[0])
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({'environment': get_environment(), 'results': results}, f, indent=2)
+
+    if args.compare is not None and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Output regression check: the export paths that must generate byte-identical files.
+
+A synthetic SoC (see bench_scaling.py) is exported without timestamp in each configuration:
+- serial, the reference,
+- with 2 worker processes (--jobs 2),
+- with low_memory (--low-memory),
+- from the intermediate representation written with emit_ir (--emit-ir, then --from-ir),
+- from the intermediate representation with 2 worker processes,
+- in incremental mode, with another inject file content and then the right one, so the second
+  export only builds the top subsystem and reads the other summaries from the manifest.
+Each output directory is compared to the reference one, file by file (the incremental manifest
+is skipped). The script prints the differing files and exits with a non-zero status if any
+configuration does not match.
+
+Usage: python benchmarks/check_outputs.py [--peripherals N] [--depth N] [--fanout N] [--dot-mode MODE] [--keep DIR]
+"""
+
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+from typing import List
+
+from systemrdl import RDLCompiler
+
+from peakrdl_socgen import SocExporter
+from peakrdl_socgen.incremental import MANIFEST_NAME
+from peakrdl_socgen.render_plan import DOT_MODES
+
+from bench_scaling import COMMON_RDL, BASE_RDL, INTFS_RDL, DEFAULT_PARAMS, gen_soc_rdl
+
+INTFS = [COMMON_RDL, BASE_RDL, INTFS_RDL]
+INJECT = "// Injected\nassign inj = 1'b0;\n"
+
+def write_file(path: str, content: str):
+    with open(path, "w") as f:
+        f.write(content)
+
+def export_incremental(top_node, outdir: str, options: dict):
+    """Exports incrementally twice, first with another content of the inject file of the top subsystem."""
+    write_file(options['vinject'][0], "// Previous\n")
+    SocExporter().export(top_node, outdir, intfs=INTFS, incremental=True, **options)
+    write_file(options['vinject'][0], INJECT)
+    SocExporter().export(top_node, outdir, intfs=INTFS, incremental=True, **options)
+
+def compare_dirs(ref_dir: str, out_dir: str) -> List[str]:
+    """Returns the files missing, extra or differing in out_dir, compared to ref_dir."""
+    ref_files = set(os.listdir(ref_dir)) - {MANIFEST_NAME}
+    out_files = set(os.listdir(out_dir)) - {MANIFEST_NAME}
+    diffs = [f"missing {f}" for f in sorted(ref_files - out_files)]
+    diffs += [f"extra {f}" for f in sorted(out_files - ref_files)]
+    _, mismatch, errors = filecmp.cmpfiles(ref_dir, out_dir, sorted(ref_files & out_files), shallow=False)
+    diffs += [f"differs {f}" for f in mismatch + errors]
+    return diffs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peripherals", type=int, default=32, help="Peripherals in each subsystem")
+    parser.add_argument("--depth", type=int, default=DEFAULT_PARAMS['depth'], help="Levels of nested subsystems")
+    parser.add_argument("--fanout", type=int, default=2, help="Nested subsystems in each subsystem")
+    parser.add_argument("--dot-mode", choices=DOT_MODES, default="split", help="Dot mode of the exports")
+    parser.add_argument("--keep", metavar="DIR", help="Keep the output directories in DIR")
+    args = parser.parse_args()
+
+    params = dict(DEFAULT_PARAMS, peripherals=args.peripherals, depth=args.depth, fanout=args.fanout)
+    tmpdir = tempfile.mkdtemp()
+    work_dir = args.keep if args.keep is not None else tmpdir
+    try:
+        soc_rdl = os.path.join(tmpdir, "bench_soc.rdl")
+        write_file(soc_rdl, gen_soc_rdl(params))
+        # Injected into the top subsystem, so the inject file streaming is also checked
+        vinject = [os.path.join(tmpdir, "bench_soc_inj.sv")]
+        write_file(vinject[0], INJECT)
+
+        rdlc = RDLCompiler()
+        for rdl_file in [COMMON_RDL, BASE_RDL, soc_rdl]:
+            rdlc.compile_file(rdl_file)
+        top_node = rdlc.elaborate("bench_soc").top
+
+        options = {'vinject': vinject, 'gen_dot': True, 'dot_mode': args.dot_mode, 'timestamp': False}
+        ir_file = os.path.join(work_dir, "soc_ir.json.gz")
+        ref_dir = os.path.join(work_dir, "serial")
+        configs = {
+            "serial": lambda d: SocExporter().export(top_node, d, intfs=INTFS, emit_ir=ir_file, **options),
+            "jobs": lambda d: SocExporter().export(top_node, d, intfs=INTFS, jobs=2, **options),
+            "low_memory": lambda d: SocExporter().export(top_node, d, intfs=INTFS, low_memory=True, **options),
+            "from_ir": lambda d: SocExporter().export_ir(ir_file, d, **options),
+            "from_ir_jobs": lambda d: SocExporter().export_ir(ir_file, d, jobs=2, **options),
+            "incremental": lambda d: export_incremental(top_node, d, options),
+        }
+
+        failed = False
+        for name, export in configs.items():
+            out_dir = os.path.join(work_dir, name)
+            shutil.rmtree(out_dir, ignore_errors=True)
+            export(out_dir)
+            diffs = compare_dirs(ref_dir, out_dir) if name != "serial" else []
+            n_files = len(set(os.listdir(out_dir)) - {MANIFEST_NAME})
+            print(f"{name:<14} {n_files:>4} files  {'FAIL' if diffs else 'ok'}")
+            for diff in diffs:
+                print(f"    {diff}")
+            failed = failed or bool(diffs)
+    finally:
+        shutil.rmtree(tmpdir)
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -23,12 +23,15 @@ setuptools.setup(
     package_data={'peakrdl_socgen' : ['templates/*']},
     include_package_data=True,
     install_requires=[
-        "systemrdl-compiler>=1.25.0",
+        "systemrdl-compiler>=1.28.0,<2",
         "Jinja2>=3.0.0",
     ],
     entry_points = {
         "peakrdl.exporters": [
             'socgen = peakrdl_socgen.__peakrdl__:Exporter'
+        ],
+        "console_scripts": [
+            'socgen-daemon = peakrdl_socgen.daemon:main'
         ]
     },
     classifiers=(
@@ -1,4 +1,24 @@
+from typing import TYPE_CHECKING
+
 from .__about__ import __version__
 
-from .exporter import SocExporter
-from .subsystem import SubsystemListener, Subsystem
+if TYPE_CHECKING:
+    from .exporter import SocExporter
+    from .subsystem import SubsystemListener, Subsystem
+
+# The exporter and the model classes (and jinja2) are only imported when used, so loading the
+# PeakRDL plugin (see __peakrdl__.py) on every peakrdl invocation stays cheap
+_LAZY_ATTRS = {
+    'SocExporter': '.exporter',
+    'SubsystemListener': '.subsystem',
+    'Subsystem': '.subsystem',
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        import importlib # pylint: disable=import-outside-toplevel
+        return getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
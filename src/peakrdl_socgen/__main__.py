@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Generates the SoCGen output files from an intermediate representation file, or of a batch of SoC variants.
+
+The intermediate representation file is written by the socgen exporter with --emit-ir. The RDL
+compiler is not used, so the outputs are regenerated quickly, e.g., after a template change:
+
+    peakrdl socgen design.rdl --intfs intfs.rdl -o out --emit-ir soc_ir.json.gz
+    python -m peakrdl_socgen --from-ir soc_ir.json.gz -o out
+
+A batch file lists SoC variants (designs, top-level parameters, export options and output
+directories), see batch.py. They are exported by a single process (or -j worker processes)
+sharing the compiled --intfs files, designs and templates:
+
+    python -m peakrdl_socgen --batch variants.json -j 8
+"""
+
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from .__about__ import __version__
+from .exporter import SocExporter
+from .elab_cache import DEFAULT_ELAB_CACHE_SIZE
+from .batch import read_batch
+from .render_plan import DOT_MODES
+from .profiling import Profiler, set_profiler
+from .log import setup_logging
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m peakrdl_socgen", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--from-ir", dest="from_ir", metavar="FILE",
+                      help="Intermediate representation file written with --emit-ir.")
+    mode.add_argument("--batch", dest="batch", metavar="FILE",
+                      help="Batch file of the SoC variants to export, each one to its own output directory. \
+                          The export options of the variants are given in the file.")
+    parser.add_argument("-o", "--output", dest="output", metavar="DIR",
+                        help="Output directory (--from-ir only).")
+    parser.add_argument("--vinject", nargs="*", default=[],
+                        help="List of files to inject into the generated subsystems (see the exporter --vinject option).")
+    parser.add_argument("--use-include", dest="use_include", default=False, action="store_true",
+                        help="Use verilog include directive to include files specified with --vinject flag.")
+    parser.add_argument("--gen-dot", dest="gen_dot", default=False, action="store_true",
+                        help="Generate also block diagram of the generated SoC in graphviz dot format.")
+    parser.add_argument("--dot-mode", dest="dot_mode", choices=DOT_MODES, default="full",
+                        help="Diagrams generated with --gen-dot (see the exporter --dot-mode option, default: %(default)s).")
+    parser.add_argument("--incremental", dest="incremental", default=False, action="store_true",
+                        help="Do not rewrite the files whose content did not change, so their modification time is kept.")
+    parser.add_argument("--no-timestamp", dest="timestamp", default=True, action="store_false",
+                        help="Do not write the generation date in the generated files.")
+    parser.add_argument("-j", "--jobs", dest="jobs", type=int, default=1,
+                        help="Number of worker processes used to render the subsystems, or to export the variants \
+                            with --batch (default: %(default)s).")
+    parser.add_argument("--template-cache", dest="template_cache", metavar="DIR", default=None,
+                        help="Directory where the compiled templates are cached and reused across runs.")
+    parser.add_argument("--glue-cache", dest="glue_cache", metavar="DIR", default=None,
+                        help="Directory where the compiled --intfs files are cached and reused across runs (--batch only).")
+    parser.add_argument("--elab-cache-size", dest="elab_cache_size", type=int, default=DEFAULT_ELAB_CACHE_SIZE,
+                        help="Maximum number of interface, adapter and interconnect elaborations kept in the cache \
+                            (--batch only, default: %(default)s).")
+    parser.add_argument("--log-level", dest="log_level", choices=["debug", "info", "warning", "error"], default="info",
+                        help="Level of the messages printed (default: %(default)s).")
+    parser.add_argument("--profile", dest="profile", metavar="FILE", nargs="?", const="socgen_profile.json", default=None,
+                        help="Record the wall time of each phase and write it as JSON to FILE (default: %(const)s).")
+    parser.add_argument("-v", "--version", action="version", version='%(prog)s ' + __version__)
+    options = parser.parse_args(argv)
+    if options.from_ir is not None and options.output is None:
+        parser.error("the -o/--output argument is required with --from-ir")
+
+    setup_logging(getattr(logging, options.log_level.upper()))
+    profiler = Profiler() if options.profile is not None else None
+    set_profiler(profiler)
+    soc = SocExporter(
+        elab_cache_size=options.elab_cache_size,
+        template_cache_dir=options.template_cache,
+        glue_cache_dir=options.glue_cache,
+    )
+    try:
+        if options.batch is not None:
+            errors = soc.export_many(read_batch(options.batch), jobs=options.jobs)
+            failed = [name for name, error in errors.items() if error is not None]
+            if failed:
+                print(f"Failed variant(s): {', '.join(failed)}", file=sys.stderr)
+                return 1
+        else:
+            soc.export_ir(
+                ir_file=options.from_ir,
+                outdir=options.output,
+                vinject=options.vinject,
+                use_include=options.use_include,
+                gen_dot=options.gen_dot,
+                dot_mode=options.dot_mode,
+                incremental=options.incremental,
+                timestamp=options.timestamp,
+                jobs=options.jobs,
+            )
+    finally:
+        if profiler is not None:
+            set_profiler(None)
+            profiler.save(options.profile)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from jinja2.environment import nodes
+import logging
 
 from peakrdl.plugins.exporter import ExporterSubcommandPlugin #pylint: disable=import-error
 from peakrdl.config import schema #pylint: disable=import-error
@@ -7,13 +7,15 @@ from peakrdl.config import schema #pylint: disable=import-error
 from systemrdl.node import AddrmapNode
 
 from .__about__ import __version__
-from .exporter import  SocExporter
+from .elab_cache import DEFAULT_ELAB_CACHE_SIZE
+from .render_plan import DOT_MODES
+from .profiling import Profiler, set_profiler
+from .log import ConnectionTrace, setup_logging, set_trace
 
 if TYPE_CHECKING:
     import argparse
 
 
-
 class Exporter(ExporterSubcommandPlugin):
     short_desc = "Generate SoC interconnections from a SystemRDL description."
     long_desc = "Generate SoC interconnections from a SystemRDL description."
@@ -61,6 +63,123 @@ class Exporter(ExporterSubcommandPlugin):
             help="Generate also block diagram of the generated SoC in graphviz dot format."
         )
 
+        arg_group.add_argument(
+            "--dot-mode",
+            dest="dot_mode",
+            choices=DOT_MODES,
+            default="full",
+            help="Diagrams generated with --gen-dot: full (one diagram with all the subsystems expanded), \
+                top (the top subsystem, nested subsystems collapsed into one node) or split (the top diagram \
+                and one <subsystem>.dot diagram per nested subsystem). Default: %(default)s."
+        )
+
+        arg_group.add_argument(
+            "--incremental",
+            dest="incremental",
+            default=False,
+            action="store_true",
+            help="Only build the subsystems and generate the files whose inputs changed since the last export \
+                in the output directory. Files with unchanged content are not rewritten, so their modification \
+                time is kept."
+        )
+
+        arg_group.add_argument(
+            "--no-timestamp",
+            dest="timestamp",
+            default=True,
+            action="store_false",
+            help="Do not write the generation date in the generated files."
+        )
+
+        arg_group.add_argument(
+            "-j", "--jobs",
+            dest="jobs",
+            type=int,
+            default=1,
+            help="Number of worker processes used to render the subsystems (default: %(default)s)."
+        )
+
+        arg_group.add_argument(
+            "--elab-cache-size",
+            dest="elab_cache_size",
+            type=int,
+            default=DEFAULT_ELAB_CACHE_SIZE,
+            help="Maximum number of interface, adapter and interconnect elaborations kept in the cache \
+                (default: %(default)s). Use 0 to disable the cache."
+        )
+
+        arg_group.add_argument(
+            "--template-cache",
+            dest="template_cache",
+            metavar="DIR",
+            default=None,
+            help="Directory where the compiled templates are cached and reused across runs."
+        )
+
+        arg_group.add_argument(
+            "--glue-cache",
+            dest="glue_cache",
+            metavar="DIR",
+            default=None,
+            help="Directory where the compiled --intfs files are cached and reused across runs. \
+                An entry is invalidated when any of the files, or the socgen or systemrdl-compiler version changes."
+        )
+
+        arg_group.add_argument(
+            "--low-memory",
+            dest="low_memory",
+            default=False,
+            action="store_true",
+            help="Build, render and free the subsystems one at a time, so the peak memory is bounded by the \
+                largest subsystem instead of the whole SoC. The subsystems are rendered serially."
+        )
+
+        arg_group.add_argument(
+            "--emit-ir",
+            dest="emit_ir",
+            metavar="FILE",
+            default=None,
+            help="Also write the resolved SoC model to FILE as JSON (gzip compressed if FILE ends with .gz). \
+                The outputs can then be regenerated from it without the RDL compiler, with: \
+                python -m peakrdl_socgen --from-ir FILE -o DIR"
+        )
+
+        arg_group.add_argument(
+            "--log-level",
+            dest="log_level",
+            choices=["debug", "info", "warning", "error"],
+            default="info",
+            help="Level of the messages printed (default: %(default)s)."
+        )
+
+        arg_group.add_argument(
+            "--trace",
+            dest="trace",
+            metavar="FILE",
+            default=None,
+            help="Write every clock, reset, signal and adapter connection decision to FILE, one JSON object per line."
+        )
+
+        arg_group.add_argument(
+            "--profile",
+            dest="profile",
+            metavar="FILE",
+            nargs="?",
+            const="socgen_profile.json",
+            default=None,
+            help="Record the wall time and call count of each export phase, the number of RDL elaborations \
+                and evaluations, of interface ports and signals created, and the peak RSS, and write them \
+                as JSON to FILE (default: %(const)s)."
+        )
+
+        arg_group.add_argument(
+            "--cprofile",
+            dest="cprofile",
+            metavar="FILE",
+            default=None,
+            help="Run the export under cProfile and dump the statistics to FILE (readable with pstats)."
+        )
+
         arg_group.add_argument(
             "-v", "--version",
             dest="version",
@@ -70,8 +189,43 @@ class Exporter(ExporterSubcommandPlugin):
 
     def do_export(self, top_node: 'AddrmapNode', options: 'argparse.Namespace') -> None:
         """Plugin entry function."""
+        setup_logging(getattr(logging, options.log_level.upper()))
+        trace = ConnectionTrace(options.trace) if options.trace is not None else None
+        set_trace(trace)
+
+        profiler = Profiler() if options.profile is not None else None
+        set_profiler(profiler)
+        cprofiler = None
+        if options.cprofile is not None:
+            import cProfile # pylint: disable=import-outside-toplevel
+            cprofiler = cProfile.Profile()
+            cprofiler.enable()
+
+        try:
+            self.run_export(top_node, options)
+        finally:
+            if cprofiler is not None:
+                cprofiler.disable()
+                cprofiler.dump_stats(options.cprofile)
+            if profiler is not None:
+                set_profiler(None)
+                profiler.save(options.profile)
+            if trace is not None:
+                set_trace(None)
+                trace.close()
+
+    def run_export(self, top_node: 'AddrmapNode', options: 'argparse.Namespace') -> None:
+        """Runs the export or the file listing requested by the command line options."""
+        # PeakRDL loads this module on every invocation, so the exporter (with jinja2 and the model
+        # classes) is only imported when the socgen subcommand runs
+        from .exporter import SocExporter # pylint: disable=import-outside-toplevel
+
         # SoCgen exporter plugin
-        soc = SocExporter()
+        soc = SocExporter(
+            elab_cache_size=options.elab_cache_size,
+            template_cache_dir=options.template_cache,
+            glue_cache_dir=options.glue_cache,
+        )
 
         # Check the top_node is an AddrmapNode object
         if not isinstance(top_node, AddrmapNode):
@@ -88,4 +242,10 @@ class Exporter(ExporterSubcommandPlugin):
                 vinject=options.vinject,
                 use_include=options.use_include,
                 gen_dot=options.gen_dot,
+                dot_mode=options.dot_mode,
+                incremental=options.incremental,
+                timestamp=options.timestamp,
+                jobs=options.jobs,
+                emit_ir=options.emit_ir,
+                low_memory=options.low_memory,
             )
@@ -3,20 +3,89 @@
 #
 # Please retain this header in all redistributions and modifications of the code.
 
-from typing import List, Optional
-import re
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from systemrdl import RDLCompiler
+from systemrdl import RDLCompiler, component as comp
 from systemrdl.node import AddrmapNode
 from systemrdl.rdltypes import UserStruct
 
 from .module import Module
 from .intf import IntfPort
-from .signal import Signal
+from .elab_cache import get_elab_cache
+from .log import get_trace
+
+class AdapterCatalogue:
+    """Adapters defined in the glue library and the routes between interface types.
+
+    An adapter is an addrmap definition with the 'adapter' property, converting its SLV_INTF
+    interface type to its MST_INTF one. The adapters form a graph whose nodes are the interface
+    node types (e.g., obi_intf_node), a route is the shortest chain of adapters between two of them.
+    Routes are searched once per pair of interface types.
+    """
+    def __init__(self, rdlc: RDLCompiler):
+        # Interface node type -> list of (adapter, interface node type it converts to), in definition order
+        self.edges: Dict[str, List[Tuple[str, str]]] = {}
+        for name, adapter_def in self.get_adapter_defs(rdlc):
+            intf_types = {p.name: p.param_type.__name__ + "_node" for p in adapter_def.parameters
+                          if p.name in ("SLV_INTF", "MST_INTF")}
+            assert len(intf_types) == 2, f"Adapter {name} must have SLV_INTF and MST_INTF parameters"
+            self.edges.setdefault(intf_types['SLV_INTF'], []).append((name, intf_types['MST_INTF']))
+
+        self._routes: Dict[Tuple[str, str], Optional[List[str]]] = {}
+
+    @staticmethod
+    def get_adapter_defs(rdlc: RDLCompiler) -> Iterator[Tuple[str, comp.Addrmap]]:
+        """Yields the name and definition of the root scope addrmaps with the 'adapter' property."""
+        # systemrdl-compiler has no public API listing the root scope definitions. The root
+        # component's comp_defs is what RDLCompiler.elaborate() and RDLImporter.lookup_root_component()
+        # search, checked with the minimum version required by setup.py (1.28.0) and 1.33.0.
+        comp_defs = getattr(rdlc.root, 'comp_defs', None)
+        if comp_defs is None:
+            raise RuntimeError("Cannot list the root scope definitions, unsupported systemrdl-compiler version")
+        for name, definition in comp_defs.items():
+            if isinstance(definition, comp.Addrmap) and definition.properties.get('adapter', False) is not False:
+                yield name, definition
+
+    def route(self, from_type: str, to_type: str) -> Optional[List[str]]:
+        """Returns the adapters of the shortest chain from one interface node type to another, or None."""
+        key = (from_type, to_type)
+        if key not in self._routes:
+            self._routes[key] = self._search(from_type, to_type)
+        return self._routes[key]
+
+    def _search(self, from_type: str, to_type: str) -> Optional[List[str]]:
+        """Breadth-first search of the adapter graph, ties are broken by the adapter definition order."""
+        # Interface node type -> (previous interface node type, adapter)
+        parents: Dict[str, Tuple[str, str]] = {}
+        visited = {from_type}
+        queue = deque([from_type])
+        while queue:
+            intf_type = queue.popleft()
+            if intf_type == to_type:
+                route = []
+                while intf_type != from_type:
+                    intf_type, adapter = parents[intf_type]
+                    route.append(adapter)
+                return route[::-1]
+            for adapter, next_type in self.edges.get(intf_type, []):
+                if next_type not in visited:
+                    visited.add(next_type)
+                    parents[next_type] = (intf_type, adapter)
+                    queue.append(next_type)
+        return None
+
+def get_adapter_catalogue(rdlc: RDLCompiler) -> AdapterCatalogue:
+    """Returns the adapter catalogue of a glue RDLCompiler, discovering it if needed."""
+    catalogue = getattr(rdlc, 'adapter_catalogue', None)
+    if catalogue is None:
+        catalogue = AdapterCatalogue(rdlc)
+        rdlc.adapter_catalogue = catalogue # type: ignore
+    return catalogue
 
 class AdaptersPath:
     """This class is used to find the adapter path from one to another
-    interface type using a set of fixed adapters.
+    interface type using the adapters of the glue library.
     """
     def __init__(self,
                  adapt_from : IntfPort,
@@ -44,80 +113,47 @@ class AdaptersPath:
         return l
 
     def createAdaptersOnPath(self):
-         # TODO find this list automatically
-        available_adapters = ["axi2axil", "axil2apb", "nmi2apb", "obi2axil", "obi2axi", "obi2apb", "obi2apb_rt",  "obiTMR2obi",
-            "obiTMR2apb_rt", "apb2apb_rt", "apb_rt2apb"]
-        adapter_paths = []
-
         if self.adapt_from.type == self.adapt_to.type: # TODO check if different parameters
             return None
 
-        adapter_name = None
-        # Create the adapter name using the two interface types (e.g., obi_intf_node and apb_intf_node -> obi2apb)
-        if self.adapt_from.modport.name == "master":
-            adapter_name = self.adapt_from.type.replace("_intf_node", "") + "2" + self.adapt_to.type.replace("_intf_node", "")
-        elif self.adapt_from.modport.name == "slave":
-            adapter_name = self.adapt_from.type.replace("_intf_node", "") + "2" + self.adapt_to.type.replace("_intf_node", "")
-
-        # If a direct adapter exist return it
-        if adapter_name in available_adapters:
-            return [self.createAdapter(
-                    ad_type=adapter_name,
-                    adapt_from=self.adapt_from,
-                    adapt_to=self.adapt_to,
-                    )]
-
-        # Find a different path if direct adapter does not exist (not extensively tested)
-        fitting_slaves = []
-        fitting_masters = []
-        for a in available_adapters:
-            if a.split("2")[0] == adapter_name.split("2")[0]: # type: ignore
-                fitting_slaves.append(a)
-
-            if a.split("2")[1] == adapter_name.split("2")[1]: # type: ignore
-                fitting_masters.append(a)
-
-        adapter_paths = []
-        # Maximum path length is two adapters currently
-        for slv in fitting_slaves:
-            for mst in fitting_masters:
-                if slv.split("2")[1] == mst.split("2")[0]:
-                    adapter_paths.append([slv, mst])
-
-        assert len(adapter_paths) > 0, f"Could not find appropriate adapter or combination from {self.adapt_from.type} to {self.adapt_to.type}"
+        # Shortest chain of adapters converting the interface type
+        route = get_adapter_catalogue(self.rdlc).route(self.adapt_from.type, self.adapt_to.type)
+        assert route is not None, f"Could not find appropriate adapter or combination from {self.adapt_from.type} to {self.adapt_to.type}"
+
+        trace = get_trace()
+        if trace.enabled:
+            trace.record('adapter',
+                         adapt_from=f"{self.adapt_from.module.node.get_path()}.{self.adapt_from.node.inst_name}",
+                         adapt_to=f"{self.adapt_to.module.node.get_path()}.{self.adapt_to.node.inst_name}",
+                         from_type=self.adapt_from.type,
+                         to_type=self.adapt_to.type,
+                         route=route,
+                         intc_prefix=self.intc_prefix,
+                         )
 
         adapters = []
+        adapt_from = self.adapt_from
+        for cnt, ad_type in enumerate(route):
+            adapter = self.createAdapter(
+                    ad_type=ad_type,
+                    adapt_from=adapt_from,
+                    adapt_to=self.adapt_to,
+                    )
+            adapters.append(adapter)
 
-        for cnt, adapter in enumerate(adapter_paths[0]): # IF master TODO slave
-            if cnt == 0:
-                adapter = self.createAdapter(
-                        ad_type=adapter,
-                        adapt_from=self.adapt_from,
-                        adapt_to=self.adapt_to,
-                        )
-
-                adapt_to = IntfPort.create_intf_port(
+            if cnt < len(route) - 1:
+                # The next adapter is adapted from an interface with the parameters of this adapter master port
+                next_from = IntfPort.create_intf_port(
                         rdlc=self.rdlc,
                         module=adapter,
                         intf_struct=adapter.mst_port.params
                         )
                 # IntfPort.create_intf_port() returns a list, for adapters it should always return a single intf port
-                assert len(adapt_to) == 1, f"Assert adapter interface port returned more than one port."
-                adapt_to = adapt_to[0]
-
-                adapters.append(adapter)
-
-            elif cnt == len(adapter_paths[0]) - 1:
-                adapter = self.createAdapter(
-                        ad_type=adapter,
-                        adapt_from=adapt_to,
-                        adapt_to=self.adapt_to,
-                        )
-                adapters.append(adapter)
+                assert len(next_from) == 1, f"Assert adapter interface port returned more than one port."
+                adapt_from = next_from[0]
 
         return adapters
 
-
     def createAdapter(self, ad_type: str, adapt_from: IntfPort, adapt_to: IntfPort) -> 'Adapter':
         """Returns and Adapter handle for the given ports."""
 
@@ -126,35 +162,31 @@ class AdaptersPath:
         inst_name = ad_type # + "_" + adapt_from.module.node.get_path().replace(".", "_") + "2" + adapt_to.module.node.get_path().replace(".", "_")
         if self.intc_prefix:
             inst_name += "_" + self.intc_prefix
-        # Elaborate the interface SystemRDL compiler, overrides the adapter instance name,
-        # and get the addrmap no handle by getting the root node child
-        adapter_node = self.rdlc.elaborate(
-                top_def_name=ad_type,
-                inst_name=inst_name
-                ).get_child_by_name(inst_name)
+        elab_cache = get_elab_cache(self.rdlc)
 
         # Override all matching integer parameters from adapt_from interface to SLV_INTF parameter
+        # The parameters and their default values are read from the adapter definition
         override_slv_intf, slv_intf_type = {}, None
         override_mst_intf, mst_intf_type = {}, None
-        for p in adapter_node.inst.parameters:
+        for p_name, p_type in elab_cache.get_param_types(ad_type).items():
             # Look for the structure parameters
-            if isinstance(p.get_value(), UserStruct):
-                if p.name == "SLV_INTF":
-                    slv_intf_type = p.param_type.__name__
+            if isinstance(p_type, type) and issubclass(p_type, UserStruct):
+                if p_name == "SLV_INTF":
+                    slv_intf_type = p_type.__name__
                     # Get the structure members
-                    slv_intf = p.get_value().members
+                    slv_intf = elab_cache.get_param_default(ad_type, p_name).members
                     for k, v in slv_intf.items():
                         if isinstance(v, int) and not isinstance(v, bool):
-                            override_slv_intf[k] = adapt_from.__getattribute__(k)
+                            override_slv_intf[k] = getattr(adapt_from, k)
                         else: # bool, str, custom type
                             override_slv_intf[k] = slv_intf[k]
-                elif p.name == "MST_INTF":
-                    mst_intf_type = p.param_type.__qualname__
-                    mst_intf = p.get_value().members
+                elif p_name == "MST_INTF":
+                    mst_intf_type = p_type.__qualname__
+                    mst_intf = elab_cache.get_param_default(ad_type, p_name).members
                     for k, v in mst_intf.items():
                         if isinstance(v, int) and not isinstance(v, bool):
                             if k in adapt_to.params.members:
-                                override_mst_intf[k] = adapt_to.__getattribute__(k)
+                                override_mst_intf[k] = getattr(adapt_to, k)
                             else:
                                 # Use default value if not found in adapt_to node
                                 override_mst_intf[k] = mst_intf[k]
@@ -167,7 +199,7 @@ class AdaptersPath:
                 intf_dict=override_slv_intf
                 )
         # Convert the structure parameter string to a SystemRDL struct object
-        slv_intf_param = self.rdlc.eval(slv_intf_param_str)
+        slv_intf_param = elab_cache.eval(slv_intf_param_str)
 
         # Generate the struct parameter string for the master interface
         mst_intf_param_str = IntfPort.get_intf_param_string(
@@ -175,10 +207,12 @@ class AdaptersPath:
                 intf_dict=override_mst_intf
                 )
         # Convert the structure parameter string to a SystemRDL struct object
-        mst_intf_param = self.rdlc.eval(mst_intf_param_str)
+        mst_intf_param = elab_cache.eval(mst_intf_param_str)
 
-        # Override the generic parameters of the adapter and create a new adapter node
-        adapter_node = self.rdlc.elaborate(
+        # Override the generic parameters of the adapter and create the adapter node
+        # Elaborate the interface SystemRDL compiler, overrides the adapter instance name,
+        # and get the addrmap node handle by getting the root node child
+        adapter_node = elab_cache.elaborate(
                 top_def_name=ad_type,
                 inst_name=inst_name,
                 parameters={'SLV_INTF': slv_intf_param,
@@ -186,13 +220,16 @@ class AdaptersPath:
                             }
                 ).get_child_by_name(inst_name)
 
-        # Set the adapter address offset to the original AddrmapNode one
-        adapter_node.inst.addr_offset = adapt_to.module.node.inst.addr_offset
-
         # Return an Adapter object handle containing the adapter node
-        # We need to pass the original AddrmapNode size to the adapter to create the correct address map package for the SoC
-        # We cannot modify the size attribute like the addr_offset so it is passed as an argument to the adapter
-        return Adapter(rdlc=self.rdlc, module_node=adapter_node, end_intf=adapt_to, addr_map_size=adapt_to.module.size)
+        # We need to pass the original AddrmapNode size and address offset to the adapter to create the correct
+        # address map package for the SoC
+        # The adapter node can be shared with other identical adapters (elaboration cache) so it must not be modified
+        return Adapter(rdlc=self.rdlc,
+                       module_node=adapter_node,
+                       end_intf=adapt_to,
+                       addr_map_size=adapt_to.module.size,
+                       addr_offset=adapt_to.module.addr_offset,
+                       )
 
 
 class Adapter(Module):
@@ -200,11 +237,15 @@ class Adapter(Module):
     a bus protocol to a different one (e.g., obi <-> apb). This class extend the base
     Module class used to represent a verilog module.
     """
+    kind = "adapter"
+    __slots__ = ('end_intf', 'addr_map_size', 'adapter_addr_offset', 'intfs', 'slv_port', 'mst_port')
+
     def __init__(self,
             rdlc: RDLCompiler,
             module_node: AddrmapNode,
             end_intf: IntfPort,
-            addr_map_size: Optional[int] = None
+            addr_map_size: Optional[int] = None,
+            addr_offset: Optional[int] = None,
             ):
         self.rdlc = rdlc
 
@@ -216,40 +257,33 @@ class Adapter(Module):
         else:
             self.addr_map_size = addr_map_size
 
+        if addr_offset is None:
+            self.adapter_addr_offset = module_node.inst.addr_offset
+        else:
+            self.adapter_addr_offset = addr_offset
+
         super().__init__(self.node, self.rdlc) # type: ignore
 
+        # The adapter interface ports are built once, templates rely on their identity
+        self.intfs = self.createIntfs()
+        self.slv_port = self._getSlvPort()
+        self.mst_port = self._getMstPort()
+
     # Overloading base class Module function
-    def getSigVerilogName(self, s: Signal) -> str:
-        """Returns the module/node instance name appended with the end node and signal instance name."""
-        # Used for internal connection within a module, remove any port-specific suffix for better readability
-        signal_name = s.name
-        # This function is called only for internal signals, so remove any standard suffix
-        # Regex pattern
-        match_pattern = r"_(ni|nio|i|o|io|no)([A|B|C]?)$"
-        replace_pattern = r"\2"
-        if re.search(match_pattern, signal_name):
-            # Perform the regex replacement
-            signal_name = re.sub(match_pattern, replace_pattern, signal_name)
-        return self.node.inst_name + "_" + self.end_node_name + "_" + signal_name
+    def getSigVerilogPrefix(self) -> str:
+        """Returns the module/node instance name appended with the end node name."""
+        return self.node.inst_name + "_" + self.end_node_name + "_"
 
     @property
     def size(self) -> int:
         return self.addr_map_size
 
     @property
-    def slv_port(self) -> IntfPort:
-        slaves = [intf for intf in self.intfs if intf.modport.name == "slave"]
-        assert len(slaves) == 1, f"Must have only one slave port, {self.node.orig_type_name}"
-        return slaves[0]
+    def addr_offset(self) -> int:
+        return self.adapter_addr_offset
 
-    @property
-    def mst_port(self) -> IntfPort:
-        masters = [intf for intf in self.intfs if intf.modport.name == "master"]
-        assert len (masters) == 1, f"Must have only one master port, {self.node.orig_type_name}, len: {len(masters)}"
-        return masters[0]
-
-    @property
-    def intfs(self):
+    def createIntfs(self) -> List[IntfPort]:
+        """Returns an IntfPort object for each interface node of the adapter."""
         intfs = []
         for c in self.getAddrmaps():
 
@@ -260,6 +294,16 @@ class Adapter(Module):
                     ))
         return intfs
 
+    def _getSlvPort(self) -> IntfPort:
+        slaves = [intf for intf in self.intfs if intf.modport.name == "slave"]
+        assert len(slaves) == 1, f"Must have only one slave port, {self.node.orig_type_name}"
+        return slaves[0]
+
+    def _getMstPort(self) -> IntfPort:
+        masters = [intf for intf in self.intfs if intf.modport.name == "master"]
+        assert len (masters) == 1, f"Must have only one master port, {self.node.orig_type_name}, len: {len(masters)}"
+        return masters[0]
+
     @property
     def end_node_name(self):
         # If another adapter has been added skip it until we reach the base module
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Batch files listing the SoC variants exported by SocExporter.export_many().
+
+A batch file is a JSON object with a list of variants, and optional defaults applied to all of
+them (a variant field overrides the default one):
+
+    {
+        "defaults": {"intfs": ["rdl/intfs.rdl"], "gen_dot": true},
+        "variants": [
+            {"name": "soc_small", "rdl_files": ["rdl/soc.rdl"], "top": "soc",
+             "parameters": {"N_UARTS": "1"}, "outdir": "out/soc_small"},
+            {"name": "soc_large", "rdl_files": ["rdl/soc.rdl"], "top": "soc",
+             "parameters": {"N_UARTS": "4"}, "outdir": "out/soc_large"}
+        ]
+    }
+
+The parameters are RDL expressions overriding the top-level addrmap parameters (as the peakrdl
+-P option). The relative paths are relative to the batch file directory.
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+# Fields of a variant, and their default values (None for the required ones)
+VARIANT_FIELDS: Dict[str, Any] = {
+    # Design
+    'rdl_files': None,
+    'top': None,
+    'parameters': {},
+    'incl_search_paths': [],
+    # Export, see SocExporter.export()
+    'outdir': None,
+    'intfs': [],
+    'vinject': [],
+    'use_include': False,
+    'gen_dot': False,
+    'dot_mode': 'full',
+    'incremental': False,
+    'timestamp': True,
+    'emit_ir': None,
+    'low_memory': False,
+}
+REQUIRED_FIELDS = ('rdl_files', 'outdir')
+# Fields holding a path or a list of paths
+PATH_FIELDS = ('rdl_files', 'incl_search_paths', 'outdir', 'intfs', 'vinject', 'emit_ir')
+
+def get_variant(fields: Dict[str, Any], base_dir: str = "") -> Dict[str, Any]:
+    """Returns a complete variant from its fields, with the default values and absolute paths."""
+    unknown = sorted(set(fields) - set(VARIANT_FIELDS) - {'name'})
+    if unknown:
+        raise ValueError(f"Unknown variant field(s): {', '.join(unknown)}.")
+    missing = [f for f in REQUIRED_FIELDS if fields.get(f) is None]
+    if missing:
+        raise ValueError(f"Missing variant field(s): {', '.join(missing)}.")
+
+    variant = {k: fields.get(k, v) for k, v in VARIANT_FIELDS.items()}
+    for field in PATH_FIELDS:
+        value = variant[field]
+        if isinstance(value, list):
+            variant[field] = [os.path.abspath(os.path.join(base_dir, p)) for p in value]
+        elif value is not None:
+            variant[field] = os.path.abspath(os.path.join(base_dir, value))
+    variant['name'] = fields.get('name', os.path.basename(variant['outdir']))
+    return variant
+
+def read_batch(path: str) -> List[Dict[str, Any]]:
+    """Reads a batch file, returns its variants."""
+    with open(path, 'r') as f:
+        batch = json.load(f)
+    if not isinstance(batch, dict) or not isinstance(batch.get('variants'), list):
+        raise ValueError(f"{path} is not a socgen batch file, it has no 'variants' list.")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = batch.get('defaults', {})
+    variants = []
+    for idx, fields in enumerate(batch['variants']):
+        try:
+            variants.append(get_variant({**defaults, **fields}, base_dir))
+        except ValueError as e:
+            raise ValueError(f"{path}: variant {fields.get('name', idx)}: {e}") from e
+
+    # Each variant is written to its own output directory
+    for field in ('name', 'outdir'):
+        values = [v[field] for v in variants]
+        duplicates = sorted({x for x in values if values.count(x) > 1})
+        if duplicates:
+            raise ValueError(f"{path}: variants with the same {field}: {', '.join(duplicates)}.")
+    return variants
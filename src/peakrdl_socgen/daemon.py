@@ -0,0 +1,448 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+"""Long running SoCGen generator, serving export requests and regenerating the outputs on file changes.
+
+The daemon keeps a single exporter (template environment, glue compilers and their elaboration
+caches) and, for each export configuration, the compiled RDL design and its SoC model. An export
+only recompiles what changed, and only rewrites the outputs whose fingerprint changed (see the
+exporter --incremental option).
+
+Start the daemon, watching a design and regenerating its outputs when any of its RDL, --intfs or
+--vinject files changes:
+
+    socgen-daemon serve design.rdl --intfs intfs.rdl -o out
+
+Request an export from a build system (the paths are sent as absolute paths):
+
+    socgen-daemon export design.rdl --intfs intfs.rdl -o out
+
+The requests are JSON objects sent over a local Unix socket, one request per connection and one
+line per request and reply, see request().
+"""
+
+import argparse
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from systemrdl import RDLCompiler, RDLWalker
+from systemrdl.messages import RDLCompileError
+
+from .__about__ import __version__
+from .exporter import SocExporter
+from .subsystem import Subsystem, SubsystemListener
+from .incremental import Manifest
+from .elab_cache import DEFAULT_ELAB_CACHE_SIZE
+from .render_plan import DOT_MODES
+from .log import setup_logging
+
+# Handlers and level are set by the application, see log.setup_logging()
+daemon_logger = logging.getLogger("daemon_logger")
+
+# Socket created by default in the working directory of the daemon
+DEFAULT_SOCKET = ".socgen_daemon.sock"
+# Number of export configurations whose design and model are kept warm
+MAX_JOBS = 8
+
+def file_stamps(paths: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:
+    """Returns the (mtime, size) of each file, None for the missing ones."""
+    stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+class ExportJob:
+    """An export configuration, with its compiled design and SoC model kept between the exports.
+
+    The design is recompiled when one of its RDL files changes, and the model is dropped when the
+    design or the glue compiler changes. Only the subsystems with out of date outputs are built
+    again (see SocExporter.render_outputs_incremental()). Changes of the inject files or of the
+    templates only render the outputs again.
+    """
+    def __init__(self,
+                 exporter: SocExporter,
+                 rdl_files: List[str],
+                 outdir: str,
+                 intfs: List[str],
+                 vinject: List[str],
+                 top: Optional[str] = None,
+                 incl_search_paths: Optional[List[str]] = None,
+                 use_include: bool = False,
+                 gen_dot: bool = False,
+                 dot_mode: str = 'full',
+                 timestamp: bool = True,
+                 jobs: int = 1,
+                 ):
+        self.exporter = exporter
+        self.rdl_files = [os.path.abspath(f) for f in rdl_files]
+        self.outdir = os.path.abspath(outdir)
+        self.intfs = [os.path.abspath(f) for f in intfs]
+        self.vinject = [os.path.abspath(f) for f in vinject]
+        self.top = top
+        self.incl_search_paths = [os.path.abspath(d) for d in incl_search_paths or []]
+        self.use_include = use_include
+        self.gen_dot = gen_dot
+        self.dot_mode = dot_mode
+        self.timestamp = timestamp
+        self.jobs = jobs
+
+        # RDL files of the design, including the `include-d ones, and their stamps when compiled
+        self.design_files = list(self.rdl_files)
+        self.design_stamps: Optional[Dict[str, Optional[Tuple[int, int]]]] = None
+        self.subsystem_nodes: List[Any] = []
+        # Subsystems built so far by node path, and the glue compiler they were built with
+        self.rdlc: Optional[RDLCompiler] = None
+        self.models: Dict[str, Subsystem] = {}
+        # --intfs files and the files they `include, known once the glue is compiled
+        self.glue_files = list(self.intfs)
+        # Stamps of all the input files at the last export, see inputs_changed()
+        self.input_stamps = file_stamps(self.watched_files())
+
+    @property
+    def key(self) -> Tuple:
+        """Returns the configuration, two jobs with the same key generate the same outputs."""
+        return (tuple(self.rdl_files), self.outdir, tuple(self.intfs), tuple(self.vinject), self.top,
+                tuple(self.incl_search_paths), self.use_include, self.gen_dot, self.dot_mode, self.timestamp)
+
+    def watched_files(self) -> List[str]:
+        """Returns the files the outputs depend on."""
+        return self.design_files + self.glue_files + self.vinject
+
+    def inputs_changed(self) -> bool:
+        """Returns True if an input file changed since the last export."""
+        return file_stamps(self.watched_files()) != self.input_stamps
+
+    def compile_design(self):
+        """Compiles the RDL files of the design if they changed since the last compilation."""
+        stamps = file_stamps(self.design_files)
+        if stamps == self.design_stamps:
+            return
+
+        daemon_logger.info('Compiling %s.', " ".join(self.rdl_files))
+        self.design_stamps = None
+        self.models = {}
+        rdlc = RDLCompiler()
+        design_files = set(self.rdl_files)
+        try:
+            for rdl_file in self.rdl_files:
+                design_files.update(rdlc.compile_file(rdl_file, self.incl_search_paths).included_files)
+            top_node = rdlc.elaborate(self.top).top
+        finally:
+            # Also watched if the compilation failed, to try again once they are fixed
+            self.design_files = self.rdl_files + sorted(design_files - set(self.rdl_files))
+        self.design_stamps = stamps if set(stamps) == set(self.design_files) else file_stamps(self.design_files)
+
+        listener = SubsystemListener()
+        RDLWalker(unroll=True).walk(top_node, listener)
+        self.subsystem_nodes = listener.subsystem_nodes
+
+    def run(self) -> List[str]:
+        """Exports the outputs which are out of date, returns their file names."""
+        self.exporter.check_dot_mode(self.dot_mode)
+        try:
+            self.compile_design()
+            rdlc = self.exporter.compile_glue(self.intfs)
+            self.glue_files = list(self.exporter.glue_files)
+        finally:
+            self.input_stamps = file_stamps(self.watched_files())
+        if rdlc is not self.rdlc:
+            self.rdlc = rdlc
+            self.models = {}
+
+        os.makedirs(self.outdir, exist_ok=True)
+        manifest = Manifest(self.outdir)
+        subsystem_fps = self.exporter.get_subsystem_fingerprints(self.subsystem_nodes, self.vinject, self.use_include,
+                                                                 self.timestamp)
+        fingerprints = self.exporter.get_fingerprints(self.outdir, self.subsystem_nodes, self.vinject, self.use_include,
+                                                      self.gen_dot, self.timestamp, self.dot_mode, subsystem_fps)
+        out_of_date = [f for f, fp in fingerprints.items() if not manifest.is_up_to_date(f, fp)]
+        if not out_of_date:
+            return []
+
+        self.exporter.render_outputs_incremental(self.subsystem_nodes, rdlc, self.outdir, self.vinject, self.use_include,
+                                                 self.gen_dot, self.timestamp, self.jobs, manifest, fingerprints,
+                                                 subsystem_fps, self.dot_mode, self.models)
+        return out_of_date
+
+class SocgenDaemon:
+    """Serves export requests over a Unix socket, and regenerates the watched job outputs on changes."""
+    def __init__(self,
+                 socket_path: str = DEFAULT_SOCKET,
+                 poll_interval: float = 0.5,
+                 elab_cache_size: int = DEFAULT_ELAB_CACHE_SIZE,
+                 template_cache_dir: Optional[str] = None,
+                 glue_cache_dir: Optional[str] = None,
+                 ):
+        self.socket_path = os.path.abspath(socket_path)
+        self.poll_interval = poll_interval
+        self.exporter = SocExporter(
+            elab_cache_size=elab_cache_size,
+            template_cache_dir=template_cache_dir,
+            glue_cache_dir=glue_cache_dir,
+        )
+        # Job exported at startup and each time one of its files changes
+        self.watched_job: Optional[ExportJob] = None
+        # Jobs of the socket requests, least recently used first
+        self.jobs: 'OrderedDict[Tuple, ExportJob]' = OrderedDict()
+        self.running = False
+
+    def new_job(self, **kwargs: Any) -> ExportJob:
+        return ExportJob(self.exporter, **kwargs)
+
+    def get_job(self, **kwargs: Any) -> ExportJob:
+        """Returns the kept job with the same configuration, or a new one."""
+        job = self.new_job(**kwargs)
+        if self.watched_job is not None and self.watched_job.key == job.key:
+            return self.watched_job
+        job = self.jobs.pop(job.key, job)
+        self.jobs[job.key] = job
+        while len(self.jobs) > MAX_JOBS:
+            self.jobs.popitem(last=False)
+        return job
+
+    def run_job(self, job: ExportJob) -> Dict[str, Any]:
+        """Runs a job, returns the reply to send: the status, the files written and the time taken."""
+        start = time.perf_counter()
+        try:
+            files = job.run()
+        except (RDLCompileError, ValueError, TypeError, OSError) as e:
+            daemon_logger.error('Export to %s failed: %s', job.outdir, e)
+            return {'status': 'error', 'message': str(e) or type(e).__name__}
+        except Exception as e: # pylint: disable=broad-except
+            # The model reports some design errors as assertions or index errors, a bad design
+            # must not stop the daemon
+            daemon_logger.exception('Export to %s failed.', job.outdir)
+            return {'status': 'error', 'message': f"{type(e).__name__}: {e}"}
+        elapsed = time.perf_counter() - start
+        if files:
+            daemon_logger.info('Generated %d files in %s in %.2f s.', len(files), job.outdir, elapsed)
+        return {'status': 'ok', 'files': files, 'time': elapsed}
+
+    def handle_request(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the reply to a request."""
+        cmd = req.get('cmd')
+        if cmd == 'export':
+            try:
+                job = self.get_job(**req.get('job', {}))
+            except TypeError as e:
+                return {'status': 'error', 'message': f"Invalid export request: {e}"}
+            return self.run_job(job)
+        if cmd == 'status':
+            return {'status': 'ok', 'version': __version__, 'pid': os.getpid(),
+                    'jobs': [job.outdir for job in self.jobs.values()],
+                    'watched': self.watched_job.outdir if self.watched_job is not None else None}
+        if cmd == 'shutdown':
+            self.running = False
+            return {'status': 'ok'}
+        return {'status': 'error', 'message': f"Unknown command {cmd!r}"}
+
+    def handle_connection(self, conn: socket.socket):
+        """Reads a request from a client connection and sends the reply."""
+        with conn, conn.makefile('rwb') as f:
+            try:
+                req = json.loads(f.readline())
+                if not isinstance(req, dict):
+                    raise ValueError("A request must be a JSON object")
+                reply = self.handle_request(req)
+            except ValueError as e:
+                reply = {'status': 'error', 'message': f"Invalid request: {e}"}
+            f.write(json.dumps(reply).encode() + b'\n')
+
+    def bind(self) -> socket.socket:
+        """Returns the listening socket, a stale socket file left by a killed daemon is replaced."""
+        if os.path.exists(self.socket_path):
+            try:
+                request({'cmd': 'status'}, self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"A socgen daemon is already listening on {self.socket_path}")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen()
+        return server
+
+    def serve(self, watched_job: Optional[ExportJob] = None):
+        """Serves the requests until a shutdown request or a SIGTERM/SIGINT signal."""
+        self.watched_job = watched_job
+        if watched_job is not None:
+            self.run_job(watched_job)
+
+        server = self.bind()
+        sel = selectors.DefaultSelector()
+        sel.register(server, selectors.EVENT_READ)
+        prev_handler = signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        daemon_logger.info('Listening on %s.', self.socket_path)
+        self.running = True
+        try:
+            while self.running:
+                for _ in sel.select(timeout=self.poll_interval):
+                    conn, _ = server.accept()
+                    try:
+                        self.handle_connection(conn)
+                    except OSError as e:
+                        # e.g., the client closed the connection before the reply
+                        daemon_logger.warning('Connection error: %s', e)
+                if self.running and watched_job is not None and watched_job.inputs_changed():
+                    # Wait for the files to be completely written
+                    time.sleep(self.poll_interval)
+                    self.run_job(watched_job)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, prev_handler)
+            sel.close()
+            server.close()
+            os.unlink(self.socket_path)
+            daemon_logger.info('Stopped.')
+
+    def stop(self):
+        self.running = False
+
+def request(req: Dict[str, Any], socket_path: str = DEFAULT_SOCKET, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Sends a request to a daemon and returns its reply.
+
+    The requests are:
+    - {'cmd': 'export', 'job': {...}}: exports the outputs of a job, the job fields are the
+      ExportJob arguments (rdl_files, outdir, intfs, vinject, top, ...). The reply lists the
+      files written and the time taken.
+    - {'cmd': 'status'}: returns the daemon version, pid, and kept jobs.
+    - {'cmd': 'shutdown'}: stops the daemon.
+
+    All the replies have a 'status' field, 'ok' or 'error' (with a 'message' field).
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        with client.makefile('rwb') as f:
+            f.write(json.dumps(req).encode() + b'\n')
+            f.flush()
+            reply = f.readline()
+    if not reply:
+        raise ConnectionError(f"No reply from the socgen daemon on {socket_path}")
+    return json.loads(reply)
+
+def add_job_arguments(parser: argparse.ArgumentParser, required: bool):
+    """Adds the arguments of an export configuration, the same as the peakrdl socgen ones."""
+    parser.add_argument("rdl_files", metavar="FILE", nargs="*" if not required else "+",
+                        help="SystemRDL files of the design.")
+    parser.add_argument("-t", "--top", dest="top", default=None,
+                        help="Top-level addrmap of the design (default: the last one defined).")
+    parser.add_argument("-I", dest="incl_search_paths", metavar="DIR", action="append", default=[],
+                        help="Search path for `include files.")
+    parser.add_argument("-o", "--output", dest="outdir", metavar="DIR", required=required,
+                        help="Output directory.")
+    parser.add_argument("--intfs", nargs="*", default=[],
+                        help="List of SystemRDL extension files describing possible interfaces/interconnection.")
+    parser.add_argument("--vinject", nargs="*", default=[],
+                        help="List of files to inject into the generated subsystems.")
+    parser.add_argument("--use-include", dest="use_include", default=False, action="store_true",
+                        help="Use verilog include directive to include files specified with --vinject flag.")
+    parser.add_argument("--gen-dot", dest="gen_dot", default=False, action="store_true",
+                        help="Generate also block diagram of the generated SoC in graphviz dot format.")
+    parser.add_argument("--dot-mode", dest="dot_mode", choices=DOT_MODES, default="full",
+                        help="Diagrams generated with --gen-dot: full, top or split (default: %(default)s).")
+    parser.add_argument("--no-timestamp", dest="timestamp", default=True, action="store_false",
+                        help="Do not write the generation date in the generated files.")
+    parser.add_argument("-j", "--jobs", dest="jobs", type=int, default=1,
+                        help="Number of worker processes used to render the subsystems (default: %(default)s).")
+
+def get_job_kwargs(options: argparse.Namespace) -> Dict[str, Any]:
+    """Returns the ExportJob arguments of the command line options, with absolute paths."""
+    return {
+        'rdl_files': [os.path.abspath(f) for f in options.rdl_files],
+        'outdir': os.path.abspath(options.outdir),
+        'intfs': [os.path.abspath(f) for f in options.intfs],
+        'vinject': [os.path.abspath(f) for f in options.vinject],
+        'top': options.top,
+        'incl_search_paths': [os.path.abspath(d) for d in options.incl_search_paths],
+        'use_include': options.use_include,
+        'gen_dot': options.gen_dot,
+        'dot_mode': options.dot_mode,
+        'timestamp': options.timestamp,
+        'jobs': options.jobs,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="socgen-daemon", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-v", "--version", action="version", version='%(prog)s ' + __version__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Start the daemon, exporting and watching a design if one is given.")
+    add_job_arguments(serve, required=False)
+    serve.add_argument("--poll", dest="poll_interval", type=float, default=0.5,
+                       help="Interval in seconds between two checks of the watched files (default: %(default)s).")
+    serve.add_argument("--elab-cache-size", dest="elab_cache_size", type=int, default=DEFAULT_ELAB_CACHE_SIZE,
+                       help="Maximum number of interface, adapter and interconnect elaborations kept in the cache \
+                           (default: %(default)s).")
+    serve.add_argument("--template-cache", dest="template_cache", metavar="DIR", default=None,
+                       help="Directory where the compiled templates are cached and reused across runs.")
+    serve.add_argument("--glue-cache", dest="glue_cache", metavar="DIR", default=None,
+                       help="Directory where the compiled --intfs files are cached and reused across runs.")
+    serve.add_argument("--log-level", dest="log_level", choices=["debug", "info", "warning", "error"], default="info",
+                       help="Level of the messages printed (default: %(default)s).")
+
+    export = commands.add_parser("export", help="Request an export from a running daemon.")
+    add_job_arguments(export, required=True)
+    commands.add_parser("status", help="Print the status of a running daemon.")
+    commands.add_parser("stop", help="Stop a running daemon.")
+    for subparser in commands.choices.values():
+        subparser.add_argument("--socket", dest="socket", metavar="PATH", default=DEFAULT_SOCKET,
+                               help="Unix socket of the daemon (default: %(default)s).")
+    options = parser.parse_args(argv)
+
+    if options.command == "serve":
+        setup_logging(getattr(logging, options.log_level.upper()))
+        daemon = SocgenDaemon(
+            socket_path=options.socket,
+            poll_interval=options.poll_interval,
+            elab_cache_size=options.elab_cache_size,
+            template_cache_dir=options.template_cache,
+            glue_cache_dir=options.glue_cache,
+        )
+        watched_job = None
+        if options.rdl_files:
+            if options.outdir is None:
+                parser.error("the -o/--output argument is required to watch a design")
+            watched_job = daemon.new_job(**get_job_kwargs(options))
+        daemon.serve(watched_job)
+        return 0
+
+    if options.command == "export":
+        req = {'cmd': 'export', 'job': get_job_kwargs(options)}
+    elif options.command == "status":
+        req = {'cmd': 'status'}
+    else:
+        req = {'cmd': 'shutdown'}
+    try:
+        reply = request(req, options.socket)
+    except (OSError, ValueError) as e:
+        print(f"socgen-daemon: error: cannot reach a socgen daemon on {options.socket}: {e}", file=sys.stderr)
+        return 1
+
+    if reply['status'] != 'ok':
+        print(f"socgen-daemon: error: {reply['message']}", file=sys.stderr)
+        return 1
+    if options.command == "export":
+        print(*reply['files'], sep="\n")
+    elif options.command == "status":
+        print(json.dumps(reply, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from enum import Enum
+
+from systemrdl import RDLCompiler
+from systemrdl.node import RootNode
+from systemrdl.rdltypes.user_struct import UserStruct
+
+from .profiling import get_profiler
+
+# Default maximum number of elaborated nodes and evaluated expressions kept in the cache
+DEFAULT_ELAB_CACHE_SIZE = 4096
+
+class ElabCache:
+    """Bounded LRU cache of the elaborations and evaluations done with the glue RDLCompiler.
+
+    Interface ports, adapters and interconnects with the same definition, instance name and
+    parameter values elaborate to identical nodes. The nodes returned by this cache are shared
+    between all the requesters and must therefore be treated as read-only.
+
+    The parameters declared by the root scope component definitions (i.e., their parameter
+    schemas) and their default values are also kept, they are read from a single elaboration of
+    each definition with its default parameters.
+    """
+    def __init__(self, rdlc: RDLCompiler, max_size: int = DEFAULT_ELAB_CACHE_SIZE):
+        self.rdlc = rdlc
+        # Maximum number of entries, 0 disables the caching
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+        # Definition name -> {parameter name: parameter type}
+        self._param_types: Dict[str, Dict[str, Any]] = {}
+        # Definition name -> {parameter name: default value}
+        self._param_defaults: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def canonicalize(value: Any) -> Hashable:
+        """Returns a hashable representation of an RDL parameter value."""
+        if isinstance(value, UserStruct):
+            return (type(value).__name__,
+                    tuple((k, ElabCache.canonicalize(v)) for k, v in sorted(value.members.items())))
+        if isinstance(value, Enum):
+            return (type(value).__name__, value.name)
+        if isinstance(value, (list, tuple)):
+            return tuple(ElabCache.canonicalize(v) for v in value)
+        # Keep bool and int apart as True == 1
+        return (type(value).__name__, value)
+
+    def _lookup(self, key: Hashable):
+        """Returns the cached entry for key (None if missing) and refreshes its LRU position."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            get_profiler().count('elab_cache_hits')
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Hashable, entry: Any):
+        """Stores an entry and evicts the least recently used ones above the size cap."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def eval(self, expression: str) -> Any:
+        """Cached version of RDLCompiler.eval()."""
+        key = ('eval', expression)
+        value = self._lookup(key)
+        if value is None:
+            get_profiler().count('rdlc_eval')
+            value = self.rdlc.eval(expression)
+            self._store(key, value)
+        return value
+
+    def elaborate(self,
+                  top_def_name: str,
+                  inst_name: str,
+                  parameters: Optional[Dict[str, Any]] = None,
+                  ) -> RootNode:
+        """Cached version of RDLCompiler.elaborate()."""
+        if parameters is None:
+            parameters = {}
+
+        key = ('elaborate', top_def_name, inst_name,
+               tuple((k, self.canonicalize(v)) for k, v in sorted(parameters.items())))
+        root = self._lookup(key)
+        if root is None:
+            get_profiler().count('rdlc_elaborate')
+            root = self.rdlc.elaborate(top_def_name=top_def_name,
+                                       inst_name=inst_name,
+                                       parameters=parameters)
+            self._store(key, root)
+        return root
+
+    def _read_params(self, def_name: str):
+        """Reads the parameter types and default values of a root scope component definition."""
+        # Not stored in the LRU entries, only the types and defaults read from it are kept, so the
+        # default elaboration is done once per definition and does not evict the requested ones
+        inst_name = "default_" + def_name
+        get_profiler().count('rdlc_elaborate')
+        root = self.rdlc.elaborate(top_def_name=def_name, inst_name=inst_name)
+        node = root.get_child_by_name(inst_name)
+        assert node is not None, f"No component definition named {def_name}"
+        self._param_types[def_name] = {p.name: p.param_type for p in node.inst.parameters}
+        self._param_defaults[def_name] = {p.name: p.get_value() for p in node.inst.parameters}
+
+    def get_param_types(self, def_name: str) -> Dict[str, Any]:
+        """Returns the parameter names and types declared by a root scope component definition."""
+        if def_name not in self._param_types:
+            self._read_params(def_name)
+        return self._param_types[def_name]
+
+    def get_param_default(self, def_name: str, param_name: str) -> Any:
+        """Returns the default value of a parameter of a root scope component definition."""
+        if def_name not in self._param_defaults:
+            self._read_params(def_name)
+        return self._param_defaults[def_name][param_name]
+
+    def clear(self):
+        """Drops all the cached entries and resets the counters."""
+        self._entries.clear()
+        self._param_types.clear()
+        self._param_defaults.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {len(self)}/{self.max_size} entries"
+
+
+def get_elab_cache(rdlc: RDLCompiler) -> ElabCache:
+    """Returns the elaboration cache attached to a glue RDLCompiler, creating it if needed."""
+    cache = getattr(rdlc, 'elab_cache', None)
+    if cache is None:
+        cache = ElabCache(rdlc)
+        rdlc.elab_cache = cache # type: ignore
+    return cache
@@ -4,36 +4,108 @@
 # Please retain this header in all redistributions and modifications of the code.
 
 import os
+import re
 import jinja2
+import multiprocessing
+import concurrent.futures
 import logging
-from typing import  Dict, Any, List
+from typing import  Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 from systemrdl.node import Node, RootNode
 from systemrdl import AddrmapNode, RDLCompiler, RDLWalker
+from systemrdl.messages import RDLCompileError
 
 from .__about__ import __version__
 from .subsystem import Subsystem, SubsystemListener
-
-# Logger generation for halnode module
+from .elab_cache import ElabCache, DEFAULT_ELAB_CACHE_SIZE
+from .glue_cache import GlueCache
+from .profiling import get_profiler
+from .incremental import Manifest, NodeFingerprint, hash_strings, write_if_changed
+from .ir import build_ir, save_ir, read_ir, load_ir
+from .render_plan import DOT_MODES, RenderPlan, SubsystemSummary
+from .log import ensure_logging
+
+# Handlers and level are set by the application, or on the first export, see log.ensure_logging()
 export_logger = logging.getLogger("export_logger")
-# Console handler
-ch = logging.StreamHandler()
-# create formatter and add it to the handlers
-formatter = logging.Formatter('%(name)s - %(levelname)s: %(message)s')
-ch.setFormatter(formatter)
-# add the handlers to the logger
-export_logger.addHandler(ch)
 
-# Set for more verbosity
-export_logger.setLevel(logging.INFO)
+# Marker emitted by the get_file_content filter, replaced by the file content when streaming the output
+INJECT_FILE_MARKER = "\0socgen-inject-file:{}\0"
+INJECT_FILE_MARKER_RE = re.compile("\0socgen-inject-file:([^\0]*)\0")
+# Size of the blocks read from the inject files
+STREAM_BLOCK_SIZE = 1 << 16
+
+# State inherited by the forked render workers (see SocExporter.render_subsystems_parallel)
+_render_state = None
+
+def _render_subsystem_worker(out_file: str):
+    """Renders the subsystem of an output file in a forked worker process."""
+    exporter, render_jobs, kwargs = _render_state # type: ignore
+    exporter.render_subsystem(render_jobs[out_file], out_file, **kwargs)
+
+# State inherited by the forked batch workers (see SocExporter.export_many)
+_batch_state = None
+
+def _export_variant_worker(idx: int) -> Optional[str]:
+    """Exports a variant in a forked worker process."""
+    exporter, variants, designs = _batch_state # type: ignore
+    return exporter.try_export_variant(variants[idx], designs)
 
 class SocExporter():
-    def __init__(self):
+    def __init__(self,
+                 elab_cache_size: int = DEFAULT_ELAB_CACHE_SIZE,
+                 template_cache_dir: Optional[str] = None,
+                 glue_cache_dir: Optional[str] = None,
+                 ):
         # Template used to generate a subsystem verilog file from a SystemRDL description
         self.subsystem_template = "subsystem.sv.j2"
         self.subsystem_ext = "." + self.subsystem_template.split(".")[1]
         self.addrmap_pkg_template = "soc_addr_map_pkg.sv.j2"
         self.dot_template = "soc_diagram.dot.j2"
+        self.dot_ext = "." + self.dot_template.split(".")[1]
+        # Maximum number of entries of the glue compiler elaboration cache
+        self.elab_cache_size = elab_cache_size
+
+        # Directory of the compiled glue (i.e., --intfs files) cache, disabled if None
+        self.glue_cache_dir = glue_cache_dir
+
+        # Single template environment, each template is parsed and compiled only once per exporter
+        self.jinja_env = self.create_jinja_env(template_cache_dir)
+
+        # Glue compilers of the previous exports, reused while their files are unchanged
+        # intfs files -> (glue files content hashes, glue compiler, glue files)
+        self._glue: Dict[Tuple[str, ...], Tuple[Dict[str, str], RDLCompiler, List[str]]] = {}
+
+    @staticmethod
+    def create_jinja_env(template_cache_dir: Optional[str] = None) -> jinja2.Environment:
+        """Returns the template environment used for all the generated files.
+
+        If a template cache directory is given, the compiled templates are stored there and
+        reused across runs (until the template or the jinja version changes).
+        """
+        bytecode_cache = None
+        if template_cache_dir is not None:
+            os.makedirs(template_cache_dir, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(template_cache_dir)
+
+        env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader('%s/templates/' % os.path.dirname(__file__)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            extensions=['jinja2.ext.loopcontrols'],
+            bytecode_cache=bytecode_cache,
+        )
+
+        env.filters.update({
+            'int': int,
+            'path_conv': SocExporter.dot_to_uscore,
+            'get_file_content': SocExporter.inject_file_marker,
+            'get_file_name': SocExporter.get_file_name,
+            'short': SocExporter.short_str,
+        })
+        env.globals.update({
+            'zip': zip,
+        })
+        return env
 
     @staticmethod
     def dot_to_uscore(in_str: str):
@@ -41,12 +113,25 @@ class SocExporter():
         return in_str.replace(".", "_")
 
     @staticmethod
-    def get_file_content(file: str) -> str:
-        """Returns a file content as a string."""
-        ret_str = ""
-        with open(file, "r") as f:
-            ret_str = f.read()
-        return ret_str
+    def inject_file_marker(file: str) -> str:
+        """Returns a marker replaced by the file content when the template output is streamed."""
+        return INJECT_FILE_MARKER.format(file)
+
+    @staticmethod
+    def expand_inject_files(chunk: str) -> Iterator[str]:
+        """Yields a template output chunk with its inject file markers replaced by the file contents.
+
+        The file contents are read in blocks, so they are never held in memory as a whole.
+        """
+        # Split gives: text, file, text, file, ..., text
+        parts = INJECT_FILE_MARKER_RE.split(chunk)
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                if part:
+                    yield part
+            else:
+                with open(part, "r") as f:
+                    yield from iter(lambda f=f: f.read(STREAM_BLOCK_SIZE), "")
 
     @staticmethod
     def get_file_name(file: str) -> str:
@@ -71,28 +156,188 @@ class SocExporter():
         """List the files that will generated."""
 
         # Retrieve the AddrmapNodes with the 'subsystem' property set
+        # Only the subsystem type names are needed, so neither the glue library nor the
+        # subsystem models are built
         walker = RDLWalker(unroll=True)
         listener = SubsystemListener()
         walker.walk(top_node, listener)
-        rdlc = self.compile_glue(intfs)
-        subsystems = [Subsystem(x, rdlc) for x in listener.subsystem_nodes]
 
         out_files = [os.path.join(outdir, self.addrmap_pkg_template.replace(".j2", ""))]
-        out_files += [os.path.join(outdir, s.getOrigTypeName() + self.subsystem_ext) for s in subsystems]
+        out_files += [os.path.join(outdir, self.get_type_name(x) + self.subsystem_ext) for x in listener.subsystem_nodes]
 
         # Print files to stdout
         print(*out_files)
 
     def compile_glue(self, list_intf_files: List[str]):
-        """Compile and append intf files to a new RDLCompiler instance."""
-        rdlc = RDLCompiler()
-        for input_file in list_intf_files:
-            rdlc.compile_file(input_file)
-        # Elaborate to check there is at list one valid addrmap
-        # The last addrmap seen is used as the top-level by default
-        rdlc.elaborate()
+        """Compile and append intf files to a new RDLCompiler instance.
+
+        The compiler is kept, and returned again by the next calls with the same files as
+        long as none of them (or of the files they include) changed.
+        """
+        key = tuple(os.path.abspath(f) for f in list_intf_files)
+        if key in self._glue:
+            file_hashes, rdlc, glue_files = self._glue[key]
+            if GlueCache.hash_files(glue_files) == file_hashes:
+                export_logger.debug('Glue compiler reused from a previous export.')
+                self.glue_files = glue_files
+                return rdlc
+            del self._glue[key]
+
+        glue_cache = GlueCache(self.glue_cache_dir) if self.glue_cache_dir is not None else None
+
+        cached = glue_cache.load(list_intf_files) if glue_cache is not None else None
+        if cached is None:
+            rdlc = RDLCompiler()
+            included_files = set()
+            for input_file in list_intf_files:
+                included_files.update(rdlc.compile_file(input_file).included_files)
+            # Elaborate to check there is at list one valid addrmap
+            # The last addrmap seen is used as the top-level by default
+            get_profiler().count('rdlc_elaborate')
+            rdlc.elaborate()
+            if glue_cache is not None:
+                glue_cache.store(list_intf_files, rdlc, included_files)
+        else:
+            rdlc, included_files = cached
+            export_logger.debug('Glue compiler loaded from the cache.')
+
+        # All the files the glue compiler depends on
+        self.glue_files = list(list_intf_files) + sorted(set(included_files) - set(list_intf_files))
+
+        # Identical interface, adapter and interconnect nodes are elaborated only once
+        rdlc.elab_cache = ElabCache(rdlc, max_size=self.elab_cache_size) # type: ignore
+        self._glue[key] = (GlueCache.hash_files(self.glue_files), rdlc, self.glue_files)
         return rdlc
 
+    @staticmethod
+    def get_type_name(node: AddrmapNode) -> str:
+        """Returns the orig_type_name or the inst_name in case the former does not exist."""
+        if node.orig_type_name is not None:
+            return node.orig_type_name
+        return node.inst_name
+
+    @staticmethod
+    def get_inj_files(type_name: str, vinject: List[str]) -> List[str]:
+        """Returns the inject files matching a subsystem type name."""
+        return [inj_f for inj_f in vinject if os.path.basename(inj_f).startswith(type_name)]
+
+    def get_common_fingerprint(self, use_include: bool, timestamp: bool) -> str:
+        """Returns the fingerprint of what all the generated files depend on.
+
+        It covers the templates, the glue files, the socgen version and the export options.
+        """
+        templates = [self.subsystem_template, self.addrmap_pkg_template, self.dot_template]
+        common = [__version__, str(use_include), str(timestamp)]
+        common += [self.jinja_env.loader.get_source(self.jinja_env, t)[0] for t in templates] # type: ignore
+        common += GlueCache.hash_files(self.glue_files).values()
+        return hash_strings(common)
+
+    def get_subsystem_fingerprints(self,
+                                   subsystem_nodes: List[AddrmapNode],
+                                   vinject: List[str],
+                                   use_include: bool,
+                                   timestamp: bool,
+                                   ) -> Dict[str, str]:
+        """Returns the fingerprint of each subsystem by node path, computed from the RDL nodes only.
+
+        A subsystem fingerprint covers its node subtree, its inject files and the common fingerprint.
+        """
+        common_hash = self.get_common_fingerprint(use_include, timestamp)
+        node_fp = NodeFingerprint()
+        subsystem_fps = {}
+        for node in subsystem_nodes:
+            inj_files = self.get_inj_files(self.get_type_name(node), vinject)
+            subsystem_fps[node.get_path()] = hash_strings([common_hash, node_fp.get(node), *inj_files,
+                                                           *GlueCache.hash_files(inj_files).values()])
+        return subsystem_fps
+
+    def get_fingerprints(self,
+                         outdir: str,
+                         subsystem_nodes: List[AddrmapNode],
+                         vinject: List[str],
+                         use_include: bool,
+                         gen_dot: bool,
+                         timestamp: bool,
+                         dot_mode: str = 'full',
+                         subsystem_fps: Optional[Dict[str, str]] = None,
+                         ) -> Dict[str, str]:
+        """Returns the fingerprint of each generated file, computed from the RDL nodes only.
+
+        A subsystem file and a subsystem diagram have the subsystem fingerprint (see
+        get_subsystem_fingerprints(), computed if subsystem_fps is not given). The address map
+        package and dot file fingerprints cover all the subsystems.
+        """
+        if subsystem_fps is None:
+            subsystem_fps = self.get_subsystem_fingerprints(subsystem_nodes, vinject, use_include, timestamp)
+
+        fingerprints = {}
+        subsys_fps = []
+        diagram_type_names = self.get_diagram_type_names([(self.get_type_name(node), node.get_path())
+                                                          for node in subsystem_nodes])
+        for node in subsystem_nodes:
+            type_name = self.get_type_name(node)
+            subsys_fp = subsystem_fps[node.get_path()]
+            subsys_fps.append(subsys_fp)
+            fingerprints[os.path.join(outdir, type_name + self.subsystem_ext)] = subsys_fp
+            if gen_dot and dot_mode == 'split' and type_name in diagram_type_names:
+                fingerprints[os.path.join(outdir, type_name + self.dot_ext)] = subsys_fp
+
+        all_subsys_fp = hash_strings([self.get_common_fingerprint(use_include, timestamp), *subsys_fps])
+        fingerprints[os.path.join(outdir, self.addrmap_pkg_template.replace(".j2", ""))] = all_subsys_fp
+        if gen_dot:
+            fingerprints[os.path.join(outdir, self.dot_template.replace(".j2", ""))] = hash_strings([all_subsys_fp, dot_mode])
+
+        return fingerprints
+
+    @staticmethod
+    def write_file(out_file: str, chunks: Iterable[str], only_if_changed: bool = False):
+        """Writes a stream of generated text chunks to a file, optionally only if its content changed."""
+        # Time spent producing the chunks, the rest of the output phases is spent writing
+        chunks = get_profiler().timed('render', chunks)
+        if only_if_changed:
+            write_if_changed(out_file, chunks)
+        else:
+            with open(out_file, 'w') as f:
+                f.writelines(chunks)
+
+    def render_subsystem(self,
+                         subsys: Subsystem,
+                         out_file: str,
+                         vinject: List[str],
+                         use_include: bool,
+                         date_time_now: Optional[str],
+                         only_if_changed: bool = False,
+                         ):
+        """Renders a subsystem template and writes it to its output file."""
+        export_logger.info('Generating subsystem %s.', subsys.node.inst_name)
+        # Context for the jinja template, the connections are resolved by the render plan
+        context = {
+            'plan': RenderPlan(subsys),
+            'inj_f': self.get_inj_files(subsys.getOrigTypeName(), vinject),
+            'use_include': use_include,
+            'socgen_version': __version__,
+            'date_time': date_time_now,
+        }
+        # Generate the subsystem file, the content is streamed to the file as it is rendered
+        self.write_file(out_file, self.stream_template(self.subsystem_template, context), only_if_changed)
+
+    def render_subsystems_parallel(self, render_jobs: Dict[str, Subsystem], jobs: int, **kwargs: Any):
+        """Renders the subsystems in a pool of forked worker processes.
+
+        The workers inherit the subsystem models from this process, only the output file
+        names are sent to them, and they write the files themselves.
+        """
+        global _render_state # pylint: disable=global-statement
+        _render_state = (self, render_jobs, kwargs)
+        try:
+            ctx = multiprocessing.get_context("fork")
+            with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as executor:
+                # Raise the first worker exception, if any
+                for _ in executor.map(_render_subsystem_worker, render_jobs.keys()):
+                    pass
+        finally:
+            _render_state = None
+
     def export(self,
                top_node: 'AddrmapNode',
                outdir: str,
@@ -100,18 +345,42 @@ class SocExporter():
                vinject: 'List[str]',
                use_include: bool = False,
                gen_dot: bool = False,
+               dot_mode: str = 'full',
+               incremental: bool = False,
+               timestamp: bool = True,
+               jobs: int = 1,
+               emit_ir: Optional[str] = None,
+               low_memory: bool = False,
                **kwargs: 'Dict[str, Any]'
                ):
+        """Builds the SoC model of the subsystems below top_node and generates the output files.
+
+        If emit_ir is given, the model is also written to this file as an intermediate representation
+        (see ir.py), and the outputs are rendered from it, so export_ir() renders the same outputs.
+
+        In incremental mode, only the subsystems whose outputs are out of date are built and rendered,
+        see render_outputs_incremental(). With emit_ir or low_memory, all the subsystems are built and
+        only the out of date files are rendered.
+
+        In low_memory mode, the subsystems are built, rendered and freed one at a time (serially),
+        see render_outputs_low_memory().
+
+        With gen_dot, dot_mode selects the diagrams generated, see render_plan.DOT_MODES.
+        """
 
         # Check for any unused additional arguments
         if kwargs:
             raise TypeError("Got an unexpected keyword argument '%s'" % list(kwargs.keys())[0])
+        ensure_logging()
+        self.check_dot_mode(dot_mode)
+        if low_memory and emit_ir is not None:
+            raise ValueError("The intermediate representation needs the whole SoC model, it cannot be emitted in low memory mode.")
 
         # Generate the output directory where generated files will be saved
         try:
             os.makedirs(outdir)
         except FileExistsError:
-            export_logger.info(f'Output directory {outdir} already exists.')
+            export_logger.info('Output directory %s already exists.', outdir)
             pass
 
         # This plugin uses to different compiler instances:
@@ -119,66 +388,477 @@ class SocExporter():
         # 2. A second one (below) that execute on the intfs files listed. This
         #    files are not compiled by the first compiler, but passed as arguments
         #    using the --intfs parameter.
-        rdlc = self.compile_glue(intfs)
+        profiler = get_profiler()
+        with profiler.phase('glue'):
+            rdlc = self.compile_glue(intfs)
 
         # Retrieve the AddrmapNodes with the 'subsystem' property set
-        walker = RDLWalker(unroll=True)
-        listener = SubsystemListener()
-        walker.walk(top_node, listener)
-        subsystems = [Subsystem(x, rdlc) for x in listener.subsystem_nodes]
+        with profiler.phase('walk'):
+            walker = RDLWalker(unroll=True)
+            listener = SubsystemListener()
+            walker.walk(top_node, listener)
+
+        # In incremental mode, only the files whose fingerprint changed are generated
+        manifest, fingerprints = None, {}
+        if incremental:
+            manifest = Manifest(outdir)
+            with profiler.phase('fingerprints'):
+                subsystem_fps = self.get_subsystem_fingerprints(listener.subsystem_nodes, vinject, use_include, timestamp)
+                fingerprints = self.get_fingerprints(outdir, listener.subsystem_nodes, vinject, use_include, gen_dot, timestamp,
+                                                     dot_mode, subsystem_fps)
+            # The IR is written from the model, which is only built if some file is out of date
+            if emit_ir is None and all(manifest.is_up_to_date(f, fp) for f, fp in fingerprints.items()):
+                export_logger.info('All generated files are up to date.')
+                return
+            # The IR needs the whole model, otherwise only the subsystems out of date are built
+            if emit_ir is None and not low_memory:
+                self.render_outputs_incremental(listener.subsystem_nodes, rdlc, outdir, vinject, use_include, gen_dot,
+                                                timestamp, jobs, manifest, fingerprints, subsystem_fps, dot_mode)
+                return
+
+        if low_memory:
+            if jobs > 1:
+                export_logger.warning('The subsystems are rendered serially in low memory mode.')
+            self.render_outputs_low_memory(listener.subsystem_nodes, rdlc, outdir, vinject, use_include, gen_dot,
+                                           timestamp, manifest, fingerprints, only_if_changed=incremental,
+                                           dot_mode=dot_mode)
+            export_logger.info('Elaboration cache: %s', rdlc.elab_cache)
+            return
+
+        # Each subsystem is built only once, nested ones are shared with their parent
+        subsys_registry = {}
+        with profiler.phase('subsystems'):
+            subsystems = [Subsystem.get_or_create(x, rdlc, subsys_registry) for x in listener.subsystem_nodes]
+        export_logger.info('Elaboration cache: %s', rdlc.elab_cache)
+
+        if emit_ir is not None:
+            with profiler.phase('emit_ir'):
+                ir = build_ir(subsystems)
+                save_ir(ir, emit_ir)
+                subsystems = load_ir(ir)
+
+        self.render_outputs(subsystems, outdir, vinject, use_include, gen_dot, timestamp, jobs,
+                            manifest, fingerprints, only_if_changed=incremental, dot_mode=dot_mode)
+
+    def export_ir(self,
+                  ir_file: str,
+                  outdir: str,
+                  vinject: 'List[str]',
+                  use_include: bool = False,
+                  gen_dot: bool = False,
+                  dot_mode: str = 'full',
+                  incremental: bool = False,
+                  timestamp: bool = True,
+                  jobs: int = 1,
+                  ):
+        """Generates the output files from an intermediate representation file written by export().
+
+        The RDL compiler is not used. In incremental mode, only the files whose content changed are
+        rewritten (all the files are rendered).
+        """
+        ensure_logging()
+        self.check_dot_mode(dot_mode)
+        os.makedirs(outdir, exist_ok=True)
+
+        profiler = get_profiler()
+        with profiler.phase('load_ir'):
+            subsystems = load_ir(read_ir(ir_file))
+
+        self.render_outputs(subsystems, outdir, vinject, use_include, gen_dot, timestamp, jobs,
+                            only_if_changed=incremental, dot_mode=dot_mode)
 
-        date_time_now = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+    @staticmethod
+    def check_dot_mode(dot_mode: str):
+        """Raises a ValueError if the dot diagram mode is unknown."""
+        if dot_mode not in DOT_MODES:
+            raise ValueError(f"Unknown dot mode '{dot_mode}', expected one of: {', '.join(DOT_MODES)}.")
 
+    @staticmethod
+    def compile_design(rdl_files: List[str], incl_search_paths: Optional[List[str]] = None) -> RDLCompiler:
+        """Compiles the RDL files of a design, the returned compiler can elaborate several variants of it."""
+        rdlc = RDLCompiler()
+        for rdl_file in rdl_files:
+            rdlc.compile_file(rdl_file, incl_search_paths)
+        return rdlc
+
+    @staticmethod
+    def elaborate_design(rdlc: RDLCompiler, top: Optional[str] = None, parameters: Optional[Dict[str, Any]] = None) -> AddrmapNode:
+        """Elaborates a design, the parameters are RDL expressions overriding the top-level ones."""
+        params = {name: rdlc.eval(str(value)) for name, value in (parameters or {}).items()}
+        get_profiler().count('rdlc_elaborate')
+        top_node = rdlc.elaborate(top, parameters=params).top
+        if not isinstance(top_node, AddrmapNode):
+            raise TypeError("The top node '%s' is not an addrmap." % top_node.inst_name)
+        return top_node
+
+    def export_variant(self, variant: Dict[str, Any], designs: Dict[Tuple, RDLCompiler]):
+        """Exports a variant of export_many(), designs holds the compiled designs and is updated."""
+        key = (tuple(variant['rdl_files']), tuple(variant['incl_search_paths']))
+        if key not in designs:
+            with get_profiler().phase('design'):
+                designs[key] = self.compile_design(*key)
+        top_node = self.elaborate_design(designs[key], variant['top'], variant['parameters'])
+
+        design_fields = ('name', 'rdl_files', 'top', 'parameters', 'incl_search_paths')
+        self.export(top_node, **{k: v for k, v in variant.items() if k not in design_fields})
+
+    def try_export_variant(self, variant: Dict[str, Any], designs: Dict[Tuple, RDLCompiler]) -> Optional[str]:
+        """Exports a variant, returns the error message if it failed."""
+        export_logger.info('Exporting variant %s.', variant['name'])
+        try:
+            self.export_variant(variant, designs)
+        except (RDLCompileError, ValueError, TypeError, OSError) as e:
+            export_logger.error('Variant %s failed: %s', variant['name'], e)
+            return str(e) or type(e).__name__
+        except Exception as e: # pylint: disable=broad-except
+            # The model reports some design errors as assertions or index errors, they must not
+            # stop the export of the other variants
+            export_logger.exception('Variant %s failed.', variant['name'])
+            return f"{type(e).__name__}: {e}"
+        return None
+
+    def export_many(self, variants: List[Dict[str, Any]], jobs: int = 1) -> Dict[str, Optional[str]]:
+        """Exports several SoC variants, each one to its own output directory.
+
+        The variants are given as in a batch file (see batch.py), use batch.get_variant() to fill
+        in the default fields. The glue compilers with their elaboration caches and the template
+        environment are shared by all the variants, and variants with the same RDL files share the
+        compiled design. With jobs > 1, the variants are exported by forked worker processes,
+        which inherit the glue and designs compiled beforehand by this process.
+
+        Returns the error message of each variant by name, None if it was exported.
+        """
+        ensure_logging()
+        designs: Dict[Tuple, RDLCompiler] = {}
+        if jobs > 1 and len(variants) > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            export_logger.warning('Parallel export needs the fork start method, exporting serially.')
+            jobs = 1
+        if jobs <= 1 or len(variants) <= 1:
+            return {v['name']: self.try_export_variant(v, designs) for v in variants}
+
+        # Compile everything shared by the variants once, before forking the workers
+        # The errors are reported by the workers of the failing variants
+        profiler = get_profiler()
+        for variant in variants:
+            key = (tuple(variant['rdl_files']), tuple(variant['incl_search_paths']))
+            try:
+                if key not in designs:
+                    with profiler.phase('design'):
+                        designs[key] = self.compile_design(*key)
+                with profiler.phase('glue'):
+                    self.compile_glue(variant['intfs'])
+            except Exception: # pylint: disable=broad-except
+                pass
+
+        global _batch_state # pylint: disable=global-statement
+        _batch_state = (self, variants, designs)
+        try:
+            ctx = multiprocessing.get_context("fork")
+            with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as executor:
+                futures = [executor.submit(_export_variant_worker, idx) for idx in range(len(variants))]
+                errors = {}
+                for variant, future in zip(variants, futures):
+                    try:
+                        errors[variant['name']] = future.result()
+                    except Exception as e: # pylint: disable=broad-except
+                        # The worker exporting the variant died
+                        export_logger.error('Variant %s failed: %s', variant['name'], e)
+                        errors[variant['name']] = f"{type(e).__name__}: {e}"
+        finally:
+            _batch_state = None
+        return errors
+
+    def render_outputs(self,
+                       subsystems: List[Any],
+                       outdir: str,
+                       vinject: List[str],
+                       use_include: bool,
+                       gen_dot: bool,
+                       timestamp: bool,
+                       jobs: int,
+                       manifest: Optional[Manifest] = None,
+                       fingerprints: Optional[Dict[str, str]] = None,
+                       only_if_changed: bool = False,
+                       dot_mode: str = 'full',
+                       ):
+        """Renders the subsystem, address map package and dot files of a model (Subsystem or IR objects).
+
+        If a manifest is given, the files up to date with their fingerprint are skipped.
+        """
+        date_time_now = datetime.now().strftime("%d-%m-%Y %H:%M:%S") if timestamp else None
+        render_kwargs = {
+            'vinject': vinject,
+            'use_include': use_include,
+            'date_time_now': date_time_now,
+            'only_if_changed': only_if_changed,
+        }
+        self.render_subsystem_files(subsystems, outdir, jobs, render_kwargs, manifest, fingerprints)
+
+        summary_files = self.get_summary_files(outdir, [(subsys.getOrigTypeName(), subsys.node.get_path())
+                                                        for subsys in subsystems],
+                                               gen_dot, dot_mode, manifest, fingerprints)
+        if summary_files:
+            summaries = [SubsystemSummary(subsys) for subsys in subsystems]
+            self.render_summary_files(summaries, summary_files, date_time_now, dot_mode, manifest, fingerprints,
+                                      only_if_changed)
+
+        if manifest is not None:
+            manifest.save()
+
+    def render_subsystem_files(self,
+                               subsystems: List[Any],
+                               outdir: str,
+                               jobs: int,
+                               render_kwargs: Dict[str, Any],
+                               manifest: Optional[Manifest] = None,
+                               fingerprints: Optional[Dict[str, str]] = None,
+                               ):
+        """Renders the subsystem files, serially or in jobs worker processes, see render_subsystem().
+
+        If a manifest is given, the files up to date with their fingerprint are skipped, and the
+        rendered ones are recorded in it.
+        """
+        # Output file -> subsystem to render, the last subsystem with a given type name is the one written
+        render_jobs = {}
         for subsys in subsystems:
-            export_logger.info(f'Generating subsystem {subsys.node.inst_name}.')
-            subsys_inj_files = []
-            for inj_f in vinject:
-                # Get the inject files matching the node name
-                if os.path.basename(inj_f).startswith(subsys.getOrigTypeName()):
-                    subsys_inj_files.append(inj_f)
-
-            # Context for the jinja template
-            context = {
-                'subsys': subsys,
-                'inj_f': subsys_inj_files,
-                'use_include': use_include,
-                'socgen_version': __version__,
-                'date_time': date_time_now,
-            }
-            # Generate the subsystem files
-            text = self.process_subsystem_template(context, self.subsystem_template)
             # Generate the file absolute path
             out_file = os.path.join(outdir, subsys.getOrigTypeName() + self.subsystem_ext)
-            # Write the content to the file
-            with open(out_file, 'w') as f:
-                f.write(text)
-
-        # Generate the addrmap package file
-        text = self.process_arrdmap_pkg_template(subsystems, date_time_now, self.addrmap_pkg_template)
-        # Generate the file absolute path
-        out_file = os.path.join(outdir, self.addrmap_pkg_template.replace(".j2", ""))
-        # Write the content to the file
-        with open(out_file, 'w') as f:
-            f.write(text)
-
+            if manifest is not None and manifest.is_up_to_date(out_file, fingerprints[out_file]):
+                export_logger.info('Subsystem %s is up to date.', subsys.node.inst_name)
+                continue
+            render_jobs.pop(out_file, None)
+            render_jobs[out_file] = subsys
+
+        with get_profiler().phase('output_subsystems'):
+            if jobs > 1 and len(render_jobs) > 1:
+                if "fork" in multiprocessing.get_all_start_methods():
+                    self.render_subsystems_parallel(render_jobs, jobs, **render_kwargs)
+                else:
+                    export_logger.warning('Parallel rendering needs the fork start method, rendering serially.')
+                    jobs = 1
+            if jobs <= 1 or len(render_jobs) <= 1:
+                for out_file, subsys in render_jobs.items():
+                    self.render_subsystem(subsys, out_file, **render_kwargs)
+
+        if manifest is not None:
+            for out_file in render_jobs:
+                manifest.update(out_file, fingerprints[out_file])
+
+    def render_outputs_incremental(self,
+                                   subsystem_nodes: List[AddrmapNode],
+                                   rdlc: RDLCompiler,
+                                   outdir: str,
+                                   vinject: List[str],
+                                   use_include: bool,
+                                   gen_dot: bool,
+                                   timestamp: bool,
+                                   jobs: int,
+                                   manifest: Manifest,
+                                   fingerprints: Dict[str, str],
+                                   subsystem_fps: Dict[str, str],
+                                   dot_mode: str = 'full',
+                                   models: Optional[Dict[str, Subsystem]] = None,
+                                   ):
+        """Builds only the subsystems whose outputs are out of date, and renders these outputs, see render_outputs().
+
+        A subsystem is built if its file (or diagram) is out of date, or if the address map package or
+        the dot file is out of date and its summary recorded in the manifest is not. The nested
+        subsystems of a built one are only built as ports (see Subsystem.create_ports_only()), unless
+        they are built too. The subsystems up to date only cost a fingerprint comparison.
+
+        models holds the subsystems built by a previous export (see SocgenDaemon), by node path, they
+        are reused instead of being built again. It is updated with the subsystems built.
+        """
+        profiler = get_profiler()
+        date_time_now = datetime.now().strftime("%d-%m-%Y %H:%M:%S") if timestamp else None
+        render_kwargs = {
+            'vinject': vinject,
+            'use_include': use_include,
+            'date_time_now': date_time_now,
+            'only_if_changed': True,
+        }
+        if models is None:
+            models = {}
+        paths = [node.get_path() for node in subsystem_nodes]
+        summary_files = self.get_summary_files(outdir, [(self.get_type_name(node), path)
+                                                        for node, path in zip(subsystem_nodes, paths)],
+                                               gen_dot, dot_mode, manifest, fingerprints)
+
+        # Subsystems to build: the ones writing an out of date file, the last one of each type name,
+        # and the ones without an up to date summary if a summary file is out of date
+        writers = {os.path.join(outdir, self.get_type_name(node) + self.subsystem_ext): path
+                   for node, path in zip(subsystem_nodes, paths)}
+        stale = {path for out_file, path in writers.items() if not manifest.is_up_to_date(out_file, fingerprints[out_file])}
+        summaries: Dict[str, SubsystemSummary] = {}
+        if summary_files:
+            for path in paths:
+                summary = manifest.get_summary(path, subsystem_fps[path])
+                if summary is None:
+                    stale.add(path)
+                else:
+                    summaries[path] = SubsystemSummary.fromDict(summary)
+
+        # Nested subsystems come after their parent in the walk order, so they are built first
+        registry: Dict[str, Subsystem] = {}
+        n_built = 0
+        with profiler.phase('subsystems'):
+            for node, path in zip(reversed(subsystem_nodes), reversed(paths)):
+                if path not in stale and node.parent.get_path() not in stale:
+                    continue
+                if path in models:
+                    registry[path] = models[path]
+                elif path in stale:
+                    models[path] = Subsystem.get_or_create(node, rdlc, registry)
+                    n_built += 1
+                else:
+                    Subsystem.create_ports_only(node, rdlc, registry)
+        export_logger.info('Built %d of %d subsystems.', n_built, len(paths))
+        export_logger.info('Elaboration cache: %s', rdlc.elab_cache)
+
+        subsystems = [models[path] for path in paths if path in stale]
+        self.render_subsystem_files(subsystems, outdir, jobs, render_kwargs, manifest, fingerprints)
+
+        for path in paths:
+            if path in stale:
+                summaries[path] = SubsystemSummary(models[path])
+                manifest.update_summary(path, subsystem_fps[path], summaries[path].toDict())
+        manifest.prune_summaries(paths)
+        if summary_files:
+            self.render_summary_files([summaries[path] for path in paths], summary_files, date_time_now, dot_mode,
+                                      manifest, fingerprints, only_if_changed=True)
+
+        manifest.save()
+
+    def render_outputs_low_memory(self,
+                                  subsystem_nodes: List[AddrmapNode],
+                                  rdlc: RDLCompiler,
+                                  outdir: str,
+                                  vinject: List[str],
+                                  use_include: bool,
+                                  gen_dot: bool,
+                                  timestamp: bool,
+                                  manifest: Optional[Manifest] = None,
+                                  fingerprints: Optional[Dict[str, str]] = None,
+                                  only_if_changed: bool = False,
+                                  dot_mode: str = 'full',
+                                  ):
+        """Builds, renders and frees the subsystems one at a time, see render_outputs().
+
+        The subsystems are built from the innermost to the top one. Once its file is rendered, a
+        subsystem is summarized for the address map package and dot files, and its content is freed
+        (see Subsystem.release()), so only its ports remain for its parent. The peak memory is the one
+        of the largest subsystem instead of the whole SoC.
+        """
+        profiler = get_profiler()
+        date_time_now = datetime.now().strftime("%d-%m-%Y %H:%M:%S") if timestamp else None
+        render_kwargs = {
+            'vinject': vinject,
+            'use_include': use_include,
+            'date_time_now': date_time_now,
+            'only_if_changed': only_if_changed,
+        }
+        summary_files = self.get_summary_files(outdir, [(self.get_type_name(node), node.get_path())
+                                                        for node in subsystem_nodes],
+                                               gen_dot, dot_mode, manifest, fingerprints)
+
+        subsys_registry: Dict[str, Subsystem] = {}
+        summaries = {}
+        rendered = set()
+        # Nested subsystems come after their parent in the walk order
+        for node in reversed(subsystem_nodes):
+            with profiler.phase('subsystems'):
+                subsys = Subsystem.get_or_create(node, rdlc, subsys_registry)
+
+            # The last subsystem with a given type name is the one written, i.e., the first one here
+            out_file = os.path.join(outdir, subsys.getOrigTypeName() + self.subsystem_ext)
+            if out_file not in rendered:
+                rendered.add(out_file)
+                if manifest is not None and manifest.is_up_to_date(out_file, fingerprints[out_file]):
+                    export_logger.info('Subsystem %s is up to date.', subsys.node.inst_name)
+                else:
+                    with profiler.phase('output_subsystems'):
+                        self.render_subsystem(subsys, out_file, **render_kwargs)
+                    if manifest is not None:
+                        manifest.update(out_file, fingerprints[out_file])
+
+            if summary_files:
+                summaries[node.get_path()] = SubsystemSummary(subsys)
+            subsys.release()
+
+        if summary_files:
+            self.render_summary_files([summaries[node.get_path()] for node in subsystem_nodes], summary_files,
+                                      date_time_now, dot_mode, manifest, fingerprints, only_if_changed)
+
+        if manifest is not None:
+            manifest.save()
 
-        # Generate the graph dot file if flag is set
+    @staticmethod
+    def get_diagram_type_names(subsystems: List[Tuple[str, str]]) -> List[str]:
+        """Returns the type names of the subsystems with their own diagram in split dot mode.
+
+        Subsystems are given as (type name, path). The top subsystems are left out, the SoC diagram
+        already draws them collapsed. A type also instantiated as a nested subsystem keeps its diagram.
+        """
+        top_paths = SubsystemSummary.getTopPaths(path for _, path in subsystems)
+        return list(dict.fromkeys(type_name for type_name, path in subsystems if path not in top_paths))
+
+    def get_summary_files(self,
+                          outdir: str,
+                          subsystems: List[Tuple[str, str]],
+                          gen_dot: bool,
+                          dot_mode: str,
+                          manifest: Optional[Manifest] = None,
+                          fingerprints: Optional[Dict[str, str]] = None,
+                          ) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Returns the output file -> (template, subsystem type name) of the address map package and dot files to render.
+
+        These files are rendered from the subsystem summaries, subsystems are given as (type name, path).
+        The subsystem type name is the one of a subsystem diagram (split dot mode), None for the files
+        of the whole SoC. The files up to date with the manifest are skipped.
+        """
+        # Generate the files absolute path
+        files = {os.path.join(outdir, self.addrmap_pkg_template.replace(".j2", "")): (self.addrmap_pkg_template, None)}
         if gen_dot:
-            context = {
-                'subsystems': subsystems,
-                'socgen_version': __version__,
-                'date_time': date_time_now,
-            }
+            files[os.path.join(outdir, self.dot_template.replace(".j2", ""))] = (self.dot_template, None)
+            if dot_mode == 'split':
+                for type_name in self.get_diagram_type_names(subsystems):
+                    files[os.path.join(outdir, type_name + self.dot_ext)] = (self.dot_template, type_name)
+        return {out_file: x for out_file, x in files.items()
+                if manifest is None or not manifest.is_up_to_date(out_file, fingerprints[out_file])}
+
+    def render_summary_files(self,
+                             summaries: List[SubsystemSummary],
+                             summary_files: Dict[str, Tuple[str, Optional[str]]],
+                             date_time_now: Optional[str],
+                             dot_mode: str = 'full',
+                             manifest: Optional[Manifest] = None,
+                             fingerprints: Optional[Dict[str, str]] = None,
+                             only_if_changed: bool = False,
+                             ):
+        """Renders the address map package and dot files from the subsystem summaries.
+
+        In full dot mode, the SoC diagram expands all the subsystems. Otherwise, it only shows the top
+        subsystems, and each diagram draws the nested subsystems as a single node with their ports.
+        The diagrams only use the summary port lists, so each one is rendered in a time linear in
+        the number of modules and connections it shows.
+        """
+        phases = {self.addrmap_pkg_template: 'output_pkg', self.dot_template: 'output_dot'}
+        # The last subsystem with a given type name is the one drawn, as for the subsystem files
+        by_type_name = {summary.type_name: summary for summary in summaries}
+        for out_file, (template, type_name) in summary_files.items():
             # Generate the file content
-            text = self.process_dot_template(context, self.dot_template)
-            # Generate the file absolute path
-            out_file = os.path.join(outdir, self.dot_template.replace(".j2", ""))
-            # Write the content to the file
-            with open(out_file, 'w') as f:
-                f.write(text)
-
-    def process_arrdmap_pkg_template(self, subsystems, date_time_now, template: str) -> str:
-        """Template processing for addrmap package generation."""
+            with get_profiler().phase(phases[template]):
+                context = self.get_addrmap_pkg_context(summaries, date_time_now)
+                if type_name is not None:
+                    context.update(summaries=[by_type_name[type_name]], collapsed=True)
+                elif template == self.dot_template and dot_mode != 'full':
+                    context.update(summaries=SubsystemSummary.getTopSummaries(summaries), collapsed=True)
+                self.write_file(out_file, self.stream_template(template, context), only_if_changed)
+            if manifest is not None:
+                manifest.update(out_file, fingerprints[out_file])
+
+    def get_addrmap_pkg_context(self, summaries: List[SubsystemSummary], date_time_now) -> dict:
+        """Returns the template context for the addrmap package (and dot file) generation."""
 
         # for subsys in subsystems:
         #     for intc in subsys.intcs:
@@ -195,51 +875,39 @@ class SocExporter():
         #         for param in intc.hdl_params:
         #             print(f"{param['name']}: {param['value']}")
 
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader('%s/templates/' % os.path.dirname(__file__)),
-            # trim_blocks=True,
-            lstrip_blocks=True
-        )
-
         context = {
-            'subsystems': subsystems,
+            'summaries': summaries,
+            'collapsed': False,
             'RootNode'  : RootNode,
             'socgen_version': __version__,
             'date_time': date_time_now,
         }
+        return context
+
+    def stream_template(self, template: str, context: dict) -> Iterator[str]:
+        """Renders a template as a stream of text chunks, with the inject files content expanded.
+
+        Jinja generates one chunk per template expression, they are joined in blocks of about
+        STREAM_BLOCK_SIZE characters. Only the chunks with an inject file marker are expanded.
+        """
+        block: List[str] = []
+        block_size = 0
+        for chunk in self.jinja_env.get_template(template).generate(context):
+            if "\0" in chunk:
+                if block:
+                    yield "".join(block)
+                    block, block_size = [], 0
+                yield from self.expand_inject_files(chunk)
+            else:
+                block.append(chunk)
+                block_size += len(chunk)
+                if block_size >= STREAM_BLOCK_SIZE:
+                    yield "".join(block)
+                    block, block_size = [], 0
+        if block:
+            yield "".join(block)
 
-        res = env.get_template(template).render(context)
-        return res
-
-    def process_subsystem_template(self, context: dict, template: str) -> str:
-        """Template processing for subsystem generation."""
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader('%s/templates/' % os.path.dirname(__file__)),
-            trim_blocks=True,
-            lstrip_blocks=True)
-
-        env.filters.update({
-            'int': int,
-            'path_conv': SocExporter.dot_to_uscore,
-            'get_file_content': SocExporter.get_file_content,
-            'get_file_name': SocExporter.get_file_name,
-        })
-
-        res = env.get_template(template).render(context)
-        return res
-
-    def process_dot_template(self, context: dict, template: str) -> str:
-        """Template processing for the grap dot file generation."""
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader('%s/templates/' % os.path.dirname(__file__)),
-            trim_blocks=True,
-            extensions=['jinja2.ext.loopcontrols'],
-            lstrip_blocks=True)
-
-        env.filters.update({
-            'path_conv': SocExporter.dot_to_uscore,
-            'short': SocExporter.short_str,
-        })
-
-        res = env.get_template(template).render(context, zip=zip)
-        return res
+    def process_arrdmap_pkg_template(self, subsystems, date_time_now, template: str) -> str:
+        """Template processing for addrmap package generation."""
+        summaries = [SubsystemSummary(subsys) for subsys in subsystems]
+        return "".join(self.stream_template(template, self.get_addrmap_pkg_context(summaries, date_time_now)))
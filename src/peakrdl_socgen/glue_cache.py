@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from systemrdl import RDLCompiler
+from systemrdl.__about__ import __version__ as systemrdl_version
+
+from .__about__ import __version__
+
+# Messages are reported with the exporter logger
+export_logger = logging.getLogger("export_logger")
+
+class GlueCache:
+    """On-disk cache of the compiled glue RDLCompiler (i.e., the --intfs files).
+
+    Each entry is a pickled RDLCompiler stored in a file named after a hash of the
+    intfs files content, their order, and the socgen, systemrdl-compiler and python
+    versions. The files included by the intfs files are recorded with their hash
+    in the entry and checked when it is loaded, so any change of an input file
+    invalidates the entry.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """Returns the sha256 hash of a file content."""
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @staticmethod
+    def hash_files(paths: Iterable[str]) -> Dict[str, str]:
+        """Returns a dict of absolute file path -> content hash."""
+        return {os.path.abspath(p): GlueCache.file_hash(p) for p in paths}
+
+    def get_key(self, intf_files: List[str]) -> str:
+        """Returns the cache key of a list of intfs files."""
+        key = hashlib.sha256()
+        for version in (__version__, systemrdl_version, sys.version, str(pickle.HIGHEST_PROTOCOL)):
+            key.update(version.encode() + b'\0')
+        for path, file_hash in self.hash_files(intf_files).items():
+            key.update(path.encode() + b'\0' + file_hash.encode() + b'\0')
+        return key.hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"glue_{key}.pickle")
+
+    def load(self, intf_files: List[str]) -> Optional[Tuple[RDLCompiler, List[str]]]:
+        """Returns the cached compiler of the intfs files and the files they include, or None if missing or outdated."""
+        path = self.get_path(self.get_key(intf_files))
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            # Check the included files did not change
+            if self.hash_files(entry['included_files']) != entry['included_files']:
+                export_logger.info("Glue cache entry outdated, an included file changed.")
+                return None
+        except Exception as e: # pylint: disable=broad-except
+            export_logger.warning("Could not load glue cache entry %s: %s", path, e)
+            return None
+
+        return entry['rdlc'], list(entry['included_files'])
+
+    def store(self, intf_files: List[str], rdlc: RDLCompiler, included_files: Iterable[str]):
+        """Stores the compiler of the intfs files in the cache."""
+        path = self.get_path(self.get_key(intf_files))
+        entry = {
+            'rdlc': rdlc,
+            'included_files': self.hash_files(included_files),
+        }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent runs never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e: # pylint: disable=broad-except
+            os.unlink(tmp_path)
+            export_logger.warning("Could not store glue cache entry %s: %s", path, e)
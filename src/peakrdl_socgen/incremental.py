@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+import filecmp
+import hashlib
+import json
+import os
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional
+
+from systemrdl.node import Node, AddressableNode
+from systemrdl.rdltypes.user_struct import UserStruct
+from systemrdl.rdltypes.references import PropertyReference
+
+# Name of the manifest file written in the output directory
+MANIFEST_NAME = ".socgen_manifest.json"
+MANIFEST_VERSION = 2
+
+def canonical_value(value: Any) -> str:
+    """Returns a deterministic string representation of an RDL property or parameter value."""
+    if isinstance(value, Node):
+        return f"node:{value.get_path()}"
+    if isinstance(value, PropertyReference):
+        return f"ref:{value.node.get_path()}->{value.name}"
+    if isinstance(value, UserStruct):
+        members = ",".join(f"{k}:{canonical_value(v)}" for k, v in sorted(value.members.items()))
+        return f"{type(value).__name__}'{{{members}}}"
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}::{value.name}"
+    if isinstance(value, (list, tuple)):
+        return "'{" + ",".join(canonical_value(v) for v in value) + "}"
+    return f"{type(value).__name__}:{value!r}"
+
+class NodeFingerprint:
+    """Computes content hashes of node subtrees.
+
+    The hash of a node covers its type, instance name, address, parameters and explicitly set
+    properties, and the hashes of its children. Subtree hashes are memoized by node path, so the
+    fingerprints of nested subsystems are computed only once.
+    """
+    def __init__(self):
+        self._hashes: Dict[str, str] = {}
+
+    def get(self, node: Node) -> str:
+        """Returns the hash of a node subtree."""
+        path = node.get_path()
+        node_hash = self._hashes.get(path)
+        if node_hash is None:
+            h = hashlib.sha256()
+            h.update(f"{type(node).__name__} {node.inst_name} {node.orig_type_name}\n".encode())
+            if isinstance(node, AddressableNode):
+                h.update(f"@{node.absolute_address} size:{node.size} dims:{node.array_dimensions}\n".encode())
+            for param in node.inst.parameters:
+                h.update(f"#{param.name}={canonical_value(param.get_value())}\n".encode())
+            for prop in node.list_properties():
+                h.update(f"{prop}={canonical_value(node.get_property(prop))}\n".encode())
+            for child in node.children(unroll=True):
+                h.update(f"child:{self.get(child)}\n".encode())
+            node_hash = h.hexdigest()
+            self._hashes[path] = node_hash
+        return node_hash
+
+def hash_strings(strings: Iterable[str]) -> str:
+    """Returns the sha256 hash of a sequence of strings."""
+    h = hashlib.sha256()
+    for s in strings:
+        h.update(s.encode() + b'\0')
+    return h.hexdigest()
+
+def write_if_changed(path: str, chunks: Iterable[str]) -> bool:
+    """Writes a stream of text chunks to a file only if its content differs, to keep the file mtime otherwise.
+
+    The chunks are written to a temporary file next to the output one, which then replaces
+    it if the contents differ. Returns True if the file was written.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            f.writelines(chunks)
+        if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+            os.unlink(tmp_path)
+            return False
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+class Manifest:
+    """Fingerprints of the generated files, stored in the output directory.
+
+    A file is up to date if its fingerprint did not change and the file was not modified
+    (i.e., same size and mtime) since it was generated.
+
+    The summaries of the subsystems (see render_plan.SubsystemSummary) are also kept with their
+    fingerprint, so the address map package and dot files can be generated again without
+    building the subsystems that did not change.
+    """
+    def __init__(self, outdir: str):
+        self.path = os.path.join(outdir, MANIFEST_NAME)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Subsystem node path -> {'fingerprint': subsystem fingerprint, 'summary': summary data}
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            with open(self.path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                self.entries = manifest['files']
+                self.summaries = manifest['summaries']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Dict[str, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    def is_up_to_date(self, path: str, fingerprint: str) -> bool:
+        """Returns True if the file exists and was generated with the same fingerprint."""
+        entry = self.entries.get(os.path.basename(path))
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+        return self._stat(path) == entry['stat']
+
+    def update(self, path: str, fingerprint: str):
+        """Records the fingerprint of a generated file."""
+        self.entries[os.path.basename(path)] = {
+            'fingerprint': fingerprint,
+            'stat': self._stat(path),
+        }
+
+    def get_summary(self, path: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Returns the summary data of a subsystem if it was recorded with the same fingerprint, None otherwise."""
+        entry = self.summaries.get(path)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return None
+        return entry['summary']
+
+    def update_summary(self, path: str, fingerprint: str, summary: Dict[str, Any]):
+        """Records the summary data of a subsystem."""
+        self.summaries[path] = {'fingerprint': fingerprint, 'summary': summary}
+
+    def prune_summaries(self, paths: Iterable[str]):
+        """Drops the summaries of the subsystems which are not in paths anymore."""
+        paths = set(paths)
+        self.summaries = {path: entry for path, entry in self.summaries.items() if path in paths}
+
+    def save(self):
+        # Written compactly, the summaries hold the structure of the whole SoC
+        with open(self.path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries, 'summaries': self.summaries},
+                      f, sort_keys=True, separators=(',', ':'))
@@ -11,9 +11,13 @@ import math
 
 from .module import Module
 from .intf import IntfPort
+from .elab_cache import get_elab_cache
 
 class Intc(Module):
     """Module class extension for interconnect modules."""
+    kind = "intc"
+    __slots__ = ('ext_slv_ports', 'ext_mst_ports', 'inst_prefix', 'subsystem_node', 'intf_type', 'type_name', 'inst_name')
+
     def __init__(self,
             rdlc: RDLCompiler,
             ext_slv_ports: List[IntfPort],
@@ -83,7 +87,7 @@ class Intc(Module):
         if mmap_params is not None:
             param_values.update(mmap_params)
 
-        root = self.rdlc.elaborate(
+        root = get_elab_cache(self.rdlc).elaborate(
                 top_def_name=intc_name,
                 inst_name=self.inst_name,
                 parameters = param_values,
@@ -98,37 +102,31 @@ class Intc(Module):
 
     def get_intc_mmap_params(self, intc_name: str) -> Dict:
         """Generates the address map parameters of the interconnect."""
-        # Get the default interconnect module definition from the interface SystemRDL compiler
-        dflt_intc = self.rdlc.elaborate(
-                top_def_name=intc_name,
-                inst_name="default_" + intc_name,
-                ).get_child_by_name("default_" + intc_name)
-        assert dflt_intc is not None
-
+        # The address map scheme is given by the parameters the interconnect definition declares
         params = {}
-        for p in dflt_intc.inst.parameters:
+        for p_name, p_type in get_elab_cache(self.rdlc).get_param_types(intc_name).items():
             # MEM_MAP scheme, array of START, END adresses
-            if p.name == "MEM_MAP" and isinstance(p.param_type, ArrayedType):
-                if p.param_type.element_type == int:
+            if p_name == "MEM_MAP" and isinstance(p_type, ArrayedType):
+                if p_type.element_type == int:
                     params['MEM_MAP'] = []
                     for c in self._getSlaveNodes():
                         params['MEM_MAP'].extend([c.absolute_address, c.absolute_address + c.size])
 
             # SLAVE_ADDR, SLAVE_MASK scheme
-            elif p.name == "SLAVE_ADDR" and isinstance(p.param_type, ArrayedType):
-                if p.param_type.element_type == int:
+            elif p_name == "SLAVE_ADDR" and isinstance(p_type, ArrayedType):
+                if p_type.element_type == int:
                     params['SLAVE_ADDR'] = []
                     for c in reversed(self._getSlaveNodes()):
                         params['SLAVE_ADDR'].append(c.absolute_address)
 
-            elif p.name == "SLAVE_MASK" and isinstance(p.param_type, ArrayedType):
-                if p.param_type.element_type == int:
+            elif p_name == "SLAVE_MASK" and isinstance(p_type, ArrayedType):
+                if p_type.element_type == int:
                     params['SLAVE_MASK'] = []
                     for c in reversed(self._getSlaveNodes()):
                         mask = self._fillOnesFromLeft(self._round_up_to_pwr2(c.size), 32) # TODO width
                         params['SLAVE_MASK'].append(mask)
 
-            elif p.name == "SOCGEN_XBAR_ADDR_RULES":# and isinstance(p.param_type, str): # TODO why not working
+            elif p_name == "SOCGEN_XBAR_ADDR_RULES":# and isinstance(p_type, str): # TODO why not working
                 sv_intc_prefix = self.inst_name.replace("interconnect", "intc").upper() + "_ADDR_RULES"
                 params['SOCGEN_XBAR_ADDR_RULES'] = sv_intc_prefix
 
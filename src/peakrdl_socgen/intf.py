@@ -11,6 +11,8 @@ from systemrdl.rdltypes.user_enum import UserEnum
 from enum import Enum
 
 from .signal import IntfSignal, Signal
+from .elab_cache import get_elab_cache
+from .profiling import get_profiler
 
 if TYPE_CHECKING:
     from .module import Module
@@ -37,13 +39,20 @@ class IntfPort:
             // Interface signal declaration
             ...
         };
+
+    The base_intf fields (prefix, modport, cap and regex) are attributes of the port, the other
+    structure fields (e.g., ADDR_WIDTH) are read from the structure values on access.
     """
+    __slots__ = ('node', 'module', 'idx', 'orig_intf', 'type', 'signals', '_signals_by_basename',
+                 'param_values', 'prefix', 'modport', 'cap', 'regex')
+
     def __init__(self,
                  port_node: AddrmapNode,
                  module: 'Module',
                  orig_intf: Optional['IntfPort'] = None,
                  idx: int = 0
                  ):
+        get_profiler().count('IntfPort')
         self.node = port_node
         self.module = module
         self.idx = idx
@@ -70,13 +79,32 @@ class IntfPort:
         #     // Example: obi_reqA_i --> obi_req_iA
         #     regex:"match_pattern::replace_pattern"
         # }
-        for k in self.params._values:
-            setattr(self, k, self.params._values[k])
+        # The values are shared with the elaborated node, they are not copied per port
+        self.param_values = self.params._values
+        self.prefix = self.param_values['prefix']
+        self.modport = self.param_values['modport']
+        self.cap = self.param_values['cap']
+        self.regex = self.param_values['regex']
 
         self.type = self.node.orig_type_name
 
         self.signals = self.createSignals()
 
+        # Interface signals indexed by basename for findSignal
+        self._signals_by_basename: Dict[str, List[IntfSignal]] = {}
+        for s in self.signals:
+            self._signals_by_basename.setdefault(s.basename, []).append(s)
+
+    def __getattr__(self, name: str):
+        """Returns the value of an interface structure field (e.g., ADDR_WIDTH)."""
+        # Only called when the normal lookup fails, param_values is checked to avoid a recursion before it is set
+        if name != 'param_values' and not name.startswith('__'):
+            try:
+                return self.param_values[name]
+            except KeyError:
+                pass
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
     @property
     def params(self) -> UserStruct:
         """Gets the intf port parameters."""
@@ -107,7 +135,7 @@ class IntfPort:
         return ret_s
 
     def findSignal(self, sig: Signal) -> IntfSignal:
-        signals = [s for s in self.signals if s.basename == sig.basename]
+        signals = self._signals_by_basename.get(sig.basename, [])
         assert len(signals) == 1, f"Looking for {sig.basename}, exactly one element with the same basename must exist found: {len(signals)} {signals}"
         return signals[0]
 
@@ -151,9 +179,13 @@ class IntfPort:
         # Get the interface struct type which defines the interface parameters.
         intf_type = intf_struct.__class__.__name__
 
+        # Copy of the struct members, the design node property itself is left unchanged so
+        # the model can be built again from the same design
+        intf_values = dict(intf_struct._values)
+
         # Check for N_PORTS param
-        if 'N_PORTS' in intf_struct._values:
-            n_ports = intf_struct._values.pop('N_PORTS')
+        if 'N_PORTS' in intf_values:
+            n_ports = intf_values.pop('N_PORTS')
             # Remove from the dict as it is only used by this script
             # not by the systemRDL interface node
             intf_type = intf_type.replace('intc', 'intf') # TODO Merge intc and intf
@@ -161,13 +193,14 @@ class IntfPort:
             # By default generate only one port per interface
             n_ports = 1
 
-        intf_prefix = intf_struct._values['prefix']
+        intf_prefix = intf_values['prefix']
 
         # Get the interface parameters, e.g., the address and data width or the
         # interface mode (i.e., slave or master).
-        intf_param_str = IntfPort.get_intf_param_string(intf_type=intf_type, intf_dict=intf_struct._values)
+        intf_param_str = IntfPort.get_intf_param_string(intf_type=intf_type, intf_dict=intf_values)
         # Evaluate the RDL parameter expression string and return its compiled value
-        params = rdlc.eval(intf_param_str)
+        elab_cache = get_elab_cache(rdlc)
+        params = elab_cache.eval(intf_param_str)
 
         ports = []
         for p_cnt in range(n_ports):
@@ -176,7 +209,8 @@ class IntfPort:
             intf_inst_name = intf_prefix + str(p_cnt)
             # Use the interface RDL compiler to generate a port node instance (i.e., an AddrMapNode).
             # The default parameter INTF is overwritten by the instance one
-            new_port_root = rdlc.elaborate(top_def_name=intf_node_name,
+            # Identical interface configurations share the same elaborated node
+            new_port_root = elab_cache.elaborate(top_def_name=intf_node_name,
                                         inst_name=intf_inst_name,
                                         parameters={'INTF': params})
             new_port = new_port_root.get_child_by_name(intf_inst_name)
@@ -0,0 +1,440 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+import gzip
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from systemrdl.rdltypes.user_enum import UserEnum
+
+from .__about__ import __version__
+from .intf import IntfPort, Modport
+from .module import Module
+from .signal import Signal, IntfSignal
+from .subsystem import Subsystem
+from .intc import Intc
+from .adapter import Adapter, AdaptersPath
+
+# Intermediate representation (IR) of the resolved SoC model
+#
+# The IR holds everything the templates read from the model: the modules, interconnects and adapters
+# with their node names, paths and addresses, the interface ports, the signals with their resolved
+# names, and the connection, clock and reset decisions of each subsystem. It is stored as JSON
+# (gzip compressed if the file name ends with .gz), and loaded back as lightweight objects with the
+# same interface as the model classes, so the outputs are rendered without the RDL compiler.
+#
+# The modules and ports are stored in two tables and referenced by their index:
+# {
+#     "format": "socgen-ir", "version": 1, "socgen_version": "...",
+#     "subsystems": [<module index>, ...],  // Subsystems to render, in export order
+#     "modules": [<module>, ...],
+#     "ports": [<port>, ...],
+# }
+IR_FORMAT = "socgen-ir"
+IR_VERSION = 1
+
+class IrBuilder:
+    """Converts Subsystem models to the IR.
+
+    The connection decisions are taken the same way as when rendering the templates, so the IR
+    contains exactly the decisions the templates would take.
+    """
+    def __init__(self):
+        self.modules: List[Optional[Dict[str, Any]]] = []
+        self.ports: List[Optional[Dict[str, Any]]] = []
+        # id() of the model objects -> index in their table
+        self._module_ids: Dict[int, int] = {}
+        self._port_ids: Dict[int, int] = {}
+
+    def build(self, subsystems: List[Subsystem]) -> Dict[str, Any]:
+        """Returns the IR of a list of subsystems (e.g., the ones of an export)."""
+        subsystem_ids = [self.module_id(s) for s in subsystems]
+        return {
+            'format': IR_FORMAT,
+            'version': IR_VERSION,
+            'socgen_version': __version__,
+            'subsystems': subsystem_ids,
+            'modules': self.modules,
+            'ports': self.ports,
+        }
+
+    def module_id(self, m: Module) -> int:
+        """Returns the index of a module, adding it to the modules table if needed."""
+        idx = self._module_ids.get(id(m))
+        if idx is None:
+            # The index is reserved first, so the references back to the module (e.g., from its ports) resolve
+            idx = len(self.modules)
+            self._module_ids[id(m)] = idx
+            self.modules.append(None)
+            self.modules[idx] = self.module_record(m)
+        return idx
+
+    def port_id(self, p: IntfPort) -> int:
+        """Returns the index of an interface port, adding it to the ports table if needed."""
+        idx = self._port_ids.get(id(p))
+        if idx is None:
+            idx = len(self.ports)
+            self._port_ids[id(p)] = idx
+            self.ports.append(None)
+            self.ports[idx] = self.port_record(p)
+        return idx
+
+    @staticmethod
+    def node_record(m: Module) -> Dict[str, Any]:
+        node = m.node
+        return {
+            'inst_name': node.inst_name,
+            'orig_type_name': node.orig_type_name,
+            'path': node.get_path(),
+            'addr_offset': node.inst.addr_offset,
+            'adapter': bool(node.get_property("adapter", default=False)),
+        }
+
+    @staticmethod
+    def signal_record(s: Signal, m: Module, port: bool) -> Dict[str, Any]:
+        """Returns the record of a signal of a module, with its verilog name in this module.
+
+        Only the true flags are stored, the direction is resolved for the port signals only.
+        """
+        rec: Dict[str, Any] = {'name': s.name, 'width': s.width, 'data_type': s.data_type}
+        for flag in ('is_clk', 'is_rst', 'activelow', 'activehigh', 'input', 'output', 'inout'):
+            if getattr(s, flag):
+                rec[flag] = True
+        if isinstance(s, IntfSignal):
+            rec.update(name_port=s.name_port, basename=s.basename)
+            for flag in ('ss', 'miso', 'mosi'):
+                if getattr(s, flag):
+                    rec[flag] = True
+        if port:
+            rec['dir'] = s.verilogDir
+        rec['verilog_name'] = m.getSigVerilogName(s)
+        return rec
+
+    def module_record(self, m: Module) -> Dict[str, Any]:
+        rec: Dict[str, Any] = {
+            'kind': m.kind,
+            'node': self.node_record(m),
+            'size': m.size,
+            'addr_offset': m.addr_offset,
+            'hdl_params': m.hdl_params,
+            'port_signals': [self.signal_record(s, m, port=True) for s in m.port_signals],
+            'internal_signals': [self.signal_record(s, m, port=False) for s in m.internal_signals],
+        }
+        rec['ports'] = [self.port_id(p) for p in m.ports]
+
+        if isinstance(m, Subsystem):
+            rec['modules'] = [self.module_id(x) for x in m.modules]
+            rec['intcs'] = [self.module_id(x) for x in m.intcs]
+            rec['adapter_paths'] = [self.adapters_path_record(ap) for ap in m.adapter_paths]
+            self.add_connections(m)
+        elif isinstance(m, Intc):
+            rec.update(inst_name=m.inst_name,
+                       ext_slv_ports=[self.port_id(p) for p in m.ext_slv_ports],
+                       ext_mst_ports=[self.port_id(p) for p in m.ext_mst_ports])
+        elif isinstance(m, Adapter):
+            rec.update(end_node_name=m.end_node_name,
+                       intfs=[self.port_id(p) for p in m.intfs],
+                       slv_port=self.port_id(m.slv_port),
+                       mst_port=self.port_id(m.mst_port))
+        return rec
+
+    def adapters_path_record(self, ap: AdaptersPath) -> Dict[str, Any]:
+        return {
+            'adapt_from': self.port_id(ap.adapt_from),
+            'adapt_to': self.port_id(ap.adapt_to),
+            'adapters': [self.module_id(a) for a in ap.adapters or []],
+        }
+
+    def port_record(self, p: IntfPort) -> Dict[str, Any]:
+        return {
+            'module': self.module_id(p.module),
+            'idx': p.idx,
+            'type': p.type,
+            'params': {k: v.name if isinstance(v, UserEnum) else v for k, v in p.param_values.items()},
+            'module_name': p.get_module_name(),
+            'signals': [self.signal_record(s, p.module, port=True) for s in p.signals],
+        }
+
+    def add_connections(self, subsys: Subsystem):
+        """Adds the connection, clock and reset decisions of a subsystem to its children port signals.
+
+        A decision references a subsystem signal as [<"port_signals" or "internal_signals">, <index>].
+        """
+        refs: Dict[int, Tuple[str, int]] = {}
+        for attr in ('port_signals', 'internal_signals'):
+            for i, s in enumerate(getattr(subsys, attr)):
+                refs[id(s)] = (attr, i)
+
+        # Same calls than the subsystem template, the matching signal is not looked up for the adapters
+        matched = {id(m) for m in subsys.modules + subsys.intcs}
+        for m in subsys.getAllModules():
+            records = self.modules[self.module_id(m)]['port_signals'] # type: ignore
+            for s, rec in zip(m.port_signals, records):
+                connection = subsys.hasConnection(m, s)
+                if connection:
+                    rec['connection'] = True
+                    if id(m) in matched:
+                        rec['match'] = refs[id(subsys.getMatchingSignal(m, s))]
+                if s.is_clk:
+                    rec['clk'] = refs[id(subsys.getMatchingClk(m, s))]
+                if s.is_rst:
+                    rec['rst'] = refs[id(subsys.getMatchingRst(m, s))]
+
+def build_ir(subsystems: List[Subsystem]) -> Dict[str, Any]:
+    """Returns the IR of a list of subsystems."""
+    return IrBuilder().build(subsystems)
+
+def save_ir(ir: Dict[str, Any], path: str):
+    """Writes an IR as compact JSON, gzip compressed if the file name ends with .gz."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'wt') as f: # type: ignore
+        json.dump(ir, f, separators=(',', ':'))
+
+def read_ir(path: str) -> Dict[str, Any]:
+    """Reads an IR file written by save_ir."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt') as f: # type: ignore
+        ir = json.load(f)
+    if not isinstance(ir, dict) or ir.get('format') != IR_FORMAT:
+        raise ValueError(f"{path} is not a socgen IR file.")
+    if ir.get('version') != IR_VERSION:
+        raise ValueError(f"Unsupported socgen IR version {ir.get('version')} in {path}, expected {IR_VERSION}.")
+    return ir
+
+###############################################################################
+# IR model
+#
+# Read-only counterparts of the model classes, with the attributes and methods used by the templates.
+###############################################################################
+
+class IrNode:
+    """Node attributes of a module."""
+    __slots__ = ('inst_name', 'orig_type_name', 'path', 'addr_offset', 'adapter')
+
+    def __init__(self, rec: Dict[str, Any]):
+        self.inst_name = rec['inst_name']
+        self.orig_type_name = rec['orig_type_name']
+        self.path = rec['path']
+        self.addr_offset = rec['addr_offset']
+        self.adapter = rec['adapter']
+
+    @property
+    def inst(self) -> 'IrNode':
+        # The address offset is read as node.inst.addr_offset
+        return self
+
+    def get_path(self) -> str:
+        return self.path
+
+    def get_property(self, name: str, default: Any = None) -> Any:
+        if name == "adapter":
+            return self.adapter
+        return default
+
+class IrSignal:
+    """Signal or interface signal, with its resolved names and connections."""
+    __slots__ = ('name', 'width', 'data_type', 'is_clk', 'is_rst', 'activelow', 'activehigh', 'input', 'output',
+                 'inout', 'name_port', 'basename', 'ss', 'miso', 'mosi', 'bidir', 'verilogDir', 'verilog_name',
+                 'connection', 'match', 'clk', 'rst')
+
+    def __init__(self, rec: Dict[str, Any]):
+        self.name = rec['name']
+        self.width = rec['width']
+        self.data_type = rec['data_type']
+        for flag in ('is_clk', 'is_rst', 'activelow', 'activehigh', 'input', 'output', 'inout',
+                     'ss', 'miso', 'mosi', 'connection'):
+            setattr(self, flag, rec.get(flag, False))
+        self.bidir = self.miso and self.mosi
+        self.name_port = rec.get('name_port')
+        self.basename = rec.get('basename')
+        self.verilogDir = rec.get('dir')
+        self.verilog_name = rec['verilog_name']
+        # Subsystem signals, resolved once the parent subsystem is loaded
+        self.match: Optional['IrSignal'] = None
+        self.clk: Optional['IrSignal'] = None
+        self.rst: Optional['IrSignal'] = None
+
+    def isShared(self):
+        return not self.ss and not self.miso
+
+    def isOnlyMiso(self):
+        return self.miso and not self.mosi
+
+    def isOnlyMosi(self):
+        return self.mosi and not self.miso
+
+class IrPort:
+    """Interface port."""
+    __slots__ = ('module', 'idx', 'type', 'prefix', 'modport', 'params', 'module_name', 'signals', '_signals_by_basename')
+
+    def __init__(self, rec: Dict[str, Any]):
+        self.module: Optional['IrModule'] = None
+        self.idx = rec['idx']
+        self.type = rec['type']
+        self.params = rec['params']
+        self.prefix = self.params['prefix']
+        self.modport = Modport[self.params['modport']]
+        self.module_name = rec['module_name']
+        self.signals = [IrSignal(s) for s in rec['signals']]
+        self._signals_by_basename: Dict[str, List[IrSignal]] = {}
+        for s in self.signals:
+            self._signals_by_basename.setdefault(s.basename, []).append(s)
+
+    def findSignal(self, sig: IrSignal) -> IrSignal:
+        signals = self._signals_by_basename.get(sig.basename, [])
+        assert len(signals) == 1, f"Looking for {sig.basename}, exactly one element with the same basename must exist found: {len(signals)} {signals}"
+        return signals[0]
+
+    def getXdotName(self) -> str:
+        return self.prefix + f"{self.idx}"
+
+    def get_module_name(self) -> str:
+        return self.module_name
+
+class IrModule:
+    """Module, base of the other IR modules."""
+    __slots__ = ('kind', 'node', 'size', 'addr_offset', 'hdl_params', 'port_signals', 'internal_signals', 'ports')
+
+    def __init__(self, rec: Dict[str, Any]):
+        self.kind = rec['kind']
+        self.node = IrNode(rec['node'])
+        self.size = rec['size']
+        self.addr_offset = rec['addr_offset']
+        self.hdl_params = rec['hdl_params']
+        self.port_signals = [IrSignal(s) for s in rec['port_signals']]
+        self.internal_signals = [IrSignal(s) for s in rec['internal_signals']]
+        self.ports: List[IrPort] = []
+
+    def link(self, rec: Dict[str, Any], modules: List['IrModule'], ports: List[IrPort]):
+        """Resolves the references to the other modules and ports."""
+        self.ports = [ports[i] for i in rec['ports']]
+
+    def getOrigTypeName(self) -> str:
+        if self.node.orig_type_name is not None:
+            return self.node.orig_type_name
+        return self.node.inst_name
+
+    def getSlavePorts(self) -> List[IrPort]:
+        return [intf for intf in self.ports if intf.modport.name == "slave"]
+
+    def getMasterPorts(self) -> List[IrPort]:
+        return [intf for intf in self.ports if intf.modport.name == "master"]
+
+    @property
+    def isOnlyMaster(self) -> bool:
+        return all(p.modport.name != "slave" for p in self.ports)
+
+    @property
+    def isOnlySlave(self) -> bool:
+        return all(p.modport.name != "master" for p in self.ports)
+
+    def getSigVerilogName(self, s: IrSignal) -> str:
+        return s.verilog_name
+
+class IrAdaptersPath:
+    """Chain of adapters between two interface ports."""
+    __slots__ = ('adapt_from', 'adapt_to', 'adapters')
+
+    def __init__(self, rec: Dict[str, Any], modules: List[IrModule], ports: List[IrPort]):
+        self.adapt_from = ports[rec['adapt_from']]
+        self.adapt_to = ports[rec['adapt_to']]
+        self.adapters = [modules[i] for i in rec['adapters']]
+
+    @property
+    def intfChain(self) -> List[IrPort]:
+        return [self.adapt_from] + [adapter.mst_port for adapter in self.adapters[:-1]] + [self.adapt_to] # type: ignore
+
+class IrSubsystem(IrModule):
+    """Subsystem, the connection decisions are read from its children port signals."""
+    __slots__ = ('modules', 'intcs', 'adapter_paths')
+
+    def link(self, rec: Dict[str, Any], modules: List[IrModule], ports: List[IrPort]):
+        super().link(rec, modules, ports)
+        self.modules = [modules[i] for i in rec['modules']]
+        self.intcs = [modules[i] for i in rec['intcs']]
+        self.adapter_paths = [IrAdaptersPath(ap, modules, ports) for ap in rec['adapter_paths']]
+
+    def resolve_connections(self, modules_rec: List[Dict[str, Any]], module_ids: Dict[int, int]):
+        """Resolves the subsystem signals referenced by the connection decisions of the children."""
+        for m in self.getAllModules():
+            for s, s_rec in zip(m.port_signals, modules_rec[module_ids[id(m)]]['port_signals']):
+                for attr in ('match', 'clk', 'rst'):
+                    ref = s_rec.get(attr)
+                    if ref is not None:
+                        setattr(s, attr, getattr(self, ref[0])[ref[1]])
+
+    def getAllModules(self) -> List[IrModule]:
+        return self.modules + self.intcs + self.getAllAdapters()
+
+    def getAllAdapters(self) -> List[IrModule]:
+        return [adapter for ap in self.adapter_paths for adapter in ap.adapters]
+
+    def hasConnection(self, submodule: IrModule, submodule_signal: IrSignal) -> bool:
+        return submodule_signal.connection
+
+    def getMatchingSignal(self, submodule: IrModule, submodule_signal: IrSignal) -> IrSignal:
+        assert submodule_signal.match is not None, f"The subsystem submodule {submodule.node.inst_name} does not contain the signal {submodule_signal.name}"
+        return submodule_signal.match
+
+    def getMatchingClk(self, m: IrModule, s: IrSignal) -> IrSignal:
+        return s.clk # type: ignore
+
+    def getMatchingRst(self, m: IrModule, s: IrSignal) -> IrSignal:
+        return s.rst # type: ignore
+
+class IrIntc(IrModule):
+    """Interconnect."""
+    __slots__ = ('inst_name', 'ext_slv_ports', 'ext_mst_ports', 'subsystem_node')
+
+    def link(self, rec: Dict[str, Any], modules: List[IrModule], ports: List[IrPort]):
+        super().link(rec, modules, ports)
+        self.inst_name = rec['inst_name']
+        self.ext_slv_ports = [ports[i] for i in rec['ext_slv_ports']]
+        self.ext_mst_ports = [ports[i] for i in rec['ext_mst_ports']]
+
+    @property
+    def num_ext_slaves(self) -> int:
+        return len(self.ext_slv_ports)
+
+    @property
+    def num_ext_masters(self) -> int:
+        return len(self.ext_mst_ports)
+
+class IrAdapter(IrModule):
+    """Adapter."""
+    __slots__ = ('end_node_name', 'intfs', 'slv_port', 'mst_port')
+
+    def link(self, rec: Dict[str, Any], modules: List[IrModule], ports: List[IrPort]):
+        super().link(rec, modules, ports)
+        self.end_node_name = rec['end_node_name']
+        self.intfs = [ports[i] for i in rec['intfs']]
+        self.slv_port = ports[rec['slv_port']]
+        self.mst_port = ports[rec['mst_port']]
+
+IR_MODULE_CLASSES = {
+    'module': IrModule,
+    'subsystem': IrSubsystem,
+    'intc': IrIntc,
+    'adapter': IrAdapter,
+}
+
+def load_ir(ir: Dict[str, Any]) -> List[IrSubsystem]:
+    """Returns the IR model of the subsystems of an IR."""
+    modules = [IR_MODULE_CLASSES[rec['kind']](rec) for rec in ir['modules']]
+    ports = [IrPort(rec) for rec in ir['ports']]
+    for port, rec in zip(ports, ir['ports']):
+        port.module = modules[rec['module']]
+    for m, rec in zip(modules, ir['modules']):
+        m.link(rec, modules, ports)
+
+    module_ids = {id(m): i for i, m in enumerate(modules)}
+    for m in modules:
+        if isinstance(m, IrSubsystem):
+            m.resolve_connections(ir['modules'], module_ids)
+            # The interconnects belong to the subsystem they are created in
+            for intc in m.intcs:
+                intc.subsystem_node = m.node # type: ignore
+
+    return [modules[i] for i in ir['subsystems']] # type: ignore
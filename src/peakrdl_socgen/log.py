@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+import json
+import logging
+from typing import Any, Optional
+
+# Loggers of the socgen modules
+LOGGER_NAMES = ("export_logger", "subsys_logger", "module_logger", "daemon_logger")
+LOG_FORMAT = '%(name)s - %(levelname)s: %(message)s'
+
+# Console handler shared by all the socgen loggers, created by the first setup_logging() call
+_handler: Optional[logging.Handler] = None
+
+def setup_logging(level: int = logging.INFO):
+    """Attaches a console handler to the socgen loggers and sets their level.
+
+    Nothing is configured at import time. Applications using SocExporter directly can call this
+    function or configure the loggers themselves, otherwise the first export calls it (see
+    ensure_logging()).
+    """
+    global _handler # pylint: disable=global-statement
+    if _handler is None:
+        _handler = logging.StreamHandler()
+        _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        for name in LOGGER_NAMES:
+            logging.getLogger(name).addHandler(_handler)
+
+    for name in LOGGER_NAMES:
+        logging.getLogger(name).setLevel(level)
+
+def ensure_logging():
+    """Sets up the console logging with the default level, unless logging is already configured.
+
+    Called on the first use of the exporter, so its messages are printed when it is used as a
+    library. Nothing is done if a handler is attached to a socgen logger or to one of its
+    ancestors (e.g., by logging.basicConfig()).
+    """
+    if _handler is None and not any(logging.getLogger(name).hasHandlers() for name in LOGGER_NAMES):
+        setup_logging()
+
+class ConnectionTrace:
+    """JSON lines trace of the connection decisions (clocks, resets, signals and adapters).
+
+    Each record is a JSON object with an 'event' field and the event specific fields. The file
+    is line buffered and opened in append mode, so the forked render workers can add their
+    records to it too.
+    """
+    enabled = True
+
+    def __init__(self, path: str):
+        self.path = path
+        # Truncate, then append from all the processes sharing the file
+        open(path, 'w').close()
+        self.file = open(path, 'a', buffering=1)
+
+    def record(self, event: str, **fields: Any):
+        self.file.write(json.dumps({'event': event, **fields}) + '\n')
+
+    def close(self):
+        self.file.close()
+
+class NullTrace(ConnectionTrace):
+    """Trace used when tracing is disabled, it records nothing."""
+    enabled = False
+
+    def __init__(self): # pylint: disable=super-init-not-called
+        pass
+
+    def record(self, event: str, **fields: Any):
+        pass
+
+    def close(self):
+        pass
+
+_trace: ConnectionTrace = NullTrace()
+
+def get_trace() -> ConnectionTrace:
+    """Returns the active connection trace (a NullTrace if tracing is disabled).
+
+    Callers should check trace.enabled before building the record fields.
+    """
+    return _trace
+
+def set_trace(trace: Optional[ConnectionTrace]):
+    """Sets the active connection trace, None disables tracing."""
+    global _trace # pylint: disable=global-statement
+    _trace = NullTrace() if trace is None else trace
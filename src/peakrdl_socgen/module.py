@@ -14,22 +14,20 @@ import re
 from systemrdl.rdltypes.array import ArrayedType
 
 from .intf import IntfPort
-from .signal import Signal
+from .signal import Signal, compile_regex
 
-# Logger generation for halnode module
-module_logger = logging.getLogger("module_logger")
-# Console handler
-ch = logging.StreamHandler()
-# create formatter and add it to the handlers
-formatter = logging.Formatter('%(name)s - %(levelname)s: %(message)s')
-ch.setFormatter(formatter)
-# add the handlers to the logger
-module_logger.addHandler(ch)
+# Standard port suffix (with optional tmr A/B/C letter) removed from internal connection signal names
+STD_SUFFIX_MATCH_PATTERN = r"_(ni|nio|i|o|io|no)([A|B|C]?)$"
+STD_SUFFIX_REPLACE_PATTERN = r"\2"
 
-# Set for more verbosity
-module_logger.setLevel(logging.INFO)
+# Handlers and level are set by the application, or on the first export, see log.ensure_logging()
+module_logger = logging.getLogger("module_logger")
 
 class Module:
+    # Kind of module, used by the templates and the IR (see ir.py)
+    kind = "module"
+    __slots__ = ('node', 'rdlc', 'ports', 'hdl_params', 'port_signals', 'internal_signals', '_sig_verilog_names')
+
     def __init__(self, node: AddrmapNode, rdlc: RDLCompiler):
         """Each module is a wrapper around an AddrmapNode and contains an RDLCompiler
         with the interface files."""
@@ -42,6 +40,9 @@ class Module:
 
         self.port_signals, self.internal_signals = self.getSignals()
 
+        # Verilog names of the signals already resolved by getSigVerilogName
+        self._sig_verilog_names = {}
+
     @property
     def isOnlyMaster(self) -> bool:
         for p in self.ports:
@@ -60,6 +61,10 @@ class Module:
     def size(self) -> int:
         return self.node.size
 
+    @property
+    def addr_offset(self) -> int:
+        return self.node.inst.addr_offset
+
     def getOrigTypeName(self) -> str:
         if self.node.orig_type_name is not None:
             return self.node.orig_type_name
@@ -72,23 +77,28 @@ class Module:
         for s in self.node.signals():
             if s.get_property("input") or s.get_property("output") or s.get_property("inout"):
                 port_signals.append(Signal(s))
-                module_logger.debug(f"Module {self.node.inst_name} - getSignals: added signal {port_signals[-1].name} to port_signals of module {self.node.inst_name}")
+                module_logger.debug("Module %s - getSignals: added signal %s to port_signals of module %s", self.node.inst_name, port_signals[-1].name, self.node.inst_name)
             else:
                 internal_signals.append(Signal(s))
-                module_logger.debug(f"Module {self.node.inst_name} - getSignals: added signal {internal_signals[-1].name} to internal_signals of module {self.node.inst_name}")
+                module_logger.debug("Module %s - getSignals: added signal %s to internal_signals of module %s", self.node.inst_name, internal_signals[-1].name, self.node.inst_name)
         return port_signals, internal_signals
 
     def hasSignal(self, sig_name) -> bool:
         """Returns True if the module has a signal matching the given one."""
-        module_logger.debug(f"Module - hasSignal: {self.node.inst_name} has {sig_name}?")
+        # Skip the debug calls of the loops when they are disabled
+        debug = module_logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            module_logger.debug("Module - hasSignal: %s has %s?", self.node.inst_name, sig_name)
         # Check explicit port signals
         for s in self.port_signals:
             if s.name == sig_name:
-                module_logger.debug(f"Yes (explicit port signal)")
+                if debug:
+                    module_logger.debug("Yes (explicit port signal)")
                 return True
         # Check internal signals
         for s in self.internal_signals:
-            module_logger.debug(f"Module - hasSignal: checking internal signal {s.name}")
+            if debug:
+                module_logger.debug("Module - hasSignal: checking internal signal %s", s.name)
             # Keep only the ultimate path name
             to_path = s.node.get_property("to", default="").split('.')[-1]
             from_path = s.node.get_property("from", default="").split('.')[-1]
@@ -96,15 +106,17 @@ class Module:
             # The signal is check independently of the standard port naming conventions
             regex_pattern = rf"^{re.escape(sig_name)}(_(ni|nio|i|o|io|no))?$"
             if re.fullmatch(regex_pattern, to_path) or re.fullmatch(regex_pattern, from_path):
-                module_logger.debug(f"Yes (internal signal)")
+                if debug:
+                    module_logger.debug("Yes (internal signal)")
                 return True
 
-        module_logger.debug(f"No")
+        if debug:
+            module_logger.debug("No")
         return False
         # Skip warning for clock and reset as they are instantiated separately
         # # We only have the signal name so to a simple filtering
         # if 'clk' not in sig_name and 'rst' not in sig_name:
-        #     module_logger.warning(f"Module {self.getOrigTypeName()} has no signal {sig_name} (ignore if signal linked through 'path')")
+        #     module_logger.warning("Module %s has no signal %s (ignore if signal linked through 'path')", self.getOrigTypeName(), sig_name)
         # return False
 
     def getClks(self) -> Signal:
@@ -113,7 +125,7 @@ class Module:
         if len(clks) > 0:
             return clks
         else:
-            module_logger.error(f'No clock found in module {self.getOrigTypeName()}.')
+            module_logger.error('No clock found in module %s.', self.getOrigTypeName())
             return None
 
     def getRsts(self):
@@ -122,7 +134,7 @@ class Module:
         if len(rsts) > 0:
             return rsts
         else:
-            module_logger.error(f'No reset found in module {self.getOrigTypeName()}.')
+            module_logger.error('No reset found in module %s.', self.getOrigTypeName())
             return None
 
     def getAddrmaps(self):
@@ -173,21 +185,22 @@ class Module:
         return isinstance(param.get_value(), int) or \
                (isinstance(param.param_type, ArrayedType) and param.param_type.element_type == int)
 
+    def getSigVerilogPrefix(self) -> str:
+        """Returns the prefix of the module internal connection signal names."""
+        return self.node.inst_name + "_"
+
     def getSigVerilogName(self, s: Signal) -> str:
         """Returns the module/node instance name appended with the signal instance name."""
-        # Used for internal connection within a module, remove any port-specific suffix for better readability
-        signal_name = s.name
-        module_logger.debug(f"Module {self.node.inst_name} - getSigVerilogName for signal {signal_name}")
-        # This function is called only for internal signals, so remove any standard suffix
-        # Regex pattern
-        match_pattern = r"_(ni|nio|i|o|io|no)([A|B|C]?)$"
-        replace_pattern = r"\2"
-        if re.search(match_pattern, signal_name):
-            # Perform the regex replacement
-            signal_name = re.sub(match_pattern, replace_pattern, signal_name)
-            module_logger.debug(f"Module {self.node.inst_name} - getSigVerilogName: regex found and replaced: {signal_name}")
-
-        return self.node.inst_name + "_" + signal_name
+        signal_name = self._sig_verilog_names.get(s)
+        if signal_name is None:
+            # Used for internal connection within a module, remove any port-specific suffix for better readability
+            # This function is called only for internal signals, so remove any standard suffix
+            signal_name = compile_regex(STD_SUFFIX_MATCH_PATTERN).sub(STD_SUFFIX_REPLACE_PATTERN, s.name)
+            module_logger.debug("Module %s - getSigVerilogName for signal %s: %s", self.node.inst_name, s.name, signal_name)
+            signal_name = self.getSigVerilogPrefix() + signal_name
+            self._sig_verilog_names[s] = signal_name
+
+        return signal_name
 
     def create_ports(self) -> List[IntfPort]:
         """Get the module declared interfaces and create an IntfPort object for each of them.
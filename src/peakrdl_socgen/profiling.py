@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+import contextlib
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None # type: ignore
+
+class Profiler:
+    """Records the wall time and the number of executions of the export phases, and event counters.
+
+    Phases can be nested, the time of a phase includes the time of its nested phases.
+    If track_memory is set, the peak RSS reached at the end of each phase is recorded too.
+    """
+    def __init__(self, track_memory: bool = False):
+        self.track_memory = track_memory
+        self.start = time.perf_counter()
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Context manager adding the time spent in its body to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+            if self.track_memory:
+                self.phases[name]['peak_rss_bytes'] = self.peak_rss()
+
+    def add_time(self, name: str, seconds: float, count: int = 1):
+        phase = self.phases.setdefault(name, {'time': 0.0, 'count': 0})
+        phase['time'] += seconds
+        phase['count'] += count
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """Yields the items of an iterable, adding the time spent producing them to a phase."""
+        iterator = iter(iterable)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield item
+        finally:
+            self.add_time(name, elapsed)
+
+    def count(self, name: str, n: int = 1):
+        """Increments an event counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @staticmethod
+    def peak_rss(who: int = 0) -> Optional[int]:
+        """Returns the peak resident set size in bytes of this process (who=0) or of its children (who=1)."""
+        if resource is None:
+            return None
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN if who else resource.RUSAGE_SELF)
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_time': time.perf_counter() - self.start,
+            'phases': self.phases,
+            'counters': dict(sorted(self.counters.items())),
+            'peak_rss_bytes': self.peak_rss(),
+            'peak_rss_children_bytes': self.peak_rss(who=1),
+        }
+
+    def save(self, path: str):
+        """Writes the profile as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+class NullProfiler(Profiler):
+    """Profiler used when profiling is disabled, it records nothing."""
+    def phase(self, name: str):
+        return contextlib.nullcontext()
+
+    def add_time(self, name: str, seconds: float, count: int = 1):
+        pass
+
+    def timed(self, name: str, iterable: Iterable) -> Iterable:
+        return iterable
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+_profiler: Profiler = NullProfiler()
+
+def get_profiler() -> Profiler:
+    """Returns the active profiler (a NullProfiler if profiling is disabled)."""
+    return _profiler
+
+def set_profiler(profiler: Optional[Profiler]):
+    """Sets the active profiler, None disables profiling."""
+    global _profiler # pylint: disable=global-statement
+    _profiler = NullProfiler() if profiler is None else profiler
@@ -0,0 +1,333 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# Copyright (c) 2025 CERN
+#
+# Please retain this header in all redistributions and modifications of the code.
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from .profiling import get_profiler
+
+# Dot diagram modes (see SocExporter.render_summary_files()):
+# - full: a single diagram with all the subsystems expanded,
+# - top: a single diagram of the top subsystem(s), the nested subsystems are collapsed into one node,
+# - split: the top diagram and one diagram per subsystem, with its nested subsystems collapsed.
+DOT_MODES = ('full', 'top', 'split')
+
+def vrange(width: int) -> str:
+    """Returns the verilog range of a signal declaration, empty for single bit signals."""
+    return f" [{width - 1}:0]" if width > 1 else ""
+
+def sep(is_last: bool) -> str:
+    """Returns the separator of a list item."""
+    return "" if is_last else ","
+
+class RenderPlan:
+    """Everything the subsystem template writes, resolved in one pass over a subsystem.
+
+    The connections (hasConnection, getMatchingSignal, getMatchingClk/Rst, findSignal, ...) are
+    resolved here, so the template only iterates over flat lists of tuples of strings: the port and
+    wire declarations, the instance port maps and the assign statements. The subsystem can be a
+    Subsystem or its IR counterpart (see ir.py).
+
+    Declarations are (type, range, name) tuples, port maps (port, signal, separator) tuples and
+    assigns (lhs, rhs) tuples. The tuple layout of each section is given in the build method
+    filling it.
+    """
+    __slots__ = ('type_name', 'hdl_params', 'port_decls', 'buses', 'internal_wires', 'module_wires',
+                 'intc_wires', 'adapter_wires', 'clk_rst_assigns', 'module_insts', 'intc_insts', 'adapter_insts',
+                 '_connected')
+
+    def __init__(self, subsys: Any):
+        with get_profiler().phase('render_plan'):
+            self.type_name = subsys.getOrigTypeName()
+            self.hdl_params = self.params(subsys)
+
+            # Submodule port signals -> connected to a subsystem signal, resolved once per signal
+            self._connected = {id(s): subsys.hasConnection(m, s) for m in subsys.getAllModules() for s in m.port_signals}
+
+            self.buildPorts(subsys)
+            self.internal_wires = [(s.data_type, vrange(s.width), s.name) for s in subsys.internal_signals]
+            self.buildModules(subsys)
+            self.buildIntcs(subsys)
+            self.buildAdapters(subsys)
+            self.clk_rst_assigns = [self.clkRstAssigns(subsys, m) for m in subsys.getAllModules()]
+
+    @staticmethod
+    def params(module: Any) -> List[Tuple[str, Any, str]]:
+        """Returns the (name, value, separator) HDL parameters of a module."""
+        params = module.hdl_params
+        return [(p['name'], p['value'], sep(i == len(params) - 1)) for i, p in enumerate(params)]
+
+    def explicitWires(self, module: Any, data_type: bool = True) -> List[Tuple[str, str, str]]:
+        """Returns the wires of the explicit port signals of a submodule not connected to a subsystem signal."""
+        return [(s.data_type if data_type else "wire", vrange(s.width), module.getSigVerilogName(s))
+                for s in module.port_signals if not self._connected[id(s)]]
+
+    def buildPorts(self, subsys: Any):
+        # port_decls: (direction, range, name, separator)
+        n_signals = len(subsys.port_signals)
+        self.port_decls = [(s.verilogDir, vrange(s.width), s.name, sep(i == n_signals - 1 and not subsys.ports))
+                           for i, s in enumerate(subsys.port_signals)]
+        # buses: (name, [(direction, range, name, separator)])
+        self.buses = []
+        for i, intf in enumerate(subsys.ports):
+            last_bus = i == len(subsys.ports) - 1
+            decls = [(s.verilogDir, vrange(s.width), s.name_port, sep(last_bus and j == len(intf.signals) - 1))
+                     for j, s in enumerate(intf.signals)]
+            self.buses.append((intf.prefix + intf.type, decls))
+
+    def buildModules(self, subsys: Any):
+        # module_wires: (instance name, explicit wires, [(range, name, comment)])
+        self.module_wires = []
+        # module_insts: (path, type name, parameters, instance name, explicit port map, [(port type, port map)])
+        self.module_insts = []
+        for module in subsys.modules:
+            inst_name = module.node.inst_name
+            intf_wires = [(vrange(s.width), f"{inst_name}_{s.name}", f"{inst_name}  {port.type}")
+                          for port in module.ports for s in port.signals]
+            self.module_wires.append((inst_name, self.explicitWires(module), intf_wires))
+
+            n_signals = len(module.port_signals)
+            explicit = []
+            for i, s in enumerate(module.port_signals):
+                if not self._connected[id(s)]:
+                    sig_name = module.getSigVerilogName(s)
+                else:
+                    sig_name = subsys.getMatchingSignal(module, s).name
+                explicit.append((s.name, sig_name, sep(i == n_signals - 1 and not module.ports)))
+            ports = []
+            for i, port in enumerate(module.ports):
+                last_port = i == len(module.ports) - 1
+                ports.append((port.type, [(s.name_port, module.getSigVerilogName(s), sep(last_port and j == len(port.signals) - 1))
+                                          for j, s in enumerate(port.signals)]))
+            self.module_insts.append((module.node.get_path(), module.getOrigTypeName(), self.params(module),
+                                      inst_name, explicit, ports))
+
+    def buildIntcs(self, subsys: Any):
+        # intc_wires: (instance name, explicit wires, slave port wires, master port wires), the
+        # port wires are (range, name) with one slice per external port
+        self.intc_wires = []
+        # intc_insts: (instance name, type name, parameters, explicit port map, [port map of the master
+        # and slave ports], slave port assigns, master port assigns), the assigns are per external port
+        self.intc_insts = []
+        for intc in subsys.intcs:
+            inst_name = intc.node.inst_name
+            slv_port = intc.getSlavePorts()[0]
+            mst_port = intc.getMasterPorts()[0]
+            n_slaves = intc.num_ext_slaves
+            n_masters = intc.num_ext_masters
+            slv_wires = [(f" [{s.width * n_slaves - 1}:0]", f"{slv_port.module.node.inst_name}_{s.name}")
+                         for s in slv_port.signals]
+            mst_wires = [(f" [{s.width * ((n_masters if not s.isShared() else 0) or 1) - 1}:0]", f"{mst_port.module.node.inst_name}_{s.name}")
+                         for s in mst_port.signals]
+            self.intc_wires.append((inst_name, self.explicitWires(intc, data_type=False), slv_wires, mst_wires))
+
+            explicit = []
+            for s in intc.port_signals:
+                if not self._connected[id(s)]:
+                    explicit.append((s.name, intc.getSigVerilogName(s)))
+                else:
+                    explicit.append((s.name, subsys.getMatchingSignal(intc, s).name))
+            port_maps = []
+            for i, intf in enumerate((mst_port, slv_port)):
+                port_maps.append([(s.name_port, f"{intf.module.node.inst_name}_{s.name}", sep(i == 1 and j == len(intf.signals) - 1))
+                                  for j, s in enumerate(intf.signals)])
+
+            slv_assigns = []
+            for intf_idx, intf in enumerate(intc.ext_slv_ports):
+                own_port = intf.module.node == subsys.node
+                mod_prefix = "" if own_port else intf.module.node.inst_name + "_"
+                assigns = []
+                for s in intf.signals:
+                    intc_sig = f"{inst_name}_{slv_port.findSignal(s).name}[{intf_idx * s.width} +: {s.width}]"
+                    sig = mod_prefix + (s.name_port if own_port else s.name)
+                    if s.mosi:
+                        assigns.append((intc_sig, sig))
+                    elif s.miso:
+                        assigns.append((sig, intc_sig))
+                slv_assigns.append(assigns)
+
+            mst_assigns = []
+            for intf_idx, intf in enumerate(intc.ext_mst_ports):
+                if intf.module.node == subsys.node:
+                    mod_prefix = ""
+                elif intf.module.node.get_property("adapter"):
+                    mod_prefix = intf.module.node.inst_name + "_" + intf.get_module_name() + "_"
+                else:
+                    mod_prefix = intf.get_module_name() + "_"
+                assigns = []
+                for s in intf.signals:
+                    sig_idx = int(not s.isShared()) * intf_idx
+                    intc_sig = f"{inst_name}_{mst_port.findSignal(s).name}[{sig_idx * s.width} +: {s.width}]"
+                    if s.mosi:
+                        assigns.append((mod_prefix + s.name, intc_sig))
+                    elif s.miso:
+                        assigns.append((intc_sig, mod_prefix + s.name))
+                mst_assigns.append(assigns)
+
+            self.intc_insts.append((inst_name, intc.node.orig_type_name, self.params(intc), explicit, port_maps,
+                                    slv_assigns, mst_assigns))
+
+    def buildAdapters(self, subsys: Any):
+        # adapter_wires: (name, explicit wires, slave port wires, master port wires), the port wires
+        # are (range, name), the slave port ones only for the first adapter of a path
+        self.adapter_wires = []
+        # adapter_insts: for each path, (name, type name, parameters, explicit port map, slave port map,
+        # master port map, assigns to the adapted port), the assigns only for the last adapter of a path
+        self.adapter_insts = []
+        for apath in subsys.adapter_paths:
+            chain = apath.intfChain
+            path_insts = []
+            for i, adapter in enumerate(apath.adapters):
+                name = f"{adapter.node.inst_name}_{adapter.end_node_name}"
+                slv_wires = [(f" [{s.width - 1}:0]", f"{name}_{s.name}") for s in adapter.slv_port.signals] if i == 0 else []
+                mst_wires = [(f" [{s.width - 1}:0]", f"{name}_{s.name}") for s in adapter.mst_port.signals]
+                self.adapter_wires.append((name, self.explicitWires(adapter, data_type=False), slv_wires, mst_wires))
+
+                if i == 0:
+                    prev_name, prev_mst_port = name, adapter.slv_port
+                else:
+                    prev = apath.adapters[i - 1]
+                    prev_name, prev_mst_port = f"{prev.node.inst_name}_{prev.end_node_name}", prev.mst_port
+
+                n_signals = len(adapter.port_signals)
+                explicit = [(s.name, adapter.getSigVerilogName(s), sep(j == n_signals - 1 and not adapter.intfs))
+                            for j, s in enumerate(adapter.port_signals)]
+                slv_map = [(adapter.slv_port.findSignal(s).name_port, f"{prev_name}_{prev_mst_port.findSignal(s).name}")
+                           for s in chain[i].signals]
+                mst_signals = chain[i + 1].signals
+                mst_map = []
+                for j, s in enumerate(mst_signals):
+                    adapter_sig = adapter.mst_port.findSignal(s)
+                    mst_map.append((adapter_sig.name_port, f"{name}_{adapter_sig.name}", sep(j == len(mst_signals) - 1)))
+
+                assigns = None
+                if i == len(apath.adapters) - 1:
+                    assigns = []
+                    for s in apath.adapt_to.signals:
+                        adapter_sig = f"{name}_{adapter.mst_port.findSignal(s).name}"
+                        sig = f"{apath.adapt_to.module.node.inst_name}_{s.name}"
+                        if s.mosi:
+                            assigns.append((sig, adapter_sig))
+                        elif s.miso:
+                            assigns.append((adapter_sig, sig))
+
+                path_insts.append((name, adapter.getOrigTypeName(), self.params(adapter), explicit,
+                                   slv_map, mst_map, assigns))
+            self.adapter_insts.append(path_insts)
+
+    @staticmethod
+    def clkRstAssigns(subsys: Any, module: Any) -> List[Tuple[str, str]]:
+        """Returns the assigns of the clock and reset port signals of a submodule."""
+        assigns = []
+        for s in module.port_signals:
+            if s.is_clk:
+                assigns.append((module.getSigVerilogName(s), subsys.getMatchingClk(module, s).name))
+            if s.is_rst:
+                rst_sig = subsys.getMatchingRst(module, s)
+                assigns.append((module.getSigVerilogName(s), ("!" if s.activehigh != rst_sig.activehigh else "") + rst_sig.name))
+        return assigns
+
+class SubsystemSummary:
+    """What the address map package and the dot diagram need from a subsystem, as plain data.
+
+    The summary only holds names and addresses, so the subsystem model can be freed once its file
+    is rendered (see SocExporter.export() low_memory mode). The tuple layout of each list is given
+    in the build method filling it.
+    """
+    __slots__ = ('type_name', 'inst_name', 'path', 'addr_rules', 'ports', 'modules', 'intc_edges', 'adapter_edges')
+
+    def __init__(self, subsys: Any):
+        self.type_name = subsys.getOrigTypeName()
+        self.inst_name = subsys.node.inst_name
+        self.path = subsys.node.get_path()
+        self.buildAddrRules(subsys)
+        self.buildDiagram(subsys)
+
+    def toDict(self) -> Dict[str, Any]:
+        """Returns the summary as JSON serializable data, see fromDict()."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def fromDict(cls, data: Dict[str, Any]) -> 'SubsystemSummary':
+        """Returns a summary from the data returned by toDict() (its tuples may have become lists)."""
+        summary = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(summary, name, data[name])
+        return summary
+
+    def buildAddrRules(self, subsys: Any):
+        # addr_rules: (interconnect name, number of masters, base address, [(module name, offset, size)]
+        # of the slaves)
+        self.addr_rules = [(intc.inst_name, len(intc.ext_slv_ports), intc.subsystem_node.inst.addr_offset,
+                            [(port.get_module_name(), port.module.addr_offset, port.module.size) for port in intc.ext_mst_ports])
+                           for intc in subsys.intcs]
+
+    def buildDiagram(self, subsys: Any):
+        # ports: (slave ports, master ports) of the subsystem itself
+        self.ports = ([intf.getXdotName() for intf in subsys.getSlavePorts()],
+                      [intf.getXdotName() for intf in subsys.getMasterPorts()])
+
+        # modules: (node name, kind, only master, only slave, type name, instance name, slave ports, master ports)
+        self.modules = []
+        for mod in subsys.getAllModules():
+            only_master = mod.kind == "module" and mod.isOnlyMaster
+            only_slave = mod.kind == "module" and mod.isOnlySlave
+            if mod.kind == "adapter":
+                slave_ports, master_ports = [mod.slv_port], [mod.mst_port]
+            else:
+                slave_ports, master_ports = mod.getSlavePorts(), mod.getMasterPorts()
+            self.modules.append((self.nodeName(mod), mod.kind, only_master, only_slave, mod.node.orig_type_name,
+                                 mod.node.inst_name, [intf.getXdotName() for intf in slave_ports],
+                                 [intf.getXdotName() for intf in master_ports]))
+
+        # Edges are (source node, source port, destination node, destination port)
+        # intc_edges: (interconnect name, edges from the masters, edges to the slaves)
+        self.intc_edges = []
+        for intc in subsys.intcs:
+            intc_name = self.nodeName(intc)
+            slv_edges = [(self.nodeName(ext_intf.module), ext_intf.getXdotName(), intc_name, intf.getXdotName())
+                         for ext_intf, intf in zip(intc.ext_slv_ports, intc.getSlavePorts())]
+            mst_edges = [(intc_name, intf.getXdotName(), self.nodeName(ext_intf.module), ext_intf.getXdotName())
+                         for ext_intf, intf in zip(intc.ext_mst_ports, intc.getMasterPorts())]
+            self.intc_edges.append((intc.node.inst_name, slv_edges, mst_edges))
+
+        # adapter_edges: (adapted interface, target interface, edges along the adapter chain)
+        self.adapter_edges = []
+        for apath in subsys.adapter_paths:
+            adapters = apath.adapters
+            edges = [(self.nodeName(prev), prev.mst_port.getXdotName(), self.nodeName(adapter), adapter.slv_port.getXdotName())
+                     for prev, adapter in zip(adapters, adapters[1:])]
+            edges.append((self.nodeName(adapters[-1]), adapters[-1].mst_port.getXdotName(),
+                          self.nodeName(apath.adapt_to.module), apath.adapt_to.getXdotName()))
+            self.adapter_edges.append((apath.adapt_from.type.replace("_intf_node", ""),
+                                       apath.adapt_to.type.replace("_intf_node", ""), edges))
+
+    def nodeName(self, mod: Any) -> str:
+        """Returns the dot node name of a module of the subsystem, or of the subsystem itself."""
+        # Interconnects and adapters are elaborated by the glue compiler, their path is only their
+        # instance name, so they are prefixed with the subsystem path (adapters named as their instance)
+        if mod.kind == "intc":
+            path = f"{self.path}.{mod.node.inst_name}"
+        elif mod.kind == "adapter":
+            path = f"{self.path}.{mod.node.inst_name}_{mod.end_node_name}"
+        else:
+            path = mod.node.get_path()
+        return path.replace(".", "_")
+
+    @staticmethod
+    def getTopPaths(paths: Iterable[str]) -> Set[str]:
+        """Returns the paths of the subsystems not nested in another subsystem, among the given ones."""
+        paths = set(paths)
+        top = set()
+        for path in paths:
+            parts = path.split(".")
+            if not any(".".join(parts[:i]) in paths for i in range(1, len(parts))):
+                top.add(path)
+        return top
+
+    @staticmethod
+    def getTopSummaries(summaries: List['SubsystemSummary']) -> List['SubsystemSummary']:
+        """Returns the summaries of the subsystems not nested in another subsystem."""
+        top_paths = SubsystemSummary.getTopPaths(s.path for s in summaries)
+        return [summary for summary in summaries if summary.path in top_paths]
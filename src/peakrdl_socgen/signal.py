@@ -5,22 +5,61 @@
 
 import re
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Pattern, Tuple
 from systemrdl.node import SignalNode
 
+from .profiling import get_profiler
+
 if TYPE_CHECKING:
     from .intf import IntfPort
 
+# Compiled regexes and split 'match_pattern::replace_pattern' strings, keyed by pattern
+_regex_cache: Dict[str, Pattern] = {}
+_regex_arg_cache: Dict[str, Tuple[Pattern, str]] = {}
+
+# If it is a tmr signal it will have the format, e.g., paddrA_i
+# To create signal with same format than tmrg change it to, e.g., paddr_iA
+TMR_MATCH_PATTERN = r"([ABC])_(n?[io])$"
+TMR_REPLACE_PATTERN = r"_\2\1"
+
+def compile_regex(pattern: str) -> Pattern:
+    """Returns the compiled regex of a pattern, compiling it only the first time."""
+    regex = _regex_cache.get(pattern)
+    if regex is None:
+        regex = re.compile(pattern)
+        _regex_cache[pattern] = regex
+    return regex
+
+def apply_regex_arg(regex: str, name: str) -> str:
+    """Applies a 'match_pattern::replace_pattern' regex argument to a name."""
+    split = _regex_arg_cache.get(regex)
+    if split is None:
+        try:
+            match_pattern, replace_pattern = regex.split('::', 1)
+        except ValueError:
+            raise ValueError(f"Invalid format for regex argument: {regex}. Use 'match_pattern::replace_pattern'.")
+        split = (compile_regex(match_pattern), replace_pattern)
+        _regex_arg_cache[regex] = split
+    return split[0].sub(split[1], name)
+
 class Signal:
     """Wrapper around a SignalNode with extended properties for verilog module generation."""
+    # Designs can have hundreds of thousands of signals, slots avoid a per-instance __dict__
+    __slots__ = ('node', 'prefix', 'basename', 'regex', 'name', 'width', 'is_clk', 'is_rst',
+                 'activelow', 'activehigh', 'output', 'input', 'inout', 'data_type')
+
     def __init__(self, node: SignalNode, prefix: str = "", cap: bool = False, regex: str = ""):
 
+        # All the signals are counted, including the interface ones
+        get_profiler().count('Signal')
         self.node = node
         # Prefix appended to the signal name?
         self.prefix = prefix
         # Name of the node containing the signal
         self.basename = node.inst_name
         self.regex = regex
+        # Signal instance name, it never changes after construction
+        self.name = self.getName()
 
         self.width = node.width
         self.is_clk = self.isClk()
@@ -39,19 +78,14 @@ class Signal:
 
         self.data_type = node.get_property('datatype', default='wire')
 
-    @property
-    def name(self):
-        """Gets the signal instance name."""
+    def getName(self) -> str:
+        """Returns the signal instance name."""
         signal_base_name = self.prefix + self.node.inst_name
 
         # Apply regex if existing
         if self.regex:
-            try:
-                match_pattern, replace_pattern = self.regex.split('::', 1)
-            except ValueError:
-                raise ValueError("Invalid format for regex argument. Use 'match_pattern::replace_pattern'.")
             # Perform the regex replacement
-            signal_base_name = re.sub(match_pattern, replace_pattern, signal_base_name)
+            signal_base_name = apply_regex_arg(self.regex, signal_base_name)
 
         return signal_base_name
 
@@ -92,8 +126,11 @@ class Signal:
 
 class IntfSignal(Signal):
     """Extension of the base Signal class for interface signals."""
+    __slots__ = ('intf', 'ss', 'miso', 'mosi', 'bidir', 'name_port')
+
     def __init__(self, node: SignalNode, intf: 'IntfPort'):
 
+        get_profiler().count('IntfSignal')
         self.intf = intf
         # Call base class init method
         super().__init__(node=node, prefix=intf.prefix, cap=intf.cap, regex=intf.regex)
@@ -103,10 +140,11 @@ class IntfSignal(Signal):
         self.mosi = node.get_property('mosi', default=False) != False
         assert (self.miso or self.mosi) == True, f"Intf Signal {self.name} does not have mosi or miso property"
         self.bidir = self.miso and self.mosi
+        # Signal instance name for port definition, it never changes after construction
+        self.name_port = self.getNamePort()
 
-    @property
-    def name_port(self):
-        """Gets the signal instance name for port definition with standard suffix added."""
+    def getNamePort(self) -> str:
+        """Returns the signal instance name for port definition with standard suffix added."""
         signal_base_name = self.prefix + self.node.inst_name
 
         # Add the _(n)i, _(n)o, or _(n)io suffix for interface ports
@@ -131,20 +169,13 @@ class IntfSignal(Signal):
         else:
             assert False, "Intf Signal does not have mosi or miso property"
 
-        # If it is a tmr signal it will have the format, e.g., paddrA_i
-        # To create signal with same format than tmrg change it to, e.g., paddr_iA
-        tmr_match_pattern = r"([ABC])_(n?[io])$"
-        tmr_replace_pattern = r"_\2\1"
-        signal_base_name = re.sub(tmr_match_pattern, tmr_replace_pattern, signal_base_name)
+        # Rename tmr signals to the tmrg format
+        signal_base_name = compile_regex(TMR_MATCH_PATTERN).sub(TMR_REPLACE_PATTERN, signal_base_name)
 
         # Apply regex if existing
         if self.regex:
-            try:
-                match_pattern, replace_pattern = self.regex.split('::', 1)
-            except ValueError:
-                raise ValueError(f"Invalid format for regex argument: {self.regex}. Use 'match_pattern::replace_pattern'.")
             # Perform the regex replacement
-            signal_base_name = re.sub(match_pattern, replace_pattern, signal_base_name)
+            signal_base_name = apply_regex_arg(self.regex, signal_base_name)
 
         # print(f'name_port - signal_base_name: {signal_base_name}')
         return signal_base_name
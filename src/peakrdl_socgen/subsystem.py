@@ -3,29 +3,24 @@
 #
 # Please retain this header in all redistributions and modifications of the code.
 
-from systemrdl import RDLCompiler, RDLListener
+from systemrdl import RDLCompiler, RDLListener, WalkerAction
 from systemrdl.node import AddrmapNode
-from typing import List
+from typing import Any, Dict, List, Optional
 import logging
-import re
 
 from .signal import Signal
 from .module import Module
 from .intf import IntfPort
 from .intc import Intc
 from .adapter import AdaptersPath
+from .profiling import get_profiler
+from .log import get_trace
 
-# Logger generation for halnode module
+# Handlers and level are set by the application, or on the first export, see log.ensure_logging()
 subsys_logger = logging.getLogger("subsys_logger")
-# Console handler
-ch = logging.StreamHandler()
-# create formatter and add it to the handlers
-formatter = logging.Formatter('%(name)s - %(levelname)s: %(message)s')
-ch.setFormatter(formatter)
-# add the handlers to the logger
-subsys_logger.addHandler(ch)
-# Set for more verbosity
-subsys_logger.setLevel(logging.INFO)
+
+# Standard port suffixes ignored when matching internal signal connection paths
+STD_PORT_SUFFIXES = ("ni", "nio", "i", "o", "io", "no")
 
 class SubsystemListener(RDLListener):
     """This class extend the RDLListener to extract the subsystem nodes (i.e., the
@@ -34,6 +29,12 @@ class SubsystemListener(RDLListener):
     def __init__(self):
         self.subsystem_nodes = []
 
+    def enter_Component(self, node):
+        """Executed when entering any node, subsystems can only be found in addrmap nodes."""
+        if not isinstance(node, AddrmapNode):
+            return WalkerAction.SkipDescendants
+        return WalkerAction.Continue
+
     def enter_Addrmap(self, node):
         """Executed when entering an addrmap node."""
         if node.get_property("subsystem") is not None:
@@ -41,9 +42,20 @@ class SubsystemListener(RDLListener):
 
 class Subsystem(Module): # TODO is module and subsystem the same?
     """This class extend the Module class for subsytem (i.e., generated module)."""
-    def __init__(self, node: AddrmapNode, rdlc: RDLCompiler):
+    kind = "subsystem"
+    __slots__ = ('registry', 'modules', 'initiators', 'endpoints', 'adapter_paths', 'intcs',
+                 '_port_sig_by_name', '_port_sig_by_path', '_internal_sig_by_path', '_connections')
+
+    def __init__(self, node: AddrmapNode, rdlc: RDLCompiler, registry: Optional[Dict[str, 'Subsystem']] = None):
         super().__init__(node, rdlc)
 
+        # Subsystems already built during this export, indexed by node path
+        # Nested subsystems are looked up here instead of being rebuilt for each parent
+        self.registry = {} if registry is None else registry
+
+        # Index of the signal connections used by hasConnection and getMatchingSignal
+        self._buildConnectionIndex()
+
         # List of all addrmap childrens (either with a Module or a Subsystem handle)
         self.modules = self.getModules()
 
@@ -54,11 +66,51 @@ class Subsystem(Module): # TODO is module and subsystem the same?
 
         self.adapter_paths = []
 
-        # First get the user defined ones to remove them from the initiators and endpoints lists
-        self.intcs = self.getUserDefinedIntcs()
-        # Then append the default interconnect built from the remaining initiatiors and endpoints
-        self.intcs.append(self.create_intc(self.initiators, self.endpoints))
+        with get_profiler().phase('intcs'):
+            # First get the user defined ones to remove them from the initiators and endpoints lists
+            self.intcs = self.getUserDefinedIntcs()
+            # Then append the default interconnect built from the remaining initiatiors and endpoints
+            self.intcs.append(self.create_intc(self.initiators, self.endpoints))
+
+
+    @classmethod
+    def get_or_create(cls, node: AddrmapNode, rdlc: RDLCompiler, registry: Dict[str, 'Subsystem']) -> 'Subsystem':
+        """Returns the Subsystem object of a node from the registry, building and registering it if needed."""
+        path = node.get_path()
+        subsys = registry.get(path)
+        if subsys is None:
+            subsys = cls(node, rdlc, registry)
+            registry[path] = subsys
+        return subsys
+
+    @classmethod
+    def create_ports_only(cls, node: AddrmapNode, rdlc: RDLCompiler, registry: Dict[str, 'Subsystem']) -> 'Subsystem':
+        """Builds and registers only the Module part of a subsystem (node, ports and signals).
+
+        This is what its parent needs to connect it. The content is left empty as after release(),
+        so the subsystem can be neither rendered nor summarized.
+        """
+        subsys = cls.__new__(cls)
+        Module.__init__(subsys, node, rdlc)
+        subsys.registry = registry
+        subsys.release()
+        registry[node.get_path()] = subsys
+        return subsys
+
+    def release(self):
+        """Frees the content of the subsystem once its outputs are rendered.
 
+        Only its Module part (node, ports and signals) is kept, as needed to connect it in its parent.
+        """
+        self.modules = []
+        self.initiators = []
+        self.endpoints = []
+        self.adapter_paths = []
+        self.intcs = []
+        self._port_sig_by_name = {}
+        self._port_sig_by_path = {}
+        self._internal_sig_by_path = {}
+        self._connections = {}
 
     def getAllModules(self) -> List[Module]:
         """Returns the child modules, interconnects, and adapters."""
@@ -166,7 +218,7 @@ class Subsystem(Module): # TODO is module and subsystem the same?
         modules = []
         for node in self.getAddrmaps():
             if node.get_property('subsystem'):
-                modules.append(Subsystem(node, self.rdlc))
+                modules.append(Subsystem.get_or_create(node, self.rdlc, self.registry))
             else:
                 modules.append(Module(node, self.rdlc))
 
@@ -180,21 +232,21 @@ class Subsystem(Module): # TODO is module and subsystem the same?
             # If there is only one clock, use that
             # Issue a warning if the module to instantiate has multiple instead
             if len(module_clks) > 1:
-                subsys_logger.warning(f'Current subsystem {self.getOrigTypeName()} only has one clock, but {m.getOrigTypeName()} has multiple. Connecting clock: {self.getOrigTypeName()}.{subsys_clks[0].name} to: {m.getOrigTypeName()}.{s.name}')
-            return subsys_clks[0]
+                subsys_logger.warning('Current subsystem %s only has one clock, but %s has multiple. Connecting clock: %s.%s to: %s.%s', self.getOrigTypeName(), m.getOrigTypeName(), self.getOrigTypeName(), subsys_clks[0].name, m.getOrigTypeName(), s.name)
+            return self._traceMatch('clock', 'single', m, s, subsys_clks[0])
         else:
             for clk in subsys_clks:
                 # First try an exact name match
                 if clk.name == s.name:
-                    subsys_logger.info(f'Clock with matching name found. Connecting clock: {self.getOrigTypeName()}.{subsys_clks[0].name} to: {m.getOrigTypeName()}.{s.name}')
-                    return clk
+                    subsys_logger.info('Clock with matching name found. Connecting clock: %s.%s to: %s.%s', self.getOrigTypeName(), subsys_clks[0].name, m.getOrigTypeName(), s.name)
+                    return self._traceMatch('clock', 'name', m, s, clk)
                 # Then match last character if subsystem and module have the same number of clocks (e.g for A, B, C or 1, 2, 3)
                 if len(subsys_clks) == len(module_clks) and clk.name[-1] == s.name[-1]:
-                    subsys_logger.info(f'Matching clock found on last character. Connecting clock: {self.getOrigTypeName()}.{subsys_clks[0].name} to: {m.getOrigTypeName()}.{s.name}')
-                    return clk
+                    subsys_logger.info('Matching clock found on last character. Connecting clock: %s.%s to: %s.%s', self.getOrigTypeName(), subsys_clks[0].name, m.getOrigTypeName(), s.name)
+                    return self._traceMatch('clock', 'last_char', m, s, clk)
             else:
-                subsys_logger.warning(f'No matching clock found, using the first as default. Connecting clock: {self.getOrigTypeName()}.{subsys_clks[0].name} to: {m.getOrigTypeName()}.{s.name}')
-                return subsys_clks[0]
+                subsys_logger.warning('No matching clock found, using the first as default. Connecting clock: %s.%s to: %s.%s', self.getOrigTypeName(), subsys_clks[0].name, m.getOrigTypeName(), s.name)
+                return self._traceMatch('clock', 'default', m, s, subsys_clks[0])
 
     def getMatchingRst(self, m: Module, s: Signal) -> Signal:
         """Returns a reset Signal object handle."""
@@ -204,110 +256,106 @@ class Subsystem(Module): # TODO is module and subsystem the same?
             # If there is only one reset, use that
             # Issue a warning if the module to instantiate has multiple instead
             if len(module_rsts) > 1:
-                subsys_logger.warning(f'Current subsystem {self.getOrigTypeName()} only has one reset, but {m.getOrigTypeName()} has multiple. Connecting reset: {self.getOrigTypeName()}.{subsys_rsts[0].name} to: {m.getOrigTypeName()}.{s.name}')
-            return subsys_rsts[0]
+                subsys_logger.warning('Current subsystem %s only has one reset, but %s has multiple. Connecting reset: %s.%s to: %s.%s', self.getOrigTypeName(), m.getOrigTypeName(), self.getOrigTypeName(), subsys_rsts[0].name, m.getOrigTypeName(), s.name)
+            return self._traceMatch('reset', 'single', m, s, subsys_rsts[0])
         else:
             for rst in subsys_rsts:
                 # First try an exact name match
                 if rst.name == s.name:
-                    subsys_logger.info(f'Reset with matching name found. Connecting reset: {self.getOrigTypeName()}.{subsys_rsts[0].name} to: {m.getOrigTypeName()}.{s.name}')
-                    return rst
+                    subsys_logger.info('Reset with matching name found. Connecting reset: %s.%s to: %s.%s', self.getOrigTypeName(), subsys_rsts[0].name, m.getOrigTypeName(), s.name)
+                    return self._traceMatch('reset', 'name', m, s, rst)
                 # Then match last character if subsystem and module have the same number of resets (e.g for A, B, C or 1, 2, 3)
                 if len(subsys_rsts) == len(module_rsts) and rst.name[-1] == s.name[-1]:
-                    subsys_logger.info(f'Matching reset found on last character. Connecting reset: {self.getOrigTypeName()}.{subsys_rsts[0].name} to: {m.getOrigTypeName()}.{s.name}')
-                    return rst
+                    subsys_logger.info('Matching reset found on last character. Connecting reset: %s.%s to: %s.%s', self.getOrigTypeName(), subsys_rsts[0].name, m.getOrigTypeName(), s.name)
+                    return self._traceMatch('reset', 'last_char', m, s, rst)
             else:
-                subsys_logger.warning(f'No matching reset found, using the first as default. Connecting reset: {self.getOrigTypeName()}.{subsys_rsts[0].name} to: {m.getOrigTypeName()}.{s.name}')
-                return subsys_rsts[0]
+                subsys_logger.warning('No matching reset found, using the first as default. Connecting reset: %s.%s to: %s.%s', self.getOrigTypeName(), subsys_rsts[0].name, m.getOrigTypeName(), s.name)
+                return self._traceMatch('reset', 'default', m, s, subsys_rsts[0])
+
+    def _traceMatch(self, event: str, rule: str, m: Module, s: Signal, match: Any) -> Any:
+        """Records a connection decision in the connection trace, and returns the matching signal."""
+        trace = get_trace()
+        if trace.enabled:
+            trace.record(event,
+                         subsystem=self.node.get_path(),
+                         module=m.node.inst_name,
+                         signal=s.name,
+                         rule=rule,
+                         connected_to=match.name if isinstance(match, Signal) else match,
+                         )
+        return match
+
+    def _buildConnectionIndex(self):
+        """Indexes the connection properties of the subsystem signals by "<inst>.<signal>" path.
+
+        The explicit port signals are indexed by name and by each path of their 'path' property. The
+        internal signals are indexed by their 'from' and 'to' paths, with and without the standard
+        port suffix (i.e., _i, _o, _io, _ni, _no, _nio). For each key, the first signal in declaration
+        order is kept so lookups return the same signal than a linear search.
+        """
+        # getMatchingSignal indexes, key -> (declaration order, signal)
+        self._port_sig_by_name = {}
+        self._port_sig_by_path = {}
+        # Exact 'from'/'to' path -> internal signal
+        self._internal_sig_by_path = {}
+        # hasConnection index, path (with or without standard suffix) -> returned value
+        self._connections = {}
+
+        for cnt, s in enumerate(self.port_signals):
+            self._port_sig_by_name.setdefault(s.name, (cnt, s))
+            # explicit port signal contains the 'path' property to give the connection path from/to it
+            for p in s.node.get_property("path", default="").split(';'):
+                self._port_sig_by_path.setdefault(p, (cnt, s))
+                self._connections.setdefault(p, True)
 
-    def getMatchingSignal(self, submodule: Module, submodule_signal: Signal) -> Signal:
-        subsys_logger.debug(f"Subsystem {self.node.inst_name} - getMatchingSignal: {self.node.inst_name} has {submodule_signal.name}?")
+        for s in self.internal_signals:
+            from_path = s.node.get_property("from", default="")
+            to_path_list = s.node.get_property("to", default="").split(';')
+            # The from path is checked before the to paths
+            for p, conn in [(from_path, True)] + [(p, s) for p in to_path_list]:
+                self._internal_sig_by_path.setdefault(p, s)
+                self._connections.setdefault(p, conn)
+                # The signal is also matched independently of the standard port naming conventions
+                base, _, suffix = p.rpartition('_')
+                if base and suffix in STD_PORT_SUFFIXES:
+                    self._connections.setdefault(base, conn)
 
+    def getMatchingSignal(self, submodule: Module, submodule_signal: Signal) -> Signal:
+        """Returns the subsystem signal connected to the given submodule signal."""
         # Create signal full path to check
         submodule_signal_path = f"{submodule.node.inst_name}.{submodule_signal.name}"
 
         # Check explicit port signals
-        for s in self.port_signals:
-            # explicit port signal contains the 'path' property to give the connection path from/to it
-            path = s.node.get_property("path", default="")
-            path_list = path.split(';')
-            # We compare also against s.name (compared to hasConnection) because here we can use the internal
-            # signals to make the connection
-            if submodule_signal.name == s.name:
-                subsys_logger.debug(f"Yes (explicit port signal)")
-                return s
-            for p in path_list:
-                if p == submodule_signal_path:
-                    return s
-
-        # Regex pattern to check if signal name is present or not in the submodule
-        # The signal is check independently of the standard port naming conventions
-        regex_pattern = rf"^{re.escape(submodule_signal_path)}"
-
-        # Check internal signals
-        for s in self.internal_signals:
-            subsys_logger.debug(f"Subsystem - getMatchingSignal: checking internal signal {s.name}")
-            # Check the full path name
-            to_path = s.node.get_property("to", default="")
-            to_path_list = to_path.split(';')
-            from_path = s.node.get_property("from", default="")
-            subsys_logger.debug(f"Subsystem - getMatchingSignal: internal signal to_path: {to_path}")
-            subsys_logger.debug(f"Subsystem - getMatchingSignal: internal signal from_path: {from_path}")
-            # Check the full from path
-            if re.fullmatch(regex_pattern, from_path):
-                subsys_logger.debug(f"Yes (internal from_path signal)")
-                return s
-            # Check to paths
-            for p in to_path_list:
-                if re.fullmatch(regex_pattern, p):
-                    subsys_logger.debug(f"Yes (internal to_path signal)")
-                    return s
+        # We compare also against s.name (compared to hasConnection) because here we can use the internal
+        # signals to make the connection
+        # Matches are (declaration order, signal, rule), the first declared signal wins
+        matches = [(*m, rule) for m, rule in ((self._port_sig_by_name.get(submodule_signal.name), 'port_name'),
+                                              (self._port_sig_by_path.get(submodule_signal_path), 'port_path'))
+                   if m is not None]
+        if matches:
+            _, s, rule = min(matches, key=lambda m: m[0])
+            return self._traceMatch('signal', rule, submodule, submodule_signal, s)
+
+        # Check internal signals full from/to paths
+        s = self._internal_sig_by_path.get(submodule_signal_path)
+        if s is not None:
+            return self._traceMatch('signal', 'internal_path', submodule, submodule_signal, s)
 
         assert False, f"The subsystem submodule {submodule.node.inst_name} does not contain the signal {submodule_signal.name}"
 
     def hasConnection(self, submodule: Module, submodule_signal: Signal) -> bool:
         """Returns True if the module has a connection signal matching the given one."""
-        subsys_logger.debug(f"Subsystem {self.node.inst_name}/{submodule.node.inst_name} - hasConnection: {self.node.inst_name} has {submodule_signal.name} connected to a module?")
-
         # Create signal full path to check
         submodule_signal_path = f"{submodule.node.inst_name}.{submodule_signal.name}"
 
-        # Check explicit port signals
-        for s in self.port_signals:
-            # explicit port signal contains the 'path' property to give the connection path from/to it
-            path = s.node.get_property("path", default="")
-            path_list = path.split(';')
-            # We don't check against s.name directly (compared to getMatchingSignal) because we don't
-            # want a connection just because the subsystem as a port with the same name than one of its
-            # submodules
-            if submodule_signal_path in path_list:
-                subsys_logger.debug(f"Yes (explicit port signal)")
-                return True
-
-
-        # Regex pattern to check if signal name is present or not in the submodule
-        # The signal is check independently of the standard port naming conventions
-        regex_pattern = rf"^{re.escape(submodule_signal_path)}(_(ni|nio|i|o|io|no))?$"
-
-        # Check internal signals
-        for s in self.internal_signals:
-            subsys_logger.debug(f"Subsystem - hasConnection: checking internal signal {s.name}")
-            # Keep only the ultimate path name
-            to_path = s.node.get_property("to", default="")
-            to_path_list = to_path.split(';')
-            from_path = s.node.get_property("from", default="")
-            # Check from paths
-            if re.fullmatch(regex_pattern, from_path):
-                subsys_logger.debug(f"Yes (internal from_path signal)")
-                return True
-            # Check to paths
-            for p in to_path_list:
-                if re.fullmatch(regex_pattern, p):
-                    subsys_logger.debug(f"Yes (internal to_path signal)")
-                    return s
-
-        subsys_logger.debug(f"No")
-        return False
+        # We don't check against the explicit port signal names directly (compared to getMatchingSignal)
+        # because we don't want a connection just because the subsystem as a port with the same name than
+        # one of its submodules
+        connection = self._connections.get(submodule_signal_path, False)
+        if get_trace().enabled:
+            rule = 'internal' if isinstance(connection, Signal) else ('path' if connection else 'none')
+            self._traceMatch('connection', rule, submodule, submodule_signal, connection)
+        return connection
 
     def getEndpoints(self) -> List[IntfPort]:
         """Returns a list of children module/subsystem slave ports and subsystem master ports."""
@@ -350,13 +398,14 @@ class Subsystem(Module): # TODO is module and subsystem the same?
         ports_need_adapter = [port for port in mst_ports if port.type != intf_type]
 
         for p in ports_need_adapter:
-            self.adapter_paths.append(AdaptersPath(
-                    adapt_from=slv_ports[0], # For now all slaves are identical
-                    adapt_to=p,
-                    rdlc=self.rdlc,
-                    intc_prefix=inst_prefix
-                    )
-                  )
+            with get_profiler().phase('adapters'):
+                self.adapter_paths.append(AdaptersPath(
+                        adapt_from=slv_ports[0], # For now all slaves are identical
+                        adapt_to=p,
+                        rdlc=self.rdlc,
+                        intc_prefix=inst_prefix
+                        )
+                      )
 
             for cnt, mst_p in enumerate(mst_ports):
                 if mst_p == p: